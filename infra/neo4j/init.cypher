@@ -2,3 +2,17 @@ CREATE CONSTRAINT company_id IF NOT EXISTS FOR (c:Company) REQUIRE c.id IS UNIQU
 CREATE CONSTRAINT person_id  IF NOT EXISTS FOR (p:Person)  REQUIRE p.id IS UNIQUE;
 CREATE CONSTRAINT email_addr IF NOT EXISTS FOR (e:Email)   REQUIRE e.address IS UNIQUE;
 
+
+// Keyset pagination (kept in sync with atlas.etl.common.graph_schema)
+CREATE INDEX company_industry_name IF NOT EXISTS FOR (c:Company) ON (c.industry, c.name);
+CREATE INDEX company_location_name IF NOT EXISTS FOR (c:Company) ON (c.location, c.name);
+CREATE INDEX company_name IF NOT EXISTS FOR (c:Company) ON (c.name);
+CREATE INDEX person_department_name IF NOT EXISTS FOR (p:Person) ON (p.department, p.full_name);
+CREATE INDEX person_full_name IF NOT EXISTS FOR (p:Person) ON (p.full_name);
+CREATE INDEX deal_value IF NOT EXISTS FOR (d:Deal) ON (d.value);
+CREATE INDEX signal_detected_at IF NOT EXISTS FOR (s:Signal) ON (s.detected_at);
+
+// Full-text indexes (kept in sync with atlas.etl.common.graph_schema)
+CREATE FULLTEXT INDEX company_search IF NOT EXISTS FOR (n:Company) ON EACH [n.name, n.domain, n.industry];
+CREATE FULLTEXT INDEX person_search  IF NOT EXISTS FOR (n:Person)  ON EACH [n.full_name, n.title, n.job_title];
+CREATE FULLTEXT INDEX deal_search    IF NOT EXISTS FOR (n:Deal)    ON EACH [n.name, n.product];
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+API latency benchmark under concurrent load.
+
+Fires CONCURRENCY parallel clients at a heavy endpoint (default
+/api/dashboard/metrics) while a probe client hits a cheap endpoint
+(default /healthz). Reports p50/p95/p99/max for both.
+
+A blocking handler shows up twice: the heavy endpoint's tail grows with
+concurrency, and the probe's p99 jumps because the event loop is stalled.
+
+Before/after: run once against a build from before the async data layer and
+once against the current build, same data and flags, and compare the tables.
+
+    python scripts/bench_api_latency.py --base-url http://localhost:8000 \\
+        --endpoint /api/dashboard/metrics --concurrency 32 --requests 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def summarize(name: str, samples: list[float], errors: int) -> str:
+    ms = [s * 1000 for s in samples]
+    return (
+        f"{name:<32} n={len(ms):<5} err={errors:<4} "
+        f"p50={percentile(ms, 50):8.1f}ms  p95={percentile(ms, 95):8.1f}ms  "
+        f"p99={percentile(ms, 99):8.1f}ms  max={max(ms, default=0):8.1f}ms  "
+        f"mean={statistics.fmean(ms) if ms else 0:8.1f}ms"
+    )
+
+
+async def worker(client: httpx.AsyncClient, path: str, queue: asyncio.Queue, out: list, errs: list):
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        t0 = time.perf_counter()
+        try:
+            resp = await client.get(path)
+            resp.raise_for_status()
+            out.append(time.perf_counter() - t0)
+        except Exception:
+            errs.append(1)
+
+
+async def probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, out: list, errs: list):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            resp = await client.get(path)
+            resp.raise_for_status()
+            out.append(time.perf_counter() - t0)
+        except Exception:
+            errs.append(1)
+        await asyncio.sleep(0.01)
+
+
+async def run(args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency + 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        # Warm up (connection pools, query plans)
+        for _ in range(3):
+            await client.get(args.endpoint)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for _ in range(args.requests):
+            queue.put_nowait(1)
+
+        heavy, heavy_err, light, light_err = [], [], [], []
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, args.probe, stop, light, light_err))
+
+        t0 = time.perf_counter()
+        await asyncio.gather(
+            *(worker(client, args.endpoint, queue, heavy, heavy_err) for _ in range(args.concurrency))
+        )
+        wall = time.perf_counter() - t0
+        stop.set()
+        await probe_task
+
+    print(f"\n# {args.base_url}  concurrency={args.concurrency}  requests={args.requests}")
+    print(f"# wall={wall:.2f}s  throughput={len(heavy) / wall:.1f} req/s\n")
+    print(summarize(args.endpoint, heavy, len(heavy_err)))
+    print(summarize(f"{args.probe} (probe)", light, len(light_err)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent latency benchmark for the query API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", default="/api/dashboard/metrics")
+    parser.add_argument("--probe", default="/healthz")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
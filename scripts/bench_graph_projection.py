@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Graph projection vs Cypher benchmark for neighborhood and degree reads.
+
+Builds the in-memory projection once, samples node ids from it, then runs the
+same /neighbors expansion through Cypher (expand_neighborhood, one read
+transaction per call on the pooled driver) and through the projection. Reports
+build time, projection size and p50/p95/p99 per path.
+
+    python scripts/bench_graph_projection.py --samples 500 --depth 2 --max-nodes 50
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from atlas.services.query_api.graph_projection import build_projection
+from atlas.services.query_api.neighborhood import expand_neighborhood
+from atlas.services.query_api.neo4j_pool import get_manager
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def summarize(name: str, samples: list[float]) -> str:
+    ms = [s * 1000 for s in samples]
+    return (
+        f"{name:<28} n={len(ms):<5} "
+        f"p50={percentile(ms, 50):9.3f}ms  p95={percentile(ms, 95):9.3f}ms  "
+        f"p99={percentile(ms, 99):9.3f}ms  mean={statistics.fmean(ms) if ms else 0:9.3f}ms"
+    )
+
+
+def timed(fn, ids: list[str]) -> list[float]:
+    out = []
+    for node_id in ids:
+        t0 = time.perf_counter()
+        fn(node_id)
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare projection and Cypher neighborhood reads")
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--max-nodes", type=int, default=50)
+    parser.add_argument("--label", default="Company", help="label of the sampled anchors")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    manager = get_manager()
+    with manager.session() as s:
+        projection = build_projection(s)
+    size = projection.offsets.nbytes + projection.targets.nbytes + projection.rel_types.nbytes + projection.outgoing.nbytes
+    print(
+        f"\n# projection: {projection.node_count} nodes, {projection.relationship_count} rels, "
+        f"{size / 1e6:.1f} MB adjacency, built in {projection.build_seconds:.2f}s"
+    )
+
+    candidates = [
+        k for i, k in enumerate(projection.keys) if projection.label_names[projection.labels[i]] == args.label
+    ]
+    if not candidates:
+        raise SystemExit(f"no {args.label} nodes in the projection")
+    ids = random.Random(args.seed).choices(candidates, k=args.samples)
+
+    def cypher(node_id: str):
+        with manager.session() as s:
+            return s.execute_read(expand_neighborhood, node_id, args.depth, args.label, args.max_nodes)
+
+    def in_memory(node_id: str):
+        return projection.neighborhood(node_id, args.depth, args.label, args.max_nodes)
+
+    # Warm up query plans and the pool
+    for node_id in ids[:10]:
+        cypher(node_id)
+
+    print(f"# anchors={args.label} depth={args.depth} max_nodes={args.max_nodes}\n")
+    print(summarize("neighbors (cypher)", timed(cypher, ids)))
+    print(summarize("neighbors (projection)", timed(in_memory, ids)))
+    print(summarize("degree (projection)", timed(projection.degree, ids)))
+
+
+if __name__ == "__main__":
+    main()
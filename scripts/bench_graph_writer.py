@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Graph ETL write throughput: serial single-transaction upsert vs the parallel
+partitioned writer (atlas.etl.common.parallel_writer).
+
+Generates synthetic Apollo-shaped companies (ids prefixed `bench:`), writes
+them in chunks both ways and reports rows/s (companies + people + emails).
+
+Against a local Neo4j (the bench rows are deleted afterwards):
+
+    python scripts/bench_graph_writer.py --uri bolt://localhost:7687 --password neo4jpass \\
+        --companies 5000 --people 10 --workers 1,2,4,8
+
+Without Neo4j, --stub simulates a server with --server-cores concurrent
+transactions, a fixed round-trip and a per-row cost, which shows the scaling
+shape (not absolute numbers):
+
+    python scripts/bench_graph_writer.py --stub --companies 2000 --workers 1,4,8
+"""
+
+import argparse
+import threading
+import time
+
+from atlas.etl.apollo_to_graph.etl_apollo import chunked, cypher_upsert, row_count, write_parallel
+from atlas.etl.common.parallel_writer import ParallelWriter
+
+
+def synthetic_companies(n: int, people: int, emails: int) -> list[dict]:
+    out = []
+    for i in range(n):
+        out.append(
+            {
+                "id": f"bench:c{i}",
+                "name": f"Bench Company {i}",
+                "domain": f"bench-{i}.example",
+                "industry": f"Industry {i % 12}",
+                "employee_count": str(10 + i % 500),
+                "location": "Berlin",
+                "people": [
+                    {
+                        "id": f"bench:p{i}-{j}",
+                        "full_name": f"Person {i}-{j}",
+                        "title": "Engineer",
+                        "department": "IT",
+                        "emails": [f"p{i}-{j}-{k}@bench-{i}.example" for k in range(emails)],
+                    }
+                    for j in range(people)
+                ],
+            }
+        )
+    return out
+
+
+# ---------------------------
+# Stub server
+# ---------------------------
+
+
+class _StubResult:
+    def consume(self):
+        return None
+
+
+class _StubTx:
+    def __init__(self, server: "StubDriver"):
+        self.server = server
+
+    def run(self, query, rows=None, companies=None, **params):
+        n = len(rows) if rows is not None else sum(row_count(c) for c in companies or [])
+        with self.server.cores:
+            time.sleep(self.server.rtt + n * self.server.per_row)
+        return _StubResult()
+
+
+class _StubSession:
+    def __init__(self, server: "StubDriver"):
+        self.server = server
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, fn, *args):
+        return fn(_StubTx(self.server), *args)
+
+
+class StubDriver:
+    def __init__(self, server_cores: int, rtt_ms: float, per_row_us: float):
+        self.cores = threading.BoundedSemaphore(server_cores)
+        self.rtt = rtt_ms / 1000
+        self.per_row = per_row_us / 1e6
+
+    def session(self):
+        return _StubSession(self)
+
+    def close(self):
+        pass
+
+
+# ---------------------------
+# Runs
+# ---------------------------
+
+
+def run_serial(driver, companies: list[dict], chunk_rows: int) -> float:
+    t0 = time.perf_counter()
+    for chunk in chunked(companies, chunk_rows):
+        with driver.session() as sess:
+            sess.execute_write(cypher_upsert, chunk, "bench")
+    return time.perf_counter() - t0
+
+
+def run_parallel(driver, companies: list[dict], chunk_rows: int, workers: int, batch_rows: int) -> tuple[float, int]:
+    writer = ParallelWriter(driver, workers=workers, batch_rows=batch_rows)
+    retries = 0
+    t0 = time.perf_counter()
+    for chunk in chunked(companies, chunk_rows):
+        retries += write_parallel(writer, chunk, "bench").retries
+    return time.perf_counter() - t0, retries
+
+
+def cleanup(driver) -> None:
+    with driver.session() as sess:
+        sess.run(
+            """
+            MATCH (n) WHERE (n:Company OR n:Person) AND n.id STARTS WITH 'bench:'
+               OR n:Email AND n.address ENDS WITH '.example' AND n.address CONTAINS '@bench-'
+            CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS
+            """
+        ).consume()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs parallel graph ETL write throughput")
+    parser.add_argument("--uri", default="bolt://localhost:7687")
+    parser.add_argument("--user", default="neo4j")
+    parser.add_argument("--password", default="neo4jpass")
+    parser.add_argument("--stub", action="store_true", help="simulate the server instead of using Neo4j")
+    parser.add_argument("--server-cores", type=int, default=8)
+    parser.add_argument("--rtt-ms", type=float, default=2.0)
+    parser.add_argument("--per-row-us", type=float, default=50.0)
+    parser.add_argument("--companies", type=int, default=2000)
+    parser.add_argument("--people", type=int, default=10)
+    parser.add_argument("--emails", type=int, default=1)
+    parser.add_argument("--chunk-rows", type=int, default=5000)
+    parser.add_argument("--batch-rows", type=int, default=1000)
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    args = parser.parse_args()
+
+    companies = synthetic_companies(args.companies, args.people, args.emails)
+    rows = sum(row_count(c) for c in companies)
+
+    if args.stub:
+        driver = StubDriver(args.server_cores, args.rtt_ms, args.per_row_us)
+    else:
+        from atlas.etl.common.graph_schema import ensure_schema
+        from neo4j import GraphDatabase
+
+        driver = GraphDatabase.driver(args.uri, auth=(args.user, args.password))
+        ensure_schema(driver)
+
+    print(f"\n# {'stub' if args.stub else args.uri}  companies={args.companies}  rows={rows}  chunk_rows={args.chunk_rows}\n")
+    try:
+        seconds = run_serial(driver, companies, args.chunk_rows)
+        print(f"{'serial (1 tx/chunk)':<24} {seconds:8.2f}s  {rows / seconds:10.0f} rows/s")
+        for workers in (int(w) for w in args.workers.split(",")):
+            seconds, retries = run_parallel(driver, companies, args.chunk_rows, workers, args.batch_rows)
+            print(f"{f'parallel workers={workers}':<24} {seconds:8.2f}s  {rows / seconds:10.0f} rows/s  retries={retries}")
+    finally:
+        if not args.stub:
+            cleanup(driver)
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+People-enrichment throughput of IngestionPipeline: sequential (concurrency 1)
+vs the async worker pool, against a local Hunter-compatible stub server with a
+fixed latency per lookup (no API key, no MinIO).
+
+    python scripts/bench_ingest_enrichment.py --companies 200 --latency-ms 150 --concurrency 1,4,16,64
+    python scripts/bench_ingest_enrichment.py --fail-rate 0.05 --slow-rate 0.02 --timeout 2
+
+--fail-rate answers 503 (retried by the shared transport) and --slow-rate
+sleeps past --timeout, to show the partial-failure accounting; --rpm turns on
+the per-provider rate limit.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from atlas.ingestors.common.transport import shared_transport
+from atlas.ingestors.hunter.client import HunterPeopleFinder
+from atlas.pipelines.ingest_pipeline import IngestionPipeline
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, latency: float, fail_rate: float, slow_rate: float, slow_seconds: float):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.slow_rate = slow_rate
+        self.slow_seconds = slow_seconds
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def do_GET(self):
+        domain = parse_qs(urlparse(self.path).query).get("domain", [""])[0]
+        roll = random.random()
+        if roll < self.server.slow_rate:
+            time.sleep(self.server.slow_seconds)
+        else:
+            time.sleep(self.server.latency * random.uniform(0.8, 1.2))
+        if roll > 1 - self.server.fail_rate:
+            self.send_response(503)
+            self.end_headers()
+            return
+        emails = [
+            {"value": f"person{i}@{domain}", "first_name": "Person", "last_name": str(i), "position": "Engineer"}
+            for i in range(3)
+        ]
+        body = json.dumps({"data": {"emails": emails}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def synthetic_companies(n: int) -> list[dict]:
+    return [{"id": f"bench:c{i}", "name": f"Bench Company {i}", "domain": f"bench-{i}.example"} for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs concurrent people enrichment")
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated concurrency caps")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-company timeout (s)")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=0, help="provider rate limit (0 = off)")
+    args = parser.parse_args()
+
+    os.environ.pop("REDIS_URL", None)  # in-process rate limiter only
+    server = StubServer(args.latency_ms / 1000, args.fail_rate, args.slow_rate, args.timeout * 2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    finder = HunterPeopleFinder("bench")
+    finder.base_url = f"http://127.0.0.1:{server.server_address[1]}/v2"
+    finder.requests_per_minute = args.rpm or None
+
+    print(f"\n# stub latency={args.latency_ms:.0f}ms  companies={args.companies}  timeout={args.timeout}s\n")
+    baseline = None
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        pipeline = IngestionPipeline(None, finder, concurrency=concurrency, timeout=args.timeout)
+        out: list[dict] = []
+        stats = asyncio.run(pipeline.enrich(synthetic_companies(args.companies), out.append))
+        rate = len(out) / stats.seconds
+        baseline = baseline or rate
+        print(
+            f"{f'concurrency={concurrency}':<18} {stats.seconds:7.2f}s  {rate:8.1f} companies/s  "
+            f"x{rate / baseline:5.1f}  people={stats.people} failed={stats.failed} timed_out={stats.timed_out}"
+        )
+    for host, h in shared_transport().stats().items():
+        print(f"\n{host}: {h['count']} requests  p50<={h['p50_ms']:g}ms  p95<={h['p95_ms']:g}ms  retries={h['retries']}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
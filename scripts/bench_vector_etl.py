@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Vector ETL throughput: sequential embed->upsert loop vs the pipelined loader
+(VectorPipeline), in docs/s, with FastEmbed running offline on CPU.
+
+Synthetic Apollo-shaped companies are embedded into a throwaway collection
+(`bench_entities`), dropped afterwards. By default Qdrant runs in-process
+(`:memory:`, calls serialized since the local client isn't thread-safe);
+pass --qdrant-url to measure against a real server. The shared embedding store
+is disabled unless --use-store is given, so every run measures the model.
+
+    python scripts/bench_vector_etl.py --companies 500 --people 5 --workers 1,2,4
+    python scripts/bench_vector_etl.py --qdrant-url http://localhost:6333 --workers 4,8
+"""
+
+import argparse
+import os
+import threading
+import time
+
+from qdrant_client import QdrantClient
+
+import atlas.etl.apollo_to_vector.etl_apollo_qdrant as vector_etl
+
+
+class SerializedClient:
+    """
+    Lock around every call, for the in-process Qdrant client.
+    """
+
+    def __init__(self, client: QdrantClient):
+        self._client = client
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return attr(*args, **kwargs)
+
+        return call
+
+
+def synthetic_companies(n: int, people: int) -> list[dict]:
+    return [
+        {
+            "id": f"bench-c{i}",
+            "name": f"Bench Company {i}",
+            "domain": f"bench-{i}.example",
+            "industry": f"Industry {i % 12}",
+            "employee_count": str(10 + i % 500),
+            "location": ["Berlin", "Paris", "Madrid", "Milan"][i % 4],
+            "people": [
+                {
+                    "id": f"bench-p{i}-{j}",
+                    "full_name": f"Person {i}-{j}",
+                    "title": ["Engineer", "Manager", "Director", "Analyst"][j % 4],
+                    "department": ["IT", "Sales", "Finance", "Operations"][j % 4],
+                }
+                for j in range(people)
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def fresh_client(url: str | None):
+    if url:
+        client = QdrantClient(url=url)
+        if client.collection_exists(vector_etl.COLLECTION):
+            client.delete_collection(vector_etl.COLLECTION)
+        return client
+    return SerializedClient(QdrantClient(":memory:"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs pipelined vector ETL throughput")
+    parser.add_argument("--companies", type=int, default=500)
+    parser.add_argument("--people", type=int, default=5)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--model", default="BAAI/bge-small-en-v1.5")
+    parser.add_argument("--qdrant-url", default=None)
+    parser.add_argument("--use-store", action="store_true", help="embed through the shared embedding store")
+    args = parser.parse_args()
+    if not args.use_store:
+        os.environ["EMBED_STORE_PATH"] = ""
+
+    vector_etl.COLLECTION = "bench_entities"
+    entities = list(vector_etl.iter_entities({"companies": synthetic_companies(args.companies, args.people)}))
+    embedder = vector_etl.FastEmbedder(args.model)
+    embedder.embed(["warm up"])  # model download / session init outside the timings
+
+    print(f"\n# FastEmbed {args.model}  docs={len(entities)}  qdrant={args.qdrant_url or ':memory:'}\n")
+
+    client = fresh_client(args.qdrant_url)
+    t0 = time.perf_counter()
+    written, _ = vector_etl.upsert_entities(client, embedder, entities, force=True)
+    seconds = time.perf_counter() - t0
+    print(f"{'sequential':<22} {seconds:8.2f}s  {written / seconds:8.1f} docs/s")
+
+    for workers in (int(w) for w in args.workers.split(",")):
+        client = fresh_client(args.qdrant_url)
+        stats = vector_etl.VectorPipeline(client, embedder, workers=workers, force=True).run(entities)
+        sizes = stats.batch_sizes
+        print(
+            f"{f'pipelined workers={workers}':<22} {stats.seconds:8.2f}s  {stats.docs_per_second:8.1f} docs/s  "
+            f"batches={stats.batches} size {min(sizes, default=0)}..{max(sizes, default=0)}  "
+            f"embed={stats.embed_seconds:.1f}s upsert={stats.upsert_seconds:.1f}s"
+        )
+
+    if args.qdrant_url:
+        QdrantClient(url=args.qdrant_url).delete_collection(vector_etl.COLLECTION)
+
+
+if __name__ == "__main__":
+    main()
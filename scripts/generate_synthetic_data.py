@@ -633,6 +633,12 @@ class SyntheticDataGenerator:
             session.run("CREATE INDEX activity_id IF NOT EXISTS FOR (a:Activity) ON (a.id)")
             session.run("CREATE INDEX meeting_id IF NOT EXISTS FOR (m:Meeting) ON (m.id)")
 
+            # Keyset-paging and full-text indexes behind the list and search endpoints
+            from atlas.etl.common.graph_schema import RANGE_INDEXES, fulltext_statements
+
+            for stmt in RANGE_INDEXES + fulltext_statements():
+                session.run(stmt)
+
             # Create Companies
             print("  Creating companies...")
             for company in self.companies:
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test of connectors.utils.rate_limiter.RateLimiter: many
+tasks on several threads (each with its own event loop) hammer one limiter
+and every admission is timestamped. Fails (exit 1) if the limiter ever
+admits more than GCRA allows:
+
+    admitted in any interval of length t  <=  burst + t * limit / window
+
+    python scripts/stress_rate_limiter.py                              # in-memory
+    python scripts/stress_rate_limiter.py --backend fakeredis          # Lua script on fakeredis (pip install "fakeredis[lua]")
+    REDIS_URL=redis://localhost:6379/0 python scripts/stress_rate_limiter.py --backend redis --processes 4
+
+--mode acquire hammers acquire() in a loop (refused calls back off --spin);
+--mode wait uses wait_and_acquire, which sleeps exactly until its slot.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import uuid
+
+from atlas.connectors.utils import rate_limiter as rl
+
+
+def make_limiter(args, key: str) -> rl.RateLimiter:
+    if args.backend == "memory":
+        return rl.RateLimiter(key, args.limit, args.window, redis_url="", burst=args.burst)
+    if args.backend == "fakeredis":
+        import fakeredis
+
+        server = fakeredis.FakeServer()
+        rl.aioredis.from_url = lambda url, **kw: fakeredis.FakeAsyncRedis(server=server)
+        return rl.RateLimiter(key, args.limit, args.window, redis_url="redis://fake", burst=args.burst)
+    return rl.RateLimiter(key, args.limit, args.window, redis_url=args.redis_url, burst=args.burst)
+
+
+async def hammer(limiter: rl.RateLimiter, args, deadline: float, admitted: list) -> None:
+    async def worker():
+        while time.time() < deadline:
+            if args.mode == "wait":
+                if await limiter.wait_and_acquire(max_wait=max(0.0, deadline - time.time())):
+                    admitted.append(time.time())
+            elif await limiter.acquire():
+                admitted.append(time.time())
+            else:
+                await asyncio.sleep(args.spin)
+
+    await asyncio.gather(*(worker() for _ in range(args.tasks)))
+
+
+def run_threads(args, key: str, deadline: float) -> list[float]:
+    limiter = make_limiter(args, key)
+    admitted: list[float] = []
+    threads = [
+        threading.Thread(target=lambda: asyncio.run(hammer(limiter, args, deadline, admitted)))
+        for _ in range(args.threads)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return admitted
+
+
+def _process_main(args, key, deadline, out):
+    out.put(run_threads(args, key, deadline))
+
+
+def max_in_interval(stamps: list[float], length: float) -> int:
+    """Most admissions inside any half-open interval of `length` seconds."""
+    best, j = 0, 0
+    for i, t in enumerate(stamps):
+        while stamps[j] <= t - length:
+            j += 1
+        best = max(best, i - j + 1)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RateLimiter over-admission stress test")
+    parser.add_argument("--backend", choices=["memory", "fakeredis", "redis"], default="memory")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--window", type=float, default=2.0)
+    parser.add_argument("--burst", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=6.0)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=50, help="tasks per thread")
+    parser.add_argument("--processes", type=int, default=1, help="redis backend only")
+    parser.add_argument("--mode", choices=["acquire", "wait"], default="acquire")
+    parser.add_argument("--spin", type=float, default=0.001, help="sleep after a refused acquire (s)")
+    args = parser.parse_args()
+
+    key = f"stress:{uuid.uuid4().hex[:8]}"
+    start = time.time()
+    deadline = start + args.duration
+    if args.processes > 1 and args.backend == "redis":
+        out = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=_process_main, args=(args, key, deadline, out)) for _ in range(args.processes)]
+        for p in procs:
+            p.start()
+        results = [out.get() for _ in procs]
+        for p in procs:
+            p.join()
+        admitted = sorted(t for a in results for t in a)
+    else:
+        admitted = sorted(run_threads(args, key, deadline))
+
+    burst = args.burst or args.limit
+    rate = args.limit / args.window
+    elapsed = (admitted[-1] - start) if admitted else 0.0
+    bound_total = burst + elapsed * rate
+    worst_window = max_in_interval(admitted, args.window)
+    bound_window = burst + args.limit
+
+    workers = args.threads * args.tasks * max(1, args.processes if args.backend == "redis" else 1)
+    print(f"# backend={args.backend} mode={args.mode} limit={args.limit}/{args.window:g}s burst={burst} workers={workers}")
+    print(f"admitted         {len(admitted):6d}   bound {bound_total:8.1f}  ({len(admitted) / bound_total:.1%} of allowed)")
+    print(f"max per window   {worst_window:6d}   bound {bound_window:8d}")
+    # +1: admissions are timestamped by the client, after the limiter decided
+    over = len(admitted) > bound_total + 1 or worst_window > bound_window + 1
+    print("OVER-ADMITTED" if over else "ok: never over-admitted")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,10 @@ Provides endpoints for:
 - Managing connector configurations
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, File, UploadFile, Form
+from fastapi import APIRouter, HTTPException, BackgroundTasks, File, UploadFile, Form, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 from datetime import datetime
 import json
 
@@ -124,6 +125,17 @@ async def get_connector_info(connector_id: str):
     return connector_class.config.to_dict()
 
 
+@router.get("/pool")
+async def connector_pool_stats():
+    """
+    Long-lived connector instances: reuse counters, in-flight calls and
+    HTTP connection pool state per instance (credentials are never shown).
+    """
+    from atlas.connectors.registry import ConnectorRegistry
+
+    return ConnectorRegistry.pool_stats()
+
+
 # ─────────────────────────────────────────────────────────────
 # Connection Testing
 # ─────────────────────────────────────────────────────────────
@@ -173,16 +185,69 @@ async def test_connection(request: TestConnectionRequest):
 # ─────────────────────────────────────────────────────────────
 
 
+async def _search_results(connector, request: SearchRequest, stats) -> AsyncIterator[Dict[str, Any]]:
+    """Results as the connector produces them (paginated connectors stream page by page)"""
+    if hasattr(connector, "iter_search"):
+        async for company in connector.iter_search(
+            request.query,
+            limit=request.limit,
+            filters=request.filters,
+            stats=stats,
+        ):
+            yield company
+        return
+    for company in await connector.search(
+        request.query,
+        limit=request.limit,
+        filters=request.filters,
+    ):
+        yield company
+
+
+def _search_stats(connector_id: str):
+    if connector_id != "apollo":
+        return None
+    from atlas.connectors.apollo.connector import SearchStats
+
+    return SearchStats()
+
+
+async def _search_ndjson(request: SearchRequest) -> AsyncIterator[bytes]:
+    """One company per line, then a summary line ({"done": true, ...} or {"error": ...})"""
+    from atlas.connectors.registry import ConnectorRegistry
+
+    stats = _search_stats(request.connector_id)
+    count = 0
+    try:
+        async with ConnectorRegistry.acquire(request.connector_id, **request.auth_config) as connector:
+            async for company in _search_results(connector, request, stats):
+                yield (json.dumps(company, default=str) + "\n").encode()
+                count += 1
+    except Exception as e:
+        # Headers are already sent: report the failure in-band
+        yield (json.dumps({"error": f"Search failed: {str(e)}", "count": count}) + "\n").encode()
+        return
+    summary = {"done": True, "connector": request.connector_id, "query": request.query, "count": count}
+    if stats is not None:
+        summary["pagination"] = stats.to_dict()
+    yield (json.dumps(summary) + "\n").encode()
+
+
 @router.post("/search")
-async def search_companies(request: SearchRequest):
+async def search_companies(
+    request: SearchRequest,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
     """
     Search for companies using a connector.
 
     Supported connectors: apollo, kvk, linkedin
 
-    Returns list of companies in standard format.
+    Returns list of companies in standard format, or with format=ndjson
+    streams them one per line as pages arrive, ending with a summary line
+    ({"done": true, "count": ..., "pagination": ...}).
     """
-    from atlas.connectors.registry import ConnectorRegistry
+    from atlas.connectors.registry import ConnectorPoolClosed, ConnectorRegistry
 
     connector_class = ConnectorRegistry.get(request.connector_id)
     if not connector_class:
@@ -196,21 +261,25 @@ async def search_companies(request: SearchRequest):
             f"Connector '{request.connector_id}' does not support search"
         )
 
+    if format == "ndjson":
+        return StreamingResponse(_search_ndjson(request), media_type="application/x-ndjson")
+
     try:
-        connector = connector_class(**request.auth_config)
-        results = await connector.search(
-            request.query,
-            limit=request.limit,
-            filters=request.filters,
-        )
-        await connector.close()
+        stats = _search_stats(request.connector_id)
+        async with ConnectorRegistry.acquire(request.connector_id, **request.auth_config) as connector:
+            results = [c async for c in _search_results(connector, request, stats)]
 
-        return {
+        response = {
             "connector": request.connector_id,
             "query": request.query,
             "count": len(results),
             "results": results,
         }
+        if stats is not None:
+            response["pagination"] = stats.to_dict()
+        return response
+    except ConnectorPoolClosed as e:
+        raise HTTPException(503, str(e)) from e
     except Exception as e:
         raise HTTPException(500, f"Search failed: {str(e)}")
 
@@ -232,7 +301,7 @@ async def enrich_company(request: EnrichRequest):
 
     Returns enriched company data.
     """
-    from atlas.connectors.registry import ConnectorRegistry
+    from atlas.connectors.registry import ConnectorPoolClosed, ConnectorRegistry
 
     connector_class = ConnectorRegistry.get(request.connector_id)
     if not connector_class:
@@ -247,20 +316,17 @@ async def enrich_company(request: EnrichRequest):
         )
 
     try:
-        connector = connector_class(**request.auth_config)
-
-        result = None
-        if request.connector_id == "kvk" and request.kvk_number:
-            result = await connector.enrich_company(request.kvk_number)
-        elif request.connector_id == "linkedin" and request.linkedin_url:
-            result = await connector.enrich_company(request.linkedin_url)
-        elif request.domain:
-            if hasattr(connector, "enrich_company"):
-                result = await connector.enrich_company(request.domain)
-            elif hasattr(connector, "enrich_by_domain"):
-                result = await connector.enrich_by_domain(request.domain)
-
-        await connector.close()
+        async with ConnectorRegistry.acquire(request.connector_id, **request.auth_config) as connector:
+            result = None
+            if request.connector_id == "kvk" and request.kvk_number:
+                result = await connector.enrich_company(request.kvk_number)
+            elif request.connector_id == "linkedin" and request.linkedin_url:
+                result = await connector.enrich_company(request.linkedin_url)
+            elif request.domain:
+                if hasattr(connector, "enrich_company"):
+                    result = await connector.enrich_company(request.domain)
+                elif hasattr(connector, "enrich_by_domain"):
+                    result = await connector.enrich_by_domain(request.domain)
 
         if result:
             return {
@@ -274,6 +340,8 @@ async def enrich_company(request: EnrichRequest):
                 "found": False,
                 "company": None,
             }
+    except ConnectorPoolClosed as e:
+        raise HTTPException(503, str(e)) from e
     except Exception as e:
         raise HTTPException(500, f"Enrichment failed: {str(e)}")
 
@@ -292,7 +360,7 @@ async def find_people(request: PeopleSearchRequest):
 
     Returns list of people in standard format.
     """
-    from atlas.connectors.registry import ConnectorRegistry
+    from atlas.connectors.registry import ConnectorPoolClosed, ConnectorRegistry
 
     connector_class = ConnectorRegistry.get(request.connector_id)
     if not connector_class:
@@ -307,34 +375,31 @@ async def find_people(request: PeopleSearchRequest):
         )
 
     try:
-        connector = connector_class(**request.auth_config)
-
-        # Call the appropriate method based on connector
-        if request.connector_id == "apollo":
-            results = await connector.find_by_company_domain(
-                request.domain,
-                limit=request.limit,
-                titles=request.titles,
-                seniorities=request.seniorities,
-            )
-        elif request.connector_id == "hunter":
-            results = await connector.find_by_company_domain(
-                request.domain,
-                limit=request.limit,
-            )
-        elif request.connector_id == "linkedin":
-            results = await connector.find_by_company_domain(
-                request.domain,
-                limit=request.limit,
-                titles=request.titles,
-            )
-        else:
-            results = await connector.find_by_company_domain(
-                request.domain,
-                limit=request.limit,
-            )
-
-        await connector.close()
+        async with ConnectorRegistry.acquire(request.connector_id, **request.auth_config) as connector:
+            # Call the appropriate method based on connector
+            if request.connector_id == "apollo":
+                results = await connector.find_by_company_domain(
+                    request.domain,
+                    limit=request.limit,
+                    titles=request.titles,
+                    seniorities=request.seniorities,
+                )
+            elif request.connector_id == "hunter":
+                results = await connector.find_by_company_domain(
+                    request.domain,
+                    limit=request.limit,
+                )
+            elif request.connector_id == "linkedin":
+                results = await connector.find_by_company_domain(
+                    request.domain,
+                    limit=request.limit,
+                    titles=request.titles,
+                )
+            else:
+                results = await connector.find_by_company_domain(
+                    request.domain,
+                    limit=request.limit,
+                )
 
         return {
             "connector": request.connector_id,
@@ -344,6 +409,8 @@ async def find_people(request: PeopleSearchRequest):
         }
     except ValueError as e:
         raise HTTPException(400, str(e))
+    except ConnectorPoolClosed as e:
+        raise HTTPException(503, str(e)) from e
     except Exception as e:
         raise HTTPException(500, f"People search failed: {str(e)}")
 
@@ -495,13 +562,12 @@ async def verify_email(request: EmailVerifyRequest):
 
     Uses Hunter.io email verification.
     """
-    from atlas.connectors.hunter import HunterConnector
+    from atlas.connectors.hunter import HunterConnector  # noqa: F401 (registers "hunter")
+    from atlas.connectors.registry import ConnectorRegistry
 
     try:
-        connector = HunterConnector(api_key=request.api_key)
-        result = await connector.verify_email(request.email)
-        await connector.close()
-        return result
+        async with ConnectorRegistry.acquire("hunter", api_key=request.api_key) as connector:
+            return await connector.verify_email(request.email)
     except Exception as e:
         raise HTTPException(500, f"Email verification failed: {str(e)}")
 
@@ -513,16 +579,15 @@ async def find_email(request: EmailFindRequest):
 
     Uses Hunter.io email finder.
     """
-    from atlas.connectors.hunter import HunterConnector
+    from atlas.connectors.hunter import HunterConnector  # noqa: F401 (registers "hunter")
+    from atlas.connectors.registry import ConnectorRegistry
 
     try:
-        connector = HunterConnector(api_key=request.api_key)
-        result = await connector.find_email(
-            request.domain,
-            request.first_name,
-            request.last_name,
-        )
-        await connector.close()
-        return result
+        async with ConnectorRegistry.acquire("hunter", api_key=request.api_key) as connector:
+            return await connector.find_email(
+                request.domain,
+                request.first_name,
+                request.last_name,
+            )
     except Exception as e:
         raise HTTPException(500, f"Email finding failed: {str(e)}")
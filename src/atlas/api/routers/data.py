@@ -8,27 +8,34 @@ Provides endpoints for:
 - Signals and intent data
 - Activities
 - Dashboard metrics
+
+All queries go through the async data-access layer (graph_dal), so Bolt I/O
+never blocks the event loop and independent queries run concurrently.
+Dashboard aggregates are served from materialized snapshots (analytics).
 """
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
-import os
+import asyncio
 import json
 
-from neo4j import GraphDatabase
+from atlas.services.query_api.analytics import DASHBOARD_METRICS, PIPELINE_STATS, snapshot
+from atlas.services.query_api.graph_dal import read_all, read_many
+from atlas.services.query_api.graph_projection import projection_holder
+from atlas.services.query_api.paging import (
+    Keyset,
+    fetch_page,
+    list_query,
+    ndjson_response,
+    page_total,
+    where,
+)
+from atlas.services.query_api.search import ENTITY_TYPES, search_entities
 
 router = APIRouter(prefix="/api", tags=["data"])
 
-# Neo4j connection
-NEO4J_URI = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
-NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "neo4jpass")
-
-
-def get_neo4j_driver():
-    return GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-
 
 def record_to_dict(record) -> dict:
     """Convert Neo4j record to dictionary"""
@@ -42,6 +49,28 @@ def record_to_dict(record) -> dict:
     return result
 
 
+# =============================================================================
+# Keyset paging (see atlas.services.query_api.paging)
+# =============================================================================
+
+# Lists are keyset-paged: pass a page's next_cursor back as `cursor`. `has_more`
+# is always exact; `total` is null while a filtered count is still being cached.
+# List format: one JSON page, or format=ndjson to stream rows as Neo4j yields them
+ListFormat = Query(default="json", pattern="^(json|ndjson)$")
+
+COMPANY_KEYSET = Keyset("c.name", "c.id")
+# A person is listed once per company they work at: c.id makes the key unique
+PERSON_KEYSET = Keyset("p.full_name", "p.id", tiebreak="c.id")
+DEAL_KEYSET = Keyset("d.value", "d.id", descending=True)
+SIGNAL_KEYSET = Keyset("s.detected_at", "s.id", descending=True)
+
+# Unfiltered totals Neo4j answers from its count store in O(1)
+COMPANIES_COUNT_STORE = "MATCH (c:Company) RETURN count(c) as total"
+CONTACTS_COUNT_STORE = "MATCH (:Person)-[r:WORKS_AT]->() RETURN count(r) as total"
+DEALS_COUNT_STORE = "MATCH (:Deal)-[r:BELONGS_TO]->() RETURN count(r) as total"
+SIGNALS_COUNT_STORE = "MATCH (:Signal)-[r:ABOUT]->() RETURN count(r) as total"
+
+
 # =============================================================================
 # Companies
 # =============================================================================
@@ -51,104 +80,93 @@ async def get_companies(
     industry: Optional[str] = None,
     country: Optional[str] = None,
     size: Optional[str] = None,
-    limit: int = Query(default=50, le=200),
-    offset: int = 0
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    format: str = ListFormat,
 ):
-    """Get list of companies"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            # Build query with filters
-            filters = []
-            params = {"limit": limit, "offset": offset}
-
-            if industry:
-                filters.append("c.industry = $industry")
-                params["industry"] = industry
-            if country:
-                filters.append("c.country = $country")
-                params["country"] = country
-            if size:
-                filters.append("c.size = $size")
-                params["size"] = size
-
-            where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
-
-            query = f"""
-                MATCH (c:Company)
-                {where_clause}
-                OPTIONAL MATCH (p:Person)-[:WORKS_AT]->(c)
-                OPTIONAL MATCH (d:Deal)-[:BELONGS_TO]->(c)
-                WITH c, count(DISTINCT p) as contact_count, count(DISTINCT d) as deal_count
-                RETURN c, contact_count, deal_count
-                ORDER BY c.name
-                SKIP $offset
-                LIMIT $limit
-            """
-
-            result = session.run(query, params)
-            companies = []
-            for record in result:
-                company = dict(record["c"].items())
-                company["contact_count"] = record["contact_count"]
-                company["deal_count"] = record["deal_count"]
-                companies.append(company)
-
-            # Get total count
-            count_query = f"MATCH (c:Company) {where_clause} RETURN count(c) as total"
-            count_result = session.run(count_query, params)
-            total = count_result.single()["total"]
-
-            return {"companies": companies, "total": total}
-    finally:
-        driver.close()
+    """Get list of companies (keyset-paged by name; pass next_cursor back as cursor)"""
+    # Build query with filters
+    filters = []
+    params = {}
+
+    if industry:
+        filters.append("c.industry = $industry")
+        params["industry"] = industry
+    if country:
+        filters.append("c.country = $country")
+        params["country"] = country
+    if size:
+        filters.append("c.size = $size")
+        params["size"] = size
+
+    query = """
+        MATCH (c:Company)
+        WHERE {where}
+        WITH c ORDER BY {order} LIMIT $limit
+        RETURN c,
+            COUNT {{ (:Person)-[:WORKS_AT]->(c) }} as contact_count,
+            COUNT {{ (:Deal)-[:BELONGS_TO]->(c) }} as deal_count,
+            [c.name, c.id] as _key
+        ORDER BY {order}
+    """
+    count_query = f"MATCH (c:Company) {where(filters)} RETURN count(c) as total"
+
+    def to_company(row: dict) -> dict:
+        return {**row["c"], "contact_count": row["contact_count"], "deal_count": row["deal_count"]}
+
+    query, page_params, scope = list_query("companies", query, COMPANY_KEYSET, filters, params, cursor, limit)
+    if format == "ndjson":
+        return ndjson_response(query, page_params, limit, scope, to_company)
+
+    # Page and total are independent - run them concurrently
+    (companies, next_cursor), total = await asyncio.gather(
+        fetch_page(query, page_params, limit, scope, to_company),
+        page_total(scope, count_query, params, COMPANIES_COUNT_STORE),
+    )
+
+    return {"companies": companies, "total": total, "has_more": next_cursor is not None, "next_cursor": next_cursor}
 
 
 @router.get("/companies/{company_id}")
 async def get_company(company_id: str):
     """Get company details with contacts and deals"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            # Get company
-            result = session.run("""
-                MATCH (c:Company {id: $id})
-                RETURN c
-            """, id=company_id)
-            record = result.single()
-            if not record:
-                raise HTTPException(status_code=404, detail="Company not found")
-
-            company = dict(record["c"].items())
-
-            # Get contacts
-            contacts_result = session.run("""
-                MATCH (p:Person)-[:WORKS_AT]->(c:Company {id: $id})
-                RETURN p
-                ORDER BY p.seniority, p.full_name
-            """, id=company_id)
-            company["contacts"] = [dict(r["p"].items()) for r in contacts_result]
-
-            # Get deals
-            deals_result = session.run("""
-                MATCH (d:Deal)-[:BELONGS_TO]->(c:Company {id: $id})
-                RETURN d
-                ORDER BY d.created_at DESC
-            """, id=company_id)
-            company["deals"] = [dict(r["d"].items()) for r in deals_result]
-
-            # Get signals
-            signals_result = session.run("""
-                MATCH (s:Signal)-[:ABOUT]->(c:Company {id: $id})
-                RETURN s
-                ORDER BY s.detected_at DESC
-                LIMIT 10
-            """, id=company_id)
-            company["signals"] = [dict(r["s"].items()) for r in signals_result]
-
+    projection = projection_holder.get()
+    if projection is not None:
+        company = projection.company_detail(company_id)
+        if company is not None:
             return company
-    finally:
-        driver.close()
+    params = {"id": company_id}
+    company_records, contacts, deals, signals = await read_many(
+        ("""
+            MATCH (c:Company {id: $id})
+            RETURN c
+        """, params),
+        ("""
+            MATCH (p:Person)-[:WORKS_AT]->(c:Company {id: $id})
+            RETURN p
+            ORDER BY p.seniority, p.full_name
+        """, params),
+        ("""
+            MATCH (d:Deal)-[:BELONGS_TO]->(c:Company {id: $id})
+            RETURN d
+            ORDER BY d.created_at DESC
+        """, params),
+        ("""
+            MATCH (s:Signal)-[:ABOUT]->(c:Company {id: $id})
+            RETURN s
+            ORDER BY s.detected_at DESC
+            LIMIT 10
+        """, params),
+    )
+    if not company_records:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    company = dict(company_records[0]["c"].items())
+    company["contacts"] = [dict(r["p"].items()) for r in contacts]
+    company["deals"] = [dict(r["d"].items()) for r in deals]
+    company["signals"] = [dict(r["s"].items()) for r in signals]
+
+    return company
 
 
 # =============================================================================
@@ -159,45 +177,42 @@ async def get_company(company_id: str):
 async def get_contacts(
     company_id: Optional[str] = None,
     seniority: Optional[str] = None,
-    limit: int = Query(default=50, le=200),
-    offset: int = 0
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    format: str = ListFormat,
 ):
-    """Get list of contacts"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            filters = []
-            params = {"limit": limit, "offset": offset}
-
-            if company_id:
-                filters.append("c.id = $company_id")
-                params["company_id"] = company_id
-            if seniority:
-                filters.append("p.seniority = $seniority")
-                params["seniority"] = seniority
-
-            where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
-
-            query = f"""
-                MATCH (p:Person)-[:WORKS_AT]->(c:Company)
-                {where_clause}
-                RETURN p, c.name as company_name, c.id as company_id
-                ORDER BY p.full_name
-                SKIP $offset
-                LIMIT $limit
-            """
-
-            result = session.run(query, params)
-            contacts = []
-            for record in result:
-                contact = dict(record["p"].items())
-                contact["company_name"] = record["company_name"]
-                contact["company_id"] = record["company_id"]
-                contacts.append(contact)
-
-            return {"contacts": contacts, "total": len(contacts)}
-    finally:
-        driver.close()
+    """Get list of contacts (keyset-paged by name; pass next_cursor back as cursor)"""
+    filters = []
+    params = {}
+
+    if company_id:
+        filters.append("c.id = $company_id")
+        params["company_id"] = company_id
+    if seniority:
+        filters.append("p.seniority = $seniority")
+        params["seniority"] = seniority
+
+    query = """
+        MATCH (p:Person)-[:WORKS_AT]->(c:Company)
+        WHERE {where}
+        RETURN p, c.name as company_name, c.id as company_id, [p.full_name, p.id, c.id] as _key
+        ORDER BY {order}
+        LIMIT $limit
+    """
+
+    def to_contact(row: dict) -> dict:
+        return {**row["p"], "company_name": row["company_name"], "company_id": row["company_id"]}
+
+    query, page_params, scope = list_query("contacts", query, PERSON_KEYSET, filters, params, cursor, limit)
+    if format == "ndjson":
+        return ndjson_response(query, page_params, limit, scope, to_contact)
+
+    count_query = f"MATCH (p:Person)-[:WORKS_AT]->(c:Company) {where(filters)} RETURN count(*) as total"
+    (contacts, next_cursor), total = await asyncio.gather(
+        fetch_page(query, page_params, limit, scope, to_contact),
+        page_total(scope, count_query, params, CONTACTS_COUNT_STORE),
+    )
+    return {"contacts": contacts, "total": total, "has_more": next_cursor is not None, "next_cursor": next_cursor}
 
 
 # =============================================================================
@@ -209,143 +224,96 @@ async def get_deals(
     stage: Optional[str] = None,
     company_id: Optional[str] = None,
     owner: Optional[str] = None,
-    limit: int = Query(default=50, le=200),
-    offset: int = 0
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    format: str = ListFormat,
 ):
-    """Get list of deals"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            filters = []
-            params = {"limit": limit, "offset": offset}
-
-            if stage:
-                filters.append("d.stage = $stage")
-                params["stage"] = stage
-            if company_id:
-                filters.append("c.id = $company_id")
-                params["company_id"] = company_id
-            if owner:
-                filters.append("d.owner = $owner")
-                params["owner"] = owner
-
-            where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
-
-            query = f"""
-                MATCH (d:Deal)-[:BELONGS_TO]->(c:Company)
-                {where_clause}
-                OPTIONAL MATCH (d)-[:PRIMARY_CONTACT]->(p:Person)
-                RETURN d, c.name as company_name, c.id as company_id, p.full_name as contact_name
-                ORDER BY d.value DESC
-                SKIP $offset
-                LIMIT $limit
-            """
-
-            result = session.run(query, params)
-            deals = []
-            for record in result:
-                deal = dict(record["d"].items())
-                deal["company_name"] = record["company_name"]
-                deal["company_id"] = record["company_id"]
-                deal["contact_name"] = record["contact_name"]
-                # Parse competitors from JSON
-                if "competitors_json" in deal:
-                    deal["competitors"] = json.loads(deal.pop("competitors_json"))
-                deals.append(deal)
-
-            return {"deals": deals, "total": len(deals)}
-    finally:
-        driver.close()
+    """Get list of deals (keyset-paged by value, highest first; pass next_cursor back as cursor)"""
+    filters = []
+    params = {}
+
+    if stage:
+        filters.append("d.stage = $stage")
+        params["stage"] = stage
+    if company_id:
+        filters.append("c.id = $company_id")
+        params["company_id"] = company_id
+    if owner:
+        filters.append("d.owner = $owner")
+        params["owner"] = owner
+
+    query = """
+        MATCH (d:Deal)-[:BELONGS_TO]->(c:Company)
+        WHERE {where}
+        WITH d, c ORDER BY {order} LIMIT $limit
+        OPTIONAL MATCH (d)-[:PRIMARY_CONTACT]->(p:Person)
+        RETURN d, c.name as company_name, c.id as company_id, p.full_name as contact_name, [d.value, d.id] as _key
+        ORDER BY {order}
+    """
+
+    def to_deal(row: dict) -> dict:
+        deal = {
+            **row["d"],
+            "company_name": row["company_name"],
+            "company_id": row["company_id"],
+            "contact_name": row["contact_name"],
+        }
+        # Parse competitors from JSON
+        if "competitors_json" in deal:
+            deal["competitors"] = json.loads(deal.pop("competitors_json"))
+        return deal
+
+    query, page_params, scope = list_query("deals", query, DEAL_KEYSET, filters, params, cursor, limit)
+    if format == "ndjson":
+        return ndjson_response(query, page_params, limit, scope, to_deal)
+
+    count_query = f"MATCH (d:Deal)-[:BELONGS_TO]->(c:Company) {where(filters)} RETURN count(*) as total"
+    (deals, next_cursor), total = await asyncio.gather(
+        fetch_page(query, page_params, limit, scope, to_deal),
+        page_total(scope, count_query, params, DEALS_COUNT_STORE),
+    )
+    return {"deals": deals, "total": total, "has_more": next_cursor is not None, "next_cursor": next_cursor}
 
 
 @router.get("/deals/pipeline-stats")
 async def get_pipeline_stats():
-    """Get pipeline statistics for dashboard"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            result = session.run("""
-                MATCH (d:Deal)
-                WITH d.stage as stage, count(d) as count, sum(d.value) as value
-                RETURN stage, count, value
-                ORDER BY
-                    CASE stage
-                        WHEN 'Discovery' THEN 1
-                        WHEN 'Qualification' THEN 2
-                        WHEN 'Proposal' THEN 3
-                        WHEN 'Negotiation' THEN 4
-                        WHEN 'Closed Won' THEN 5
-                        WHEN 'Closed Lost' THEN 6
-                    END
-            """)
-
-            stages = []
-            total_value = 0
-            total_count = 0
-            weighted_value = 0
-
-            for record in result:
-                stage_data = {
-                    "stage": record["stage"],
-                    "count": record["count"],
-                    "value": record["value"]
-                }
-                stages.append(stage_data)
-                total_count += record["count"]
-                total_value += record["value"]
-
-                # Calculate weighted value
-                prob = {"Discovery": 0.1, "Qualification": 0.25, "Proposal": 0.5,
-                       "Negotiation": 0.75, "Closed Won": 1.0, "Closed Lost": 0}.get(record["stage"], 0)
-                weighted_value += record["value"] * prob
-
-            return {
-                "stages": stages,
-                "total_count": total_count,
-                "total_value": total_value,
-                "weighted_value": int(weighted_value),
-                "currency": "EUR"
-            }
-    finally:
-        driver.close()
+    """Get pipeline statistics for dashboard (materialized snapshot, see analytics)"""
+    return await run_in_threadpool(snapshot, PIPELINE_STATS)
 
 
 @router.get("/deals/{deal_id}")
 async def get_deal(deal_id: str):
     """Get deal details with activities"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            result = session.run("""
-                MATCH (d:Deal {id: $id})-[:BELONGS_TO]->(c:Company)
-                OPTIONAL MATCH (d)-[:PRIMARY_CONTACT]->(p:Person)
-                RETURN d, c, p
-            """, id=deal_id)
-            record = result.single()
-            if not record:
-                raise HTTPException(status_code=404, detail="Deal not found")
-
-            deal = dict(record["d"].items())
-            deal["company"] = dict(record["c"].items())
-            if record["p"]:
-                deal["primary_contact"] = dict(record["p"].items())
-
-            # Parse competitors
-            if "competitors_json" in deal:
-                deal["competitors"] = json.loads(deal.pop("competitors_json"))
-
-            # Get activities
-            activities_result = session.run("""
-                MATCH (a:Activity)-[:RELATED_TO]->(d:Deal {id: $id})
-                RETURN a
-                ORDER BY a.performed_at DESC
-                LIMIT 20
-            """, id=deal_id)
-            deal["activities"] = [dict(r["a"].items()) for r in activities_result]
-
-            return deal
-    finally:
-        driver.close()
+    params = {"id": deal_id}
+    deal_records, activities = await read_many(
+        ("""
+            MATCH (d:Deal {id: $id})-[:BELONGS_TO]->(c:Company)
+            OPTIONAL MATCH (d)-[:PRIMARY_CONTACT]->(p:Person)
+            RETURN d, c, p
+        """, params),
+        ("""
+            MATCH (a:Activity)-[:RELATED_TO]->(d:Deal {id: $id})
+            RETURN a
+            ORDER BY a.performed_at DESC
+            LIMIT 20
+        """, params),
+    )
+    if not deal_records:
+        raise HTTPException(status_code=404, detail="Deal not found")
+
+    record = deal_records[0]
+    deal = dict(record["d"].items())
+    deal["company"] = dict(record["c"].items())
+    if record["p"]:
+        deal["primary_contact"] = dict(record["p"].items())
+
+    # Parse competitors
+    if "competitors_json" in deal:
+        deal["competitors"] = json.loads(deal.pop("competitors_json"))
+
+    deal["activities"] = [dict(r["a"].items()) for r in activities]
+
+    return deal
 
 
 # =============================================================================
@@ -358,94 +326,87 @@ async def get_signals(
     impact: Optional[str] = None,
     company_id: Optional[str] = None,
     is_read: Optional[bool] = None,
-    limit: int = Query(default=50, le=200),
-    offset: int = 0
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    format: str = ListFormat,
 ):
-    """Get list of signals"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            filters = []
-            params = {"limit": limit, "offset": offset}
-
-            if signal_type:
-                filters.append("s.type = $type")
-                params["type"] = signal_type
-            if impact:
-                filters.append("s.impact = $impact")
-                params["impact"] = impact
-            if company_id:
-                filters.append("c.id = $company_id")
-                params["company_id"] = company_id
-            if is_read is not None:
-                filters.append("s.is_read = $is_read")
-                params["is_read"] = is_read
-
-            where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
-
-            query = f"""
-                MATCH (s:Signal)-[:ABOUT]->(c:Company)
-                {where_clause}
-                RETURN s, c.name as company_name, c.id as company_id
-                ORDER BY s.detected_at DESC
-                SKIP $offset
-                LIMIT $limit
-            """
-
-            result = session.run(query, params)
-            signals = []
-            for record in result:
-                signal = dict(record["s"].items())
-                signal["company_name"] = record["company_name"]
-                signal["company_id"] = record["company_id"]
-                signals.append(signal)
-
-            return {"signals": signals, "total": len(signals)}
-    finally:
-        driver.close()
+    """Get list of signals (keyset-paged, newest first; pass next_cursor back as cursor)"""
+    filters = []
+    params = {}
+
+    if signal_type:
+        filters.append("s.type = $type")
+        params["type"] = signal_type
+    if impact:
+        filters.append("s.impact = $impact")
+        params["impact"] = impact
+    if company_id:
+        filters.append("c.id = $company_id")
+        params["company_id"] = company_id
+    if is_read is not None:
+        filters.append("s.is_read = $is_read")
+        params["is_read"] = is_read
+
+    query = """
+        MATCH (s:Signal)-[:ABOUT]->(c:Company)
+        WHERE {where}
+        RETURN s, c.name as company_name, c.id as company_id, [s.detected_at, s.id] as _key
+        ORDER BY {order}
+        LIMIT $limit
+    """
+
+    def to_signal(row: dict) -> dict:
+        return {**row["s"], "company_name": row["company_name"], "company_id": row["company_id"]}
+
+    query, page_params, scope = list_query("signals", query, SIGNAL_KEYSET, filters, params, cursor, limit)
+    if format == "ndjson":
+        return ndjson_response(query, page_params, limit, scope, to_signal)
+
+    count_query = f"MATCH (s:Signal)-[:ABOUT]->(c:Company) {where(filters)} RETURN count(*) as total"
+    (signals, next_cursor), total = await asyncio.gather(
+        fetch_page(query, page_params, limit, scope, to_signal),
+        page_total(scope, count_query, params, SIGNALS_COUNT_STORE),
+    )
+    return {"signals": signals, "total": total, "has_more": next_cursor is not None, "next_cursor": next_cursor}
 
 
 @router.get("/signals/summary")
 async def get_signals_summary():
     """Get signals summary for dashboard"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            result = session.run("""
-                MATCH (s:Signal)
-                WITH s.type as type, s.impact as impact, count(s) as count
-                RETURN type, impact, count
-                ORDER BY count DESC
-            """)
-
-            by_type = {}
-            by_impact = {"high": 0, "medium": 0, "low": 0}
-            total = 0
-
-            for record in result:
-                sig_type = record["type"]
-                impact = record["impact"]
-                count = record["count"]
-
-                by_type[sig_type] = by_type.get(sig_type, 0) + count
-                by_impact[impact] = by_impact.get(impact, 0) + count
-                total += count
-
-            # Get unread count
-            unread_result = session.run("""
-                MATCH (s:Signal {is_read: false})
-                RETURN count(s) as unread
-            """)
-            unread = unread_result.single()["unread"]
-
-            return {
-                "total": total,
-                "unread": unread,
-                "by_type": by_type,
-                "by_impact": by_impact
-            }
-    finally:
-        driver.close()
+    records, unread_records = await read_many(
+        ("""
+            MATCH (s:Signal)
+            WITH s.type as type, s.impact as impact, count(s) as count
+            RETURN type, impact, count
+            ORDER BY count DESC
+        """, None),
+        ("""
+            MATCH (s:Signal {is_read: false})
+            RETURN count(s) as unread
+        """, None),
+    )
+
+    by_type = {}
+    by_impact = {"high": 0, "medium": 0, "low": 0}
+    total = 0
+
+    for record in records:
+        sig_type = record["type"]
+        impact = record["impact"]
+        count = record["count"]
+
+        by_type[sig_type] = by_type.get(sig_type, 0) + count
+        by_impact[impact] = by_impact.get(impact, 0) + count
+        total += count
+
+    unread = unread_records[0]["unread"]
+
+    return {
+        "total": total,
+        "unread": unread,
+        "by_type": by_type,
+        "by_impact": by_impact
+    }
 
 
 # =============================================================================
@@ -455,47 +416,41 @@ async def get_signals_summary():
 @router.get("/meetings")
 async def get_meetings(
     upcoming_only: bool = True,
-    limit: int = Query(default=20, le=100)
+    limit: int = Query(default=20, ge=1, le=100)
 ):
     """Get meetings list"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            now = datetime.now().isoformat()
-
-            if upcoming_only:
-                query = """
-                    MATCH (m:Meeting)-[:WITH]->(c:Company)
-                    WHERE m.start_time >= $now
-                    OPTIONAL MATCH (m)-[:FOR_DEAL]->(d:Deal)
-                    RETURN m, c.name as company_name, c.id as company_id, d.name as deal_name
-                    ORDER BY m.start_time ASC
-                    LIMIT $limit
-                """
-            else:
-                query = """
-                    MATCH (m:Meeting)-[:WITH]->(c:Company)
-                    OPTIONAL MATCH (m)-[:FOR_DEAL]->(d:Deal)
-                    RETURN m, c.name as company_name, c.id as company_id, d.name as deal_name
-                    ORDER BY m.start_time DESC
-                    LIMIT $limit
-                """
-
-            result = session.run(query, now=now, limit=limit)
-            meetings = []
-            for record in result:
-                meeting = dict(record["m"].items())
-                meeting["company_name"] = record["company_name"]
-                meeting["company_id"] = record["company_id"]
-                meeting["deal_name"] = record["deal_name"]
-                # Parse attendees
-                if "attendees_json" in meeting:
-                    meeting["attendees"] = json.loads(meeting.pop("attendees_json"))
-                meetings.append(meeting)
-
-            return {"meetings": meetings, "total": len(meetings)}
-    finally:
-        driver.close()
+    now = datetime.now().isoformat()
+
+    if upcoming_only:
+        query = """
+            MATCH (m:Meeting)-[:WITH]->(c:Company)
+            WHERE m.start_time >= $now
+            OPTIONAL MATCH (m)-[:FOR_DEAL]->(d:Deal)
+            RETURN m, c.name as company_name, c.id as company_id, d.name as deal_name
+            ORDER BY m.start_time ASC
+            LIMIT $limit
+        """
+    else:
+        query = """
+            MATCH (m:Meeting)-[:WITH]->(c:Company)
+            OPTIONAL MATCH (m)-[:FOR_DEAL]->(d:Deal)
+            RETURN m, c.name as company_name, c.id as company_id, d.name as deal_name
+            ORDER BY m.start_time DESC
+            LIMIT $limit
+        """
+
+    meetings = []
+    for record in await read_all(query, {"now": now, "limit": limit}):
+        meeting = dict(record["m"].items())
+        meeting["company_name"] = record["company_name"]
+        meeting["company_id"] = record["company_id"]
+        meeting["deal_name"] = record["deal_name"]
+        # Parse attendees
+        if "attendees_json" in meeting:
+            meeting["attendees"] = json.loads(meeting.pop("attendees_json"))
+        meetings.append(meeting)
+
+    return {"meetings": meetings, "total": len(meetings)}
 
 
 # =============================================================================
@@ -504,85 +459,28 @@ async def get_meetings(
 
 @router.get("/dashboard/metrics")
 async def get_dashboard_metrics():
-    """Get dashboard overview metrics"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            # Get counts - use separate queries for reliability
-            companies_result = session.run("MATCH (c:Company) RETURN count(c) as count")
-            companies = companies_result.single()["count"]
-
-            contacts_result = session.run("MATCH (p:Person) RETURN count(p) as count")
-            contacts = contacts_result.single()["count"]
-
-            deals_result = session.run("""
-                MATCH (d:Deal)
-                WHERE NOT d.stage IN ['Closed Won', 'Closed Lost']
-                RETURN count(d) as count, sum(d.value) as value
-            """)
-            deals_record = deals_result.single()
-            open_deals = deals_record["count"]
-            pipeline_value = deals_record["value"] or 0
-
-            signals_result = session.run("MATCH (s:Signal) WHERE s.is_read = false RETURN count(s) as count")
-            unread_signals = signals_result.single()["count"]
-
-            meetings_result = session.run("MATCH (m:Meeting) RETURN count(m) as count")
-            upcoming_meetings = meetings_result.single()["count"]
-
-            # Get recent activities
-            activities_result = session.run("""
-                MATCH (a:Activity)
-                RETURN a.type as type, count(a) as count
-            """)
-            activity_counts = {r["type"]: r["count"] for r in activities_result}
-
-            # Get won deals this month
-            won_result = session.run("""
-                MATCH (d:Deal {stage: 'Closed Won'})
-                RETURN count(d) as won_count, sum(d.value) as won_value
-            """)
-            won = won_result.single()
-
-            return {
-                "companies": companies,
-                "contacts": contacts,
-                "open_deals": open_deals,
-                "pipeline_value": pipeline_value,
-                "unread_signals": unread_signals,
-                "upcoming_meetings": upcoming_meetings,
-                "won_deals": won["won_count"] if won else 0,
-                "won_value": won["won_value"] if won else 0,
-                "activity_counts": activity_counts,
-                "currency": "EUR"
-            }
-    finally:
-        driver.close()
+    """Get dashboard overview metrics (materialized snapshot, see analytics)"""
+    return await run_in_threadpool(snapshot, DASHBOARD_METRICS)
 
 
 @router.get("/dashboard/activity-feed")
-async def get_activity_feed(limit: int = Query(default=20, le=50)):
+async def get_activity_feed(limit: int = Query(default=20, ge=1, le=50)):
     """Get recent activity feed"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            result = session.run("""
-                MATCH (a:Activity)-[:RELATED_TO]->(d:Deal)-[:BELONGS_TO]->(c:Company)
-                RETURN a, d.name as deal_name, c.name as company_name
-                ORDER BY a.performed_at DESC
-                LIMIT $limit
-            """, limit=limit)
-
-            activities = []
-            for record in result:
-                activity = dict(record["a"].items())
-                activity["deal_name"] = record["deal_name"]
-                activity["company_name"] = record["company_name"]
-                activities.append(activity)
-
-            return {"activities": activities}
-    finally:
-        driver.close()
+    records = await read_all("""
+        MATCH (a:Activity)-[:RELATED_TO]->(d:Deal)-[:BELONGS_TO]->(c:Company)
+        RETURN a, d.name as deal_name, c.name as company_name
+        ORDER BY a.performed_at DESC
+        LIMIT $limit
+    """, {"limit": limit})
+
+    activities = []
+    for record in records:
+        activity = dict(record["a"].items())
+        activity["deal_name"] = record["deal_name"]
+        activity["company_name"] = record["company_name"]
+        activities.append(activity)
+
+    return {"activities": activities}
 
 
 # =============================================================================
@@ -594,40 +492,7 @@ async def search(
     q: str = Query(..., min_length=2),
     entity_type: Optional[str] = None
 ):
-    """Search across companies, contacts, and deals"""
-    driver = get_neo4j_driver()
-    try:
-        with driver.session() as session:
-            results = {"companies": [], "contacts": [], "deals": []}
-            search_term = f"(?i).*{q}.*"
-
-            if not entity_type or entity_type == "companies":
-                company_result = session.run("""
-                    MATCH (c:Company)
-                    WHERE c.name =~ $term OR c.industry =~ $term
-                    RETURN c
-                    LIMIT 10
-                """, term=search_term)
-                results["companies"] = [dict(r["c"].items()) for r in company_result]
-
-            if not entity_type or entity_type == "contacts":
-                contact_result = session.run("""
-                    MATCH (p:Person)-[:WORKS_AT]->(c:Company)
-                    WHERE p.full_name =~ $term OR p.job_title =~ $term
-                    RETURN p, c.name as company_name
-                    LIMIT 10
-                """, term=search_term)
-                results["contacts"] = [{**dict(r["p"].items()), "company_name": r["company_name"]} for r in contact_result]
-
-            if not entity_type or entity_type == "deals":
-                deal_result = session.run("""
-                    MATCH (d:Deal)-[:BELONGS_TO]->(c:Company)
-                    WHERE d.name =~ $term OR d.product =~ $term
-                    RETURN d, c.name as company_name
-                    LIMIT 10
-                """, term=search_term)
-                results["deals"] = [{**dict(r["d"].items()), "company_name": r["company_name"]} for r in deal_result]
-
-            return results
-    finally:
-        driver.close()
+    """Search across companies, contacts, and deals (full-text, ranked by relevance)"""
+    types = [t for t in ENTITY_TYPES if not entity_type or t == entity_type]
+    found = await search_entities(q, types)
+    return {t: found.get(t, []) for t in ENTITY_TYPES}
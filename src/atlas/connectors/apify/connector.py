@@ -25,6 +25,7 @@ from atlas.connectors.registry import (
     ConnectorRegistry,
 )
 from atlas.connectors.utils.rate_limiter import RateLimiter
+from atlas.connectors.utils.http import connector_limits
 
 
 APIFY_CONFIG = ConnectorConfig(
@@ -84,6 +85,7 @@ class ApifyConnector(BaseConnector):
             base_url=self.config.base_url,
             headers={"Authorization": f"Bearer {api_token}"},
             timeout=120.0,  # Long timeout for scraping jobs
+            limits=connector_limits(),
         )
         self.rate_limiter = RateLimiter(
             connector_id="apify",
@@ -116,11 +118,12 @@ class ApifyConnector(BaseConnector):
                 }
         except Exception:
             pass
-        return self.rate_limiter.get_status()
+        return await self.rate_limiter.get_status()
 
     async def close(self):
-        """Close HTTP client"""
+        """Close HTTP client and the rate limiter's Redis client"""
         await self.client.aclose()
+        await self.rate_limiter.close()
 
     # ─────────────────────────────────────────────────────────────
     # Actor Execution
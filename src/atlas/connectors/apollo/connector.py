@@ -9,10 +9,25 @@ Apollo provides:
 - Email finding and verification
 
 API Docs: https://apolloio.github.io/apollo-api-docs/
+
+Company search pages through results (Apollo returns at most 100 per page):
+page 1 tells how many pages exist, the following pages are fetched
+concurrently, each one only if the rate limiter admits it within
+APOLLO_PAGE_MAX_WAIT. Companies are deduplicated by domain and streamed as
+pages arrive (iter_search); search() collects them.
+
+Env:
+  APOLLO_SEARCH_MAX_PAGES=5       # depth limit per search
+  APOLLO_PAGE_CONCURRENCY=3       # pages in flight
+  APOLLO_PAGE_MAX_WAIT=10         # seconds a page may wait for rate-limit budget
 """
 
+import asyncio
+import math
+import os
 import httpx
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any, AsyncIterator, Set
 
 from atlas.connectors.registry import (
     BaseConnector,
@@ -23,6 +38,43 @@ from atlas.connectors.registry import (
 )
 from atlas.ingestors.common.base import CompanyIngestor, CompanyPeopleFinder
 from atlas.connectors.utils.rate_limiter import RateLimiter
+from atlas.connectors.utils.http import connector_limits
+
+SEARCH_MAX_PAGES = int(os.getenv("APOLLO_SEARCH_MAX_PAGES", "5"))
+PAGE_CONCURRENCY = int(os.getenv("APOLLO_PAGE_CONCURRENCY", "3"))
+PAGE_MAX_WAIT = float(os.getenv("APOLLO_PAGE_MAX_WAIT", "10"))
+PER_PAGE_MAX = 100
+
+
+@dataclass
+class SearchStats:
+    """What a paginated search fetched (filled in while iterating)"""
+    total_entries: Optional[int] = None   # matches reported by Apollo
+    pages_available: int = 0
+    pages_fetched: int = 0
+    pages_skipped: int = 0                # not admitted by the rate limiter in time
+    depth_limited: bool = False           # more pages were needed than max_pages
+    pages_failed: List[int] = field(default_factory=list)
+    duplicates: int = 0
+    returned: int = 0
+
+    @property
+    def truncated(self) -> bool:
+        """Fewer pages were read than needed for the requested limit"""
+        return bool(self.pages_skipped or self.pages_failed or self.depth_limited)
+
+    def to_dict(self) -> dict:
+        return {
+            "total_entries": self.total_entries,
+            "pages_available": self.pages_available,
+            "pages_fetched": self.pages_fetched,
+            "pages_skipped": self.pages_skipped,
+            "pages_failed": self.pages_failed,
+            "depth_limited": self.depth_limited,
+            "duplicates": self.duplicates,
+            "returned": self.returned,
+            "truncated": self.truncated,
+        }
 
 
 APOLLO_CONFIG = ConnectorConfig(
@@ -69,6 +121,7 @@ class ApolloConnector(BaseConnector, CompanyIngestor, CompanyPeopleFinder):
                 "Content-Type": "application/json",
             },
             timeout=30.0,
+            limits=connector_limits(),
         )
         self.rate_limiter = RateLimiter(
             connector_id="apollo",
@@ -95,11 +148,12 @@ class ApolloConnector(BaseConnector, CompanyIngestor, CompanyPeopleFinder):
 
     async def get_rate_limit_status(self) -> dict:
         """Get current rate limit status"""
-        return self.rate_limiter.get_status()
+        return await self.rate_limiter.get_status()
 
     async def close(self):
-        """Close HTTP client"""
+        """Close HTTP client and the rate limiter's Redis client"""
         await self.client.aclose()
+        await self.rate_limiter.close()
 
     # ─────────────────────────────────────────────────────────────
     # CompanyIngestor Implementation
@@ -110,27 +164,137 @@ class ApolloConnector(BaseConnector, CompanyIngestor, CompanyPeopleFinder):
         query: str,
         limit: int = 20,
         filters: Optional[Dict[str, Any]] = None,
+        max_pages: int = SEARCH_MAX_PAGES,
     ) -> List[Dict[str, Any]]:
         """
         Search for companies.
 
         Args:
             query: Company name or keyword
-            limit: Maximum results (max 100 per page)
+            limit: Maximum results (100 per page, up to max_pages pages)
             filters: Optional filters
                 - employee_ranges: ["1,10", "11,50", "51,200", "201,500", "501,1000", "1001,5000", "5001,10000", "10001+"]
                 - locations: ["Netherlands", "Germany", "Belgium"]
                 - industries: ["software", "manufacturing", "retail"]
+            max_pages: Depth limit
 
         Returns:
-            List of company records in standard format
+            List of company records in standard format, unique by domain
         """
-        await self.rate_limiter.wait_and_acquire()
+        return [c async for c in self.iter_search(query, limit, filters, max_pages=max_pages)]
+
+    async def iter_search(
+        self,
+        query: str,
+        limit: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        max_pages: int = SEARCH_MAX_PAGES,
+        concurrency: int = PAGE_CONCURRENCY,
+        stats: Optional[SearchStats] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream companies matching a search, page by page as pages arrive.
+
+        Page 1 is fetched first (it reports how many pages exist); pages
+        2..n are then fetched `concurrency` at a time, so later pages may
+        arrive out of order. A page the rate limiter cannot admit within
+        APOLLO_PAGE_MAX_WAIT is skipped (see stats.pages_skipped). Companies
+        are deduplicated by domain (by Apollo id when there is no domain);
+        one with neither is always yielded.
 
+        Args:
+            query: Company name or keyword
+            limit: Maximum results
+            filters: Optional filters (see search)
+            max_pages: Depth limit
+            concurrency: Pages in flight
+            stats: Filled in while iterating (pages, duplicates, truncation)
+
+        Yields:
+            Company records in standard format
+        """
+        stats = stats if stats is not None else SearchStats()
+        if limit <= 0:
+            return
+        per_page = min(limit, PER_PAGE_MAX)
+        payload = self._search_payload(query, per_page, filters)
+        seen: Set[str] = set()
+
+        def fresh(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+            out = []
+            for org in data.get("organizations", []):
+                company = self._transform_company(org)
+                # company["id"] is never empty ("apollo:" without an org id), so key on the raw id
+                domain = (company.get("domain") or "").lower()
+                key = f"domain:{domain}" if domain else (f"id:{org['id']}" if org.get("id") else None)
+                if key is not None:
+                    if key in seen:
+                        stats.duplicates += 1
+                        continue
+                    seen.add(key)
+                out.append(company)
+            return out
+
+        # Page 1: errors propagate, as for a single-page search
+        await self.rate_limiter.wait_and_acquire()
+        data = await self._fetch_page(payload, 1)
+        stats.pages_fetched = 1
+        pagination = data.get("pagination") or {}
+        stats.total_entries = pagination.get("total_entries")
+        stats.pages_available = int(pagination.get("total_pages") or 1)
+        for company in fresh(data):
+            yield company
+            stats.returned += 1
+            if stats.returned >= limit:
+                return
+
+        pages_needed = min(stats.pages_available, math.ceil(limit / per_page))
+        last_page = min(pages_needed, max(1, max_pages))
+        stats.depth_limited = last_page < pages_needed
+        if last_page < 2:
+            return
+
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch(page: int) -> Optional[Dict[str, Any]]:
+            async with sem:
+                if not await self.rate_limiter.wait_and_acquire(max_wait=PAGE_MAX_WAIT):
+                    stats.pages_skipped += 1
+                    return None
+                try:
+                    return await self._fetch_page(payload, page)
+                except httpx.HTTPError as e:
+                    print(f"[apollo] search page {page} failed: {e}")
+                    stats.pages_failed.append(page)
+                    return None
+
+        tasks = [asyncio.create_task(fetch(page)) for page in range(2, last_page + 1)]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                data = await next_page
+                if data is None:
+                    continue
+                stats.pages_fetched += 1
+                for company in fresh(data):
+                    yield company
+                    stats.returned += 1
+                    if stats.returned >= limit:
+                        return
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _search_payload(
+        self,
+        query: str,
+        per_page: int,
+        filters: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Build the /mixed_companies/search body (without page)"""
         payload: Dict[str, Any] = {
             "q_organization_name": query,
-            "per_page": min(limit, 100),
-            "page": 1,
+            "per_page": per_page,
         }
 
         if filters:
@@ -141,15 +305,13 @@ class ApolloConnector(BaseConnector, CompanyIngestor, CompanyPeopleFinder):
             if "industries" in filters:
                 payload["organization_industry_tag_ids"] = filters["industries"]
 
-        response = await self.client.post("/mixed_companies/search", json=payload)
-        response.raise_for_status()
-        data = response.json()
-
-        companies = []
-        for org in data.get("organizations", []):
-            companies.append(self._transform_company(org))
+        return payload
 
-        return companies
+    async def _fetch_page(self, payload: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """One page of a company search"""
+        response = await self.client.post("/mixed_companies/search", json={**payload, "page": page})
+        response.raise_for_status()
+        return response.json()
 
     async def enrich_company(self, domain: str) -> Optional[Dict[str, Any]]:
         """
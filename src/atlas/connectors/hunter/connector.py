@@ -22,6 +22,7 @@ from atlas.connectors.registry import (
 )
 from atlas.ingestors.common.base import CompanyPeopleFinder
 from atlas.connectors.utils.rate_limiter import RateLimiter
+from atlas.connectors.utils.http import connector_limits
 
 
 HUNTER_CONFIG = ConnectorConfig(
@@ -67,6 +68,7 @@ class HunterConnector(BaseConnector, CompanyPeopleFinder):
         self.client = httpx.AsyncClient(
             base_url=self.config.base_url,
             timeout=30.0,
+            limits=connector_limits(),
         )
         self.rate_limiter = RateLimiter(
             connector_id="hunter",
@@ -106,11 +108,12 @@ class HunterConnector(BaseConnector, CompanyPeopleFinder):
                 }
         except Exception:
             pass
-        return self.rate_limiter.get_status()
+        return await self.rate_limiter.get_status()
 
     async def close(self):
-        """Close HTTP client"""
+        """Close HTTP client and the rate limiter's Redis client"""
         await self.client.aclose()
+        await self.rate_limiter.close()
 
     # ─────────────────────────────────────────────────────────────
     # CompanyPeopleFinder Implementation
@@ -23,6 +23,7 @@ from atlas.connectors.registry import (
 )
 from atlas.ingestors.common.base import CompanyIngestor
 from atlas.connectors.utils.rate_limiter import RateLimiter
+from atlas.connectors.utils.http import connector_limits
 from atlas.connectors.kvk.sbi_mapping import (
     sbi_to_industry,
     get_industries_for_sbi_codes,
@@ -78,6 +79,7 @@ class KvKConnector(BaseConnector, CompanyIngestor):
                 "Accept": "application/json",
             },
             timeout=30.0,
+            limits=connector_limits(),
         )
         self.rate_limiter = RateLimiter(
             connector_id="kvk",
@@ -103,7 +105,7 @@ class KvKConnector(BaseConnector, CompanyIngestor):
 
     async def get_rate_limit_status(self) -> dict:
         """Get current rate limit status"""
-        return self.rate_limiter.get_status()
+        return await self.rate_limiter.get_status()
 
     async def close(self):
         """Close HTTP client"""
@@ -24,6 +24,7 @@ from ..registry import (
     AuthType,
     ConnectorRegistry,
 )
+from ..utils.http import connector_limits
 
 
 LEMLIST_CONFIG = ConnectorConfig(
@@ -110,6 +111,7 @@ class LemlistConnector(BaseConnector):
                 },
                 auth=("", self.api_key),  # lemlist uses basic auth with empty username
                 timeout=30.0,
+                limits=connector_limits(),
             )
         return self._client
 
@@ -4,13 +4,33 @@ Connector Registry - Central registry for all data source connectors.
 
 This module provides the base classes and registry for managing
 connections to external data sources (Apollo, Hunter, KvK, etc.)
+
+Connector instances used by the API are long-lived: ConnectorPool keeps one
+instance per (connector type, credentials hash), so its httpx.AsyncClient
+connection pool and rate limiter survive across requests. The app lifespan
+opens the pool and drains it on shutdown.
+
+Env:
+  CONNECTOR_POOL_MAX_INSTANCES=64   # idle instances beyond this are closed (LRU)
+  CONNECTOR_POOL_IDLE_TTL=900       # seconds an unused instance is kept
+  CONNECTOR_POOL_DRAIN_TIMEOUT=30   # seconds shutdown waits for in-flight calls
 """
 
+import asyncio
+import hashlib
+import json
+import os
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, Dict, Any, Type, List
+from typing import Optional, Dict, Any, Type, List, AsyncIterator, Tuple
 from abc import ABC, abstractmethod
 
+POOL_MAX_INSTANCES = int(os.getenv("CONNECTOR_POOL_MAX_INSTANCES", "64"))
+POOL_IDLE_TTL = float(os.getenv("CONNECTOR_POOL_IDLE_TTL", "900"))
+POOL_DRAIN_TIMEOUT = float(os.getenv("CONNECTOR_POOL_DRAIN_TIMEOUT", "30"))
+
 
 class ConnectorType(Enum):
     """Categories of data connectors"""
@@ -136,9 +156,14 @@ class ConnectorRegistry:
 
         # List all registered connectors
         configs = ConnectorRegistry.list_all()
+
+        # Borrow a long-lived instance (API request handlers)
+        async with ConnectorRegistry.acquire("apollo", api_key=key) as apollo:
+            results = await apollo.search("bakery")
     """
 
     _connectors: Dict[str, Type[BaseConnector]] = {}
+    _pool: Optional["ConnectorPool"] = None
 
     @classmethod
     def register(cls, connector_id: str):
@@ -214,3 +239,214 @@ class ConnectorRegistry:
     def is_registered(cls, connector_id: str) -> bool:
         """Check if a connector is registered"""
         return connector_id in cls._connectors
+
+    # ─────────────────────────────────────────────────────────────
+    # Instance pool
+    # ─────────────────────────────────────────────────────────────
+
+    @classmethod
+    def open_pool(cls, **kwargs) -> "ConnectorPool":
+        """Start the shared instance pool (called from the app lifespan)"""
+        if cls._pool is None or cls._pool.closed:
+            cls._pool = ConnectorPool(cls.get, **kwargs)
+        return cls._pool
+
+    @classmethod
+    async def close_pool(cls, timeout: float = POOL_DRAIN_TIMEOUT) -> None:
+        """Drain and close the shared pool (called from the app lifespan)"""
+        pool, cls._pool = cls._pool, None
+        if pool is not None:
+            await pool.drain(timeout)
+
+    @classmethod
+    @asynccontextmanager
+    async def acquire(cls, connector_id: str, **auth_kwargs) -> AsyncIterator[BaseConnector]:
+        """
+        Borrow a connector instance for the duration of the block.
+
+        From the shared pool when it is open; otherwise a fresh instance
+        that is closed on exit (scripts, tests).
+
+        Raises:
+            ValueError: Unknown connector
+            ConnectorPoolClosed: The pool is draining for shutdown
+        """
+        if cls._pool is not None:
+            async with cls._pool.lease(connector_id, **auth_kwargs) as connector:
+                yield connector
+            return
+        connector = cls.get_instance(connector_id, **auth_kwargs)
+        if connector is None:
+            raise ValueError(f"Unknown connector: {connector_id}")
+        try:
+            yield connector
+        finally:
+            await connector.close()
+
+    @classmethod
+    def pool_stats(cls) -> dict:
+        """Statistics of the shared pool (empty if not open)"""
+        return cls._pool.stats() if cls._pool is not None else {"open": False}
+
+
+class ConnectorPoolClosed(RuntimeError):
+    """Raised when an instance is requested from a draining pool"""
+
+
+@dataclass
+class _PooledConnector:
+    connector_id: str
+    key: str
+    connector: BaseConnector
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    uses: int = 0
+
+
+def instance_key(connector_id: str, auth_kwargs: Dict[str, Any]) -> Tuple[str, str]:
+    """(connector id, sha256 of the credentials); secrets are never stored in keys"""
+    digest = hashlib.sha256(json.dumps(auth_kwargs, sort_keys=True, default=str).encode()).hexdigest()
+    return connector_id, digest
+
+
+class ConnectorPool:
+    """
+    Long-lived connector instances keyed by (connector id, credentials hash).
+
+    Instances are shared by concurrent requests (httpx.AsyncClient is safe
+    to share). Idle instances expire after `idle_ttl` seconds and the least
+    recently used idle ones are closed beyond `max_instances`. Single event
+    loop: checkout and release never await, so no lock is needed.
+    """
+
+    def __init__(
+        self,
+        factory,
+        max_instances: int = POOL_MAX_INSTANCES,
+        idle_ttl: float = POOL_IDLE_TTL,
+    ):
+        """
+        Args:
+            factory: connector_id -> connector class (ConnectorRegistry.get)
+            max_instances: Idle instances kept before LRU eviction
+            idle_ttl: Seconds an unused instance is kept
+        """
+        self._factory = factory
+        self.max_instances = max_instances
+        self.idle_ttl = idle_ttl
+        self._entries: Dict[Tuple[str, str], _PooledConnector] = {}
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.closed = False
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def _in_flight(self) -> int:
+        return sum(e.in_flight for e in self._entries.values())
+
+    def _checkout(self, connector_id: str, auth_kwargs: Dict[str, Any]) -> Tuple[_PooledConnector, List[_PooledConnector]]:
+        if self.closed:
+            raise ConnectorPoolClosed("connector pool is shutting down")
+        key = instance_key(connector_id, auth_kwargs)
+        entry = self._entries.get(key)
+        client = getattr(entry.connector, "client", None) if entry else None
+        stale = []
+        if entry is not None and getattr(client, "is_closed", False):
+            # Closed underneath us (e.g. a handler called close()): replace it
+            stale.append(self._entries.pop(key))
+            entry = None
+        if entry is None:
+            connector_class = self._factory(connector_id)
+            if connector_class is None:
+                raise ValueError(f"Unknown connector: {connector_id}")
+            entry = _PooledConnector(connector_id, key[1], connector_class(**auth_kwargs))
+            self._entries[key] = entry
+            self.created += 1
+        else:
+            self.reused += 1
+        entry.in_flight += 1
+        entry.uses += 1
+        entry.last_used = time.monotonic()
+        self._idle.clear()
+        return entry, stale + self._evictable()
+
+    def _evictable(self) -> List[_PooledConnector]:
+        now = time.monotonic()
+        idle = sorted(
+            (e for e in self._entries.values() if e.in_flight == 0),
+            key=lambda e: e.last_used,
+        )
+        over = max(0, len(self._entries) - self.max_instances)
+        out = []
+        for e in idle:
+            if over > 0 or now - e.last_used > self.idle_ttl:
+                out.append(e)
+                over -= 1
+        for e in out:
+            del self._entries[(e.connector_id, e.key)]
+        self.evicted += len(out)
+        return out
+
+    @staticmethod
+    async def _close(entries: List[_PooledConnector]) -> None:
+        for e in entries:
+            try:
+                await e.connector.close()
+            except Exception as exc:
+                print(f"[connectors] closing {e.connector_id} failed: {exc}")
+
+    @asynccontextmanager
+    async def lease(self, connector_id: str, **auth_kwargs) -> AsyncIterator[BaseConnector]:
+        """Borrow the shared instance for these credentials"""
+        entry, evicted = self._checkout(connector_id, auth_kwargs)
+        try:
+            await self._close(evicted)
+            yield entry.connector
+        finally:
+            entry.in_flight -= 1
+            entry.last_used = time.monotonic()
+            if self._in_flight() == 0:
+                self._idle.set()
+
+    async def drain(self, timeout: float = POOL_DRAIN_TIMEOUT) -> None:
+        """
+        Refuse new leases, wait up to `timeout` seconds for in-flight calls,
+        then close every instance.
+        """
+        self.closed = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            print(f"[connectors] {self._in_flight()} call(s) still in flight after {timeout:g}s; closing anyway")
+        entries, self._entries = list(self._entries.values()), {}
+        await self._close(entries)
+
+    def stats(self) -> dict:
+        """Pool counters and, per instance, usage and HTTP connection pool state"""
+        from atlas.connectors.utils.http import client_pool_stats
+
+        now = time.monotonic()
+        return {
+            "open": not self.closed,
+            "instances": len(self._entries),
+            "in_flight": self._in_flight(),
+            "created": self.created,
+            "reused": self.reused,
+            "evicted": self.evicted,
+            "max_instances": self.max_instances,
+            "idle_ttl": self.idle_ttl,
+            "connectors": [
+                {
+                    "connector": e.connector_id,
+                    "key": e.key[:12],
+                    "in_flight": e.in_flight,
+                    "uses": e.uses,
+                    "age_s": round(now - e.created_at, 1),
+                    "idle_s": round(now - e.last_used, 1) if e.in_flight == 0 else 0.0,
+                    "http": client_pool_stats(getattr(e.connector, "client", None)),
+                }
+                for e in self._entries.values()
+            ],
+        }
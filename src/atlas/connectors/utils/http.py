@@ -0,0 +1,50 @@
+"""
+HTTP client settings shared by the async connectors.
+
+Connector instances are long-lived (see ConnectorPool in registry.py), so each
+httpx.AsyncClient keeps its connections open between API requests. These
+limits bound how many sockets one connector instance may hold.
+
+Env:
+  CONNECTOR_HTTP_MAX_CONNECTIONS=20     # per connector instance
+  CONNECTOR_HTTP_KEEPALIVE=10           # idle connections kept open
+  CONNECTOR_HTTP_KEEPALIVE_EXPIRY=60    # seconds before an idle connection is closed
+"""
+
+from __future__ import annotations
+
+import os
+
+import httpx
+
+MAX_CONNECTIONS = int(os.getenv("CONNECTOR_HTTP_MAX_CONNECTIONS", "20"))
+KEEPALIVE = int(os.getenv("CONNECTOR_HTTP_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("CONNECTOR_HTTP_KEEPALIVE_EXPIRY", "60"))
+
+
+def connector_limits() -> httpx.Limits:
+    """Pool limits for a connector's AsyncClient"""
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=KEEPALIVE,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def client_pool_stats(client: httpx.AsyncClient | None) -> dict:
+    """
+    Open / idle connections of an AsyncClient's pool.
+
+    Reads httpcore internals, so it degrades to an empty dict if they change.
+    """
+    if client is None:
+        return {}
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", None)
+    if connections is None:
+        return {"closed": client.is_closed}
+    try:
+        idle = sum(1 for c in connections if c.is_idle())
+    except Exception:
+        idle = None
+    return {"closed": client.is_closed, "connections": len(connections), "idle": idle}
@@ -2,30 +2,85 @@
 """
 Rate limiting utilities for API connectors.
 
-Implements token bucket algorithm with Redis backend for distributed rate limiting.
+Implements GCRA (the generic cell rate algorithm, a token bucket stored as a
+single "theoretical arrival time") with a Redis backend for distributed rate
+limiting:
+
+- A request of n tokens advances the stored time by n * window / limit; it is
+  admitted if that stays within `burst` requests of now. Refill is
+  continuous (fractional), there is no per-request bookkeeping.
+- On Redis the check-and-advance is one Lua script, so concurrent workers
+  cannot all pass the same check, and the clock is Redis' TIME, so workers on
+  different hosts agree on it.
+- A request that is not admitted gets the exact delay after which it would
+  be. wait_and_acquire reserves its slot up front and sleeps exactly that
+  long (one round-trip, no polling); waiters are served in arrival order.
+- asyncio connections are bound to their event loop, so the limiter keeps
+  one Redis client per loop. A client is closed when it is dropped: after a
+  Redis error, on close(), or once its loop has ended.
+
+Usage:
+    limiter = RateLimiter("apollo", limit=50, window=60)
+    if await limiter.wait_and_acquire(max_wait=30):
+        ...
+
+Env:
+  REDIS_URL   # shared limits across processes; in-memory per process without it
 """
 
 import asyncio
-import time
-from typing import Optional
+import math
 import os
+import threading
+import time
+from typing import Optional, Tuple
 
 try:
-    import redis
+    import redis.asyncio as aioredis
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
 
+_REDIS_RETRY_AFTER = 30.0  # seconds on the in-memory fallback after a Redis error
+
+# KEYS[1] = limiter key
+# ARGV = emission interval (s/token), burst tolerance (s), tokens, max delay (s), dry run (0/1)
+# Returns {admitted (0/1), delay (s), remaining} as strings (Lua numbers are truncated to integers)
+_GCRA_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local emission = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tokens = tonumber(ARGV[3])
+local max_delay = tonumber(ARGV[4])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+  tat = now
+end
+local new_tat = tat + emission * tokens
+local delay = new_tat - tolerance - now
+if delay < 0 then
+  delay = 0
+end
+if delay > max_delay or ARGV[5] == '1' then
+  local remaining = math.floor((tolerance - (tat - now)) / emission)
+  return {'0', tostring(delay), tostring(remaining)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000) + 1)
+local remaining = math.floor((tolerance - (new_tat - now)) / emission)
+return {'1', tostring(delay), tostring(remaining)}
+"""
+
 
 class RateLimiter:
     """
-    Token bucket rate limiter with optional Redis backend.
+    GCRA rate limiter with optional Redis backend.
 
     Supports:
     - Per-connector rate limiting
-    - Distributed rate limiting via Redis
+    - Distributed rate limiting via Redis (atomic Lua script, async client)
     - Fallback to in-memory limiting
-    - Automatic retry with backoff
+    - Exact retry-after for waiting callers
     """
 
     def __init__(
@@ -33,7 +88,8 @@ class RateLimiter:
         connector_id: str,
         limit: int,
         window: int = 60,
-        redis_url: Optional[str] = None
+        redis_url: Optional[str] = None,
+        burst: Optional[int] = None,
     ):
         """
         Initialize rate limiter.
@@ -43,37 +99,99 @@ class RateLimiter:
             limit: Maximum requests per window
             window: Window size in seconds (default 60)
             redis_url: Redis URL for distributed limiting (optional)
+            burst: Requests admitted back-to-back from idle (default: limit)
         """
         self.connector_id = connector_id
         self.limit = limit
         self.window = window
+        self.burst = burst or limit
         self.redis_url = redis_url or os.getenv("REDIS_URL")
 
+        # Seconds of "credit" one token costs, and how far ahead of now the
+        # theoretical arrival time may run (= burst tokens)
+        self._emission = window / limit
+        self._tolerance = self._emission * self.burst
+
         # In-memory fallback
-        self._tokens = limit
-        self._last_update = time.time()
+        self._tat = 0.0
+        self._lock = threading.Lock()
 
-        # Redis client
-        self._redis: Optional["redis.Redis"] = None
-        if REDIS_AVAILABLE and self.redis_url:
-            try:
-                self._redis = redis.from_url(self.redis_url)
-                self._redis.ping()
-            except Exception:
-                self._redis = None
+        # Redis client and script per event loop (asyncio connections are loop-bound)
+        self._clients: dict[asyncio.AbstractEventLoop, tuple] = {}
+        self._clients_lock = threading.Lock()
+        self._redis_down_until = 0.0
 
     @property
     def _key(self) -> str:
         """Redis key for this rate limiter"""
         return f"rate_limit:{self.connector_id}"
 
-    def _refill_tokens(self):
-        """Refill tokens based on elapsed time (in-memory)"""
-        now = time.time()
-        elapsed = now - self._last_update
-        refill = int(elapsed * self.limit / self.window)
-        self._tokens = min(self.limit, self._tokens + refill)
-        self._last_update = now
+    def _check_tokens(self, tokens: int) -> None:
+        if tokens > self.burst:
+            raise ValueError(f"{tokens} tokens can never be admitted (burst is {self.burst})")
+
+    # ─────────────────────────────────────────────────────────────
+    # Backends: reserve `tokens` if the wait is <= max_delay
+    # ─────────────────────────────────────────────────────────────
+
+    def _reserve_memory(self, tokens: int, max_delay: float, dry_run: bool = False) -> Tuple[bool, float, int]:
+        """In-memory GCRA; returns (admitted, delay, remaining)"""
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            new_tat = tat + self._emission * tokens
+            delay = max(0.0, new_tat - self._tolerance - now)
+            if delay > max_delay or dry_run:
+                return False, delay, math.floor((self._tolerance - (tat - now)) / self._emission)
+            self._tat = new_tat
+            return True, delay, math.floor((self._tolerance - (new_tat - now)) / self._emission)
+
+    def _redis_script(self):
+        """Lua script bound to the running loop's client (None: use memory)"""
+        if not REDIS_AVAILABLE or not self.redis_url or time.monotonic() < self._redis_down_until:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            entry = self._clients.get(loop)
+            if entry is None:
+                # Clients of loops that have ended can no longer be used or awaited
+                for ended in [lp for lp in self._clients if lp.is_closed()]:
+                    del self._clients[ended]
+                client = aioredis.from_url(self.redis_url)
+                entry = self._clients[loop] = (client, client.register_script(_GCRA_LUA))
+        return entry[1]
+
+    async def _drop_client(self) -> None:
+        """Close and forget the running loop's Redis client"""
+        with self._clients_lock:
+            entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            try:
+                await entry[0].aclose()
+            except Exception as e:
+                print(f"[rate-limit] closing Redis client for {self.connector_id} failed: {e}")
+
+    async def _reserve(self, tokens: int, max_delay: float, dry_run: bool = False) -> Tuple[bool, float, int]:
+        self._check_tokens(tokens)
+        script = self._redis_script()
+        if script is None:
+            return self._reserve_memory(tokens, max_delay, dry_run)
+        try:
+            admitted, delay, remaining = await script(
+                keys=[self._key],
+                args=[self._emission, self._tolerance, tokens, max_delay, int(dry_run)],
+            )
+            return admitted == b"1", float(delay), int(float(remaining))
+        except Exception as e:
+            # Fallback to memory on Redis error, retry Redis after a pause
+            print(f"[rate-limit] Redis unavailable for {self.connector_id} ({e}); limiting in memory")
+            self._redis_down_until = time.monotonic() + _REDIS_RETRY_AFTER
+            await self._drop_client()
+            return self._reserve_memory(tokens, max_delay, dry_run)
+
+    # ─────────────────────────────────────────────────────────────
+    # Public API
+    # ─────────────────────────────────────────────────────────────
 
     async def acquire(self, tokens: int = 1) -> bool:
         """
@@ -85,57 +203,23 @@ class RateLimiter:
         Returns:
             True if tokens acquired, False if rate limited
         """
-        if self._redis:
-            return await self._acquire_redis(tokens)
-        return await self._acquire_memory(tokens)
-
-    async def _acquire_memory(self, tokens: int = 1) -> bool:
-        """In-memory token acquisition"""
-        self._refill_tokens()
-        if self._tokens >= tokens:
-            self._tokens -= tokens
-            return True
-        return False
-
-    async def _acquire_redis(self, tokens: int = 1) -> bool:
-        """Redis-based token acquisition using sliding window"""
-        if not self._redis:
-            return await self._acquire_memory(tokens)
-
-        try:
-            now = time.time()
-            pipe = self._redis.pipeline()
-
-            # Remove old entries outside the window
-            pipe.zremrangebyscore(self._key, 0, now - self.window)
-
-            # Count current requests in window
-            pipe.zcard(self._key)
-
-            # Add current request
-            pipe.zadd(self._key, {str(now): now})
-
-            # Set expiry on the key
-            pipe.expire(self._key, self.window + 1)
+        admitted, _, _ = await self._reserve(tokens, 0.0)
+        return admitted
 
-            results = pipe.execute()
-            current_count = results[1]
-
-            if current_count < self.limit:
-                return True
-
-            # Over limit, remove the request we just added
-            self._redis.zrem(self._key, str(now))
-            return False
-
-        except Exception:
-            # Fallback to memory on Redis error
-            return await self._acquire_memory(tokens)
+    async def retry_after(self, tokens: int = 1) -> float:
+        """
+        Seconds until `tokens` could be acquired (0 if now); reserves nothing.
+        """
+        _, delay, _ = await self._reserve(tokens, 0.0, dry_run=True)
+        return delay
 
     async def wait_and_acquire(self, tokens: int = 1, max_wait: float = 30.0) -> bool:
         """
         Wait for tokens to become available.
 
+        The slot is reserved immediately and the call sleeps exactly until it
+        comes up. A reservation whose wait would exceed max_wait is not made.
+
         Args:
             tokens: Number of tokens to acquire
             max_wait: Maximum seconds to wait
@@ -143,43 +227,34 @@ class RateLimiter:
         Returns:
             True if tokens acquired within timeout, False otherwise
         """
-        start = time.time()
-        while time.time() - start < max_wait:
-            if await self.acquire(tokens):
-                return True
-            # Wait before retry (exponential backoff)
-            wait_time = min(1.0, (time.time() - start) / 10 + 0.1)
-            await asyncio.sleep(wait_time)
-        return False
-
-    def get_status(self) -> dict:
+        admitted, delay, _ = await self._reserve(tokens, max_wait)
+        if not admitted:
+            return False
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return True
+
+    async def close(self) -> None:
+        """
+        Close the Redis client of the running event loop (clients of other
+        loops are closed from those loops, or dropped once they have ended).
+        """
+        await self._drop_client()
+
+    async def get_status(self) -> dict:
         """
         Get current rate limit status.
 
         Returns:
             Dict with limit, remaining, reset_in
         """
-        if self._redis:
-            try:
-                now = time.time()
-                self._redis.zremrangebyscore(self._key, 0, now - self.window)
-                current = self._redis.zcard(self._key)
-                return {
-                    "limit": self.limit,
-                    "remaining": max(0, self.limit - current),
-                    "reset_in": self.window,
-                    "window": self.window,
-                }
-            except Exception:
-                pass
-
-        # In-memory status
-        self._refill_tokens()
+        _, delay, remaining = await self._reserve(1, 0.0, dry_run=True)
         return {
             "limit": self.limit,
-            "remaining": self._tokens,
-            "reset_in": self.window,
+            "remaining": max(0, remaining),
+            "reset_in": round(delay, 3),
             "window": self.window,
+            "burst": self.burst,
         }
 
 
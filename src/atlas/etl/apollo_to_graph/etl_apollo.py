@@ -1,17 +1,54 @@
 """
 Reads raw Apollo batch from MinIO and upserts into Neo4j.
 Creates Company, Person, and Email nodes with relationships.
+
+Every `companies-*.json` shard under the prefix is loaded. Shards are streamed
+(atlas.etl.common.json_stream) in chunks of about ETL_CHUNK_ROWS rows
+(companies + people + emails), so memory and Neo4j transaction size stay flat
+however large the batch is. Writes are idempotent MERGEs, so a retry or a
+re-run of the whole prefix is safe.
+
+Each chunk is written by atlas.etl.common.parallel_writer: Company, Person and
+Email MERGEs run concurrently, partitioned by merge key, then the WORKS_AT and
+HAS_EMAIL relationships, each transaction retried on deadlocks. --serial writes
+each chunk as one transaction instead, retried as a whole with backoff.
+
+Companies and people carry a `content_hash` (atlas.etl.common.content_hash).
+Before a chunk is written the stored hashes are read back and unchanged records
+are skipped, so re-running an unchanged batch writes nothing; --force rewrites
+everything. A hash is only stored once the record's relationships are: in the
+final phase of the parallel writer, or in the chunk's transaction with
+--serial. A chunk that fails half-way is therefore rewritten by the re-run.
+
 Usage: python -m etl.apollo_to_graph.etl_apollo --prefix apollo/raw/TIMESTAMP
+
+Env:
+  ETL_CHUNK_ROWS=5000        # rows per chunk (one transaction with --serial)
+  ETL_CHUNK_RETRIES=3        # retries per chunk on transient errors (--serial)
+  ETL_WRITE_*                # parallel writer, see atlas.etl.common.parallel_writer
 """
 
 import argparse
-import json
 import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, fields
 
+from atlas.etl.common.content_hash import company_hash, person_hash
+from atlas.etl.common.graph_schema import ensure_schema
 from atlas.etl.common.idempotency import new_batch_id
+from atlas.etl.common.parallel_writer import WORKERS, ParallelWriter, Phase, WriteStats
 from atlas.etl.common.schema import Company
+from atlas.ingestors.common.lake_stream import is_record_key, iter_records
+from atlas.services.query_api.analytics import industries_of, refresh_after_batch
+from atlas.services.query_api.cache_tags import publish_batch
 from minio import Minio
 from neo4j import GraphDatabase
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+
+CHUNK_ROWS = int(os.getenv("ETL_CHUNK_ROWS", "5000"))
+CHUNK_RETRIES = int(os.getenv("ETL_CHUNK_RETRIES", "3"))
+SHARD_PREFIX = "companies-"
 
 
 def minio_client():
@@ -22,9 +59,63 @@ def minio_client():
     return Minio(endpoint, access_key=user, secret_key=pwd, secure=secure)
 
 
-def read_json(mc: Minio, bucket: str, key: str) -> dict:
-    data = mc.get_object(bucket, key).read()
-    return json.loads(data.decode("utf-8"))
+# ---------------------------
+# Reading
+# ---------------------------
+
+
+def list_shards(mc: Minio, bucket: str, prefix: str) -> list[str]:
+    """
+    Every companies-* shard (JSON or NDJSON, optionally .zst) directly under
+    the batch prefix, in shard order.
+    """
+    keys = []
+    for obj in mc.list_objects(bucket, prefix=f"{prefix.rstrip('/')}/"):
+        name = obj.object_name.rsplit("/", 1)[-1]
+        if name.startswith(SHARD_PREFIX) and is_record_key(name):
+            keys.append(obj.object_name)
+    return sorted(keys)
+
+
+def iter_companies(mc: Minio, bucket: str, key: str) -> Iterator[dict]:
+    """
+    Validated companies of one shard, decoded one at a time from the object
+    stream, with content hashes on the company and each person.
+    """
+    for raw in iter_records(mc, bucket, key, "companies"):
+        company = Company(**raw).model_dump()
+        company["content_hash"] = company_hash(company)
+        for person in company["people"]:
+            person["content_hash"] = person_hash(person, company["id"])
+        yield company
+
+
+def row_count(company: dict) -> int:
+    people = company.get("people") or []
+    return 1 + len(people) + sum(len(p.get("emails") or []) for p in people)
+
+
+def chunked(companies: Iterable[dict], max_rows: int) -> Iterator[list[dict]]:
+    """
+    Group companies into chunks of about `max_rows` rows. A company is never
+    split, so one with more rows than the limit forms a chunk of its own.
+    """
+    chunk: list[dict] = []
+    rows = 0
+    for company in companies:
+        n = row_count(company)
+        if chunk and rows + n > max_rows:
+            yield chunk
+            chunk, rows = [], 0
+        chunk.append(company)
+        rows += n
+    if chunk:
+        yield chunk
+
+
+# ---------------------------
+# Writing
+# ---------------------------
 
 
 def cypher_upsert(tx, companies, batch_id):
@@ -38,6 +129,7 @@ MERGE (co:Company {id: c.id})
     co.industry=c.industry,
     co.employee_count=c.employee_count,
     co.location=c.location,
+    co.content_hash=c.content_hash,
     co.created_at=timestamp()
   ON MATCH  SET 
     co.name=c.name, 
@@ -45,6 +137,7 @@ MERGE (co:Company {id: c.id})
     co.industry=c.industry,
     co.employee_count=c.employee_count,
     co.location=c.location,
+    co.content_hash=c.content_hash,
     co.updated_at=timestamp()
 WITH c, co
 UNWIND c.people AS p
@@ -53,11 +146,13 @@ MERGE (pe:Person {id: p.id})
     pe.full_name=p.full_name, 
     pe.title=p.title, 
     pe.department=p.department,
+    pe.content_hash=p.content_hash,
     pe.created_at=timestamp()
   ON MATCH  SET 
     pe.full_name=p.full_name, 
     pe.title=p.title, 
     pe.department=p.department,
+    pe.content_hash=p.content_hash,
     pe.updated_at=timestamp()
 MERGE (pe)-[r:WORKS_AT]->(co)
   ON CREATE SET r.batch_id=$batch_id
@@ -68,26 +163,311 @@ MERGE (pe)-[:HAS_EMAIL]->(e)
 """,
         companies=companies,
         batch_id=batch_id,
+    ).consume()
+
+
+COMPANY_PHASE = Phase(
+    "company",
+    """
+UNWIND $rows AS c
+MERGE (co:Company {id: c.id})
+  ON CREATE SET co += c.props, co.created_at=timestamp()
+  ON MATCH  SET co += c.props, co.updated_at=timestamp()
+""",
+    key="id",
+)
+
+PERSON_PHASE = Phase(
+    "person",
+    """
+UNWIND $rows AS p
+MERGE (pe:Person {id: p.id})
+  ON CREATE SET pe += p.props, pe.created_at=timestamp()
+  ON MATCH  SET pe += p.props, pe.updated_at=timestamp()
+""",
+    key="id",
+)
+
+EMAIL_PHASE = Phase(
+    "email",
+    """
+UNWIND $rows AS em
+MERGE (:Email {address: em.address})
+""",
+    key="address",
+)
+
+# Partitioned by the company: all of a company's people are linked by one worker
+WORKS_AT_PHASE = Phase(
+    "works_at",
+    """
+UNWIND $rows AS r
+MATCH (pe:Person {id: r.person_id})
+MATCH (co:Company {id: r.company_id})
+MERGE (pe)-[w:WORKS_AT]->(co)
+  ON CREATE SET w.batch_id=$batch_id
+""",
+    key="company_id",
+)
+
+HAS_EMAIL_PHASE = Phase(
+    "has_email",
+    """
+UNWIND $rows AS r
+MATCH (pe:Person {id: r.person_id})
+MATCH (e:Email {address: r.address})
+MERGE (pe)-[:HAS_EMAIL]->(e)
+""",
+    key="person_id",
+)
+
+# Run once WORKS_AT and HAS_EMAIL have committed: a stored hash means "fully
+# loaded", so a chunk that fails earlier is not skipped by the re-run
+COMPANY_HASH_PHASE = Phase(
+    "company_hash",
+    """
+UNWIND $rows AS c
+MATCH (co:Company {id: c.id})
+SET co.content_hash = c.content_hash
+""",
+    key="id",
+)
+
+PERSON_HASH_PHASE = Phase(
+    "person_hash",
+    """
+UNWIND $rows AS p
+MATCH (pe:Person {id: p.id})
+SET pe.content_hash = p.content_hash
+""",
+    key="id",
+)
+
+# content_hash is left to the hash phases
+COMPANY_PROPS = ("name", "domain", "industry", "employee_count", "location")
+PERSON_PROPS = ("full_name", "title", "department")
+
+STORED_HASHES = """
+UNWIND $ids AS id
+MATCH (n:{label} {{id: id}})
+RETURN n.id AS id, n.content_hash AS hash
+"""
+
+
+@dataclass
+class ChangeCounts:
+    companies_written: int = 0
+    companies_skipped: int = 0
+    people_written: int = 0
+    people_skipped: int = 0
+
+    def __iadd__(self, other: "ChangeCounts") -> "ChangeCounts":
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+        return self
+
+
+def _stored_hashes(driver, label: str, ids: list[str]) -> dict[str, str]:
+    if not ids:
+        return {}
+    with driver.session() as sess:
+        return sess.execute_read(
+            lambda tx: {r["id"]: r["hash"] for r in tx.run(STORED_HASHES.format(label=label), ids=ids)}
+        )
+
+
+def changed_only(driver, companies: list[dict]) -> tuple[list[dict], set[str], ChangeCounts]:
+    """
+    Drop records whose stored content_hash matches. Returns the companies that
+    still need a write (with only their changed people), the ids among them
+    whose own node is unchanged (kept just for their people), and the counts.
+    """
+    stored_companies = _stored_hashes(driver, "Company", [c["id"] for c in companies])
+    stored_people = _stored_hashes(driver, "Person", [p["id"] for c in companies for p in c["people"]])
+    counts = ChangeCounts()
+    out: list[dict] = []
+    unchanged_ids: set[str] = set()
+    for c in companies:
+        people = [p for p in c["people"] if stored_people.get(p["id"]) != p["content_hash"]]
+        counts.people_written += len(people)
+        counts.people_skipped += len(c["people"]) - len(people)
+        company_changed = stored_companies.get(c["id"]) != c["content_hash"]
+        if company_changed:
+            counts.companies_written += 1
+        else:
+            counts.companies_skipped += 1
+            if not people:
+                continue
+            unchanged_ids.add(c["id"])
+        out.append({**c, "people": people})
+    return out, unchanged_ids, counts
+
+
+def phase_rows(companies: list[dict], unchanged_ids: set[str] = frozenset()) -> dict[Phase, list[dict]]:
+    """
+    Flatten nested companies into the rows of each write phase; companies in
+    `unchanged_ids` only contribute their people.
+    """
+    rows: dict[Phase, list[dict]] = {
+        phase: []
+        for phase in (
+            COMPANY_PHASE,
+            PERSON_PHASE,
+            EMAIL_PHASE,
+            WORKS_AT_PHASE,
+            HAS_EMAIL_PHASE,
+            COMPANY_HASH_PHASE,
+            PERSON_HASH_PHASE,
+        )
+    }
+    emails: set[str] = set()
+    for c in companies:
+        if c["id"] not in unchanged_ids:
+            rows[COMPANY_PHASE].append({"id": c["id"], "props": {k: c.get(k) for k in COMPANY_PROPS}})
+            rows[COMPANY_HASH_PHASE].append({"id": c["id"], "content_hash": c.get("content_hash")})
+        for p in c.get("people") or []:
+            rows[PERSON_PHASE].append({"id": p["id"], "props": {k: p.get(k) for k in PERSON_PROPS}})
+            rows[PERSON_HASH_PHASE].append({"id": p["id"], "content_hash": p.get("content_hash")})
+            rows[WORKS_AT_PHASE].append({"person_id": p["id"], "company_id": c["id"]})
+            for em in p.get("emails") or []:
+                emails.add(em)
+                rows[HAS_EMAIL_PHASE].append({"person_id": p["id"], "address": em})
+    rows[EMAIL_PHASE] = [{"address": em} for em in emails]
+    return rows
+
+
+def write_parallel(
+    writer: ParallelWriter, companies: list[dict], batch_id: str, unchanged_ids: set[str] = frozenset()
+) -> WriteStats:
+    rows = phase_rows(companies, unchanged_ids)
+    return writer.write(
+        nodes=[(phase, rows[phase]) for phase in (COMPANY_PHASE, PERSON_PHASE, EMAIL_PHASE)],
+        rels=[(phase, rows[phase]) for phase in (WORKS_AT_PHASE, HAS_EMAIL_PHASE)],
+        final=[(phase, rows[phase]) for phase in (COMPANY_HASH_PHASE, PERSON_HASH_PHASE)],
+        batch_id=batch_id,
     )
 
 
+def write_chunk(driver, companies: list[dict], batch_id: str, retries: int = CHUNK_RETRIES) -> None:
+    """
+    Commit one chunk in its own transaction (--serial), content hashes
+    included: they commit with the relationships or not at all. execute_write already
+    retries within the driver's retry window; this adds whole-chunk retries
+    with backoff for longer outages (leader switch, restart).
+    """
+    for attempt in range(retries + 1):
+        try:
+            with driver.session() as sess:
+                sess.execute_write(cypher_upsert, companies, batch_id)
+            return
+        except (ServiceUnavailable, SessionExpired, TransientError) as e:
+            if attempt == retries:
+                raise
+            delay = 2**attempt
+            print(f"[etl] chunk of {len(companies)} companies failed ({e}); retry {attempt + 1}/{retries} in {delay}s")
+            time.sleep(delay)
+
+
+class Progress:
+    def __init__(self, shards: int):
+        self.shards = shards
+        self.companies = 0
+        self.rows = 0
+        self.chunks = 0
+        self.changes = ChangeCounts()
+        self.started = time.perf_counter()
+
+    def add(self, shard: int, chunk: list[dict], changes: ChangeCounts) -> None:
+        self.chunks += 1
+        self.companies += len(chunk)
+        self.rows += sum(row_count(c) for c in chunk)
+        self.changes += changes
+        elapsed = time.perf_counter() - self.started
+        print(
+            f"[etl] shard {shard}/{self.shards} chunk {self.chunks}: "
+            f"{self.companies} companies, {self.rows} rows ({self.rows / elapsed:.0f} rows/s); "
+            f"written {self.changes.companies_written} companies / {self.changes.people_written} people, "
+            f"skipped {self.changes.companies_skipped} / {self.changes.people_skipped} unchanged",
+            flush=True,
+        )
+
+
+def load_prefix(
+    mc: Minio,
+    driver,
+    bucket: str,
+    prefix: str,
+    batch_id: str,
+    chunk_rows: int = CHUNK_ROWS,
+    workers: int = WORKERS,
+    force: bool = False,
+) -> Progress:
+    """
+    Stream every shard under `prefix` into Neo4j chunk by chunk, each chunk
+    with the parallel writer (workers > 0) or as one transaction (workers=0),
+    skipping unchanged records unless `force`. Cached API responses are
+    invalidated per committed chunk; analytics snapshots once at the end for
+    the industries the batch touched.
+    """
+    writer = ParallelWriter(driver, workers=workers) if workers > 0 else None
+    shards = list_shards(mc, bucket, prefix)
+    if not shards:
+        raise FileNotFoundError(f"no companies-*.json shards under s3://{bucket}/{prefix}")
+    progress = Progress(len(shards))
+    industries: set[str] = set()
+    for n, key in enumerate(shards, start=1):
+        for chunk in chunked(iter_companies(mc, bucket, key), chunk_rows):
+            if force:
+                changed, unchanged_ids = chunk, set()
+                changes = ChangeCounts(
+                    companies_written=len(chunk), people_written=sum(len(c["people"]) for c in chunk)
+                )
+            else:
+                changed, unchanged_ids, changes = changed_only(driver, chunk)
+            if changed:
+                # Industries companies may be moving out of, read before they change
+                industries.update(industries_of(c for c in changed if c["id"] not in unchanged_ids))
+                if writer is not None:
+                    write_parallel(writer, changed, batch_id, unchanged_ids)
+                else:
+                    write_chunk(driver, changed, batch_id)
+                publish_batch(batch_id, changed)
+                industries.update(c["industry"] for c in changed if c.get("industry"))
+            progress.add(n, chunk, changes)
+    if progress.changes.companies_written or progress.changes.people_written:
+        refresh_after_batch(batch_id, [{"industry": i} for i in industries])
+    return progress
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--prefix", help="like apollo/raw/2025-10-26T14:22:11Z", required=True)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows read per chunk")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="concurrent write transactions per chunk")
+    parser.add_argument("--serial", action="store_true", help="write each chunk as one transaction")
+    parser.add_argument("--force", action="store_true", help="write records even if their content hash is unchanged")
     args = parser.parse_args()
     bucket = os.getenv("MINIO_BUCKET", "datalake")
     mc = minio_client()
-    # read one json file
-    data = read_json(mc, bucket, f"{args.prefix}/companies-00001.json")
-    companies = [Company(**c).model_dump() for c in data["companies"]]
     batch_id = new_batch_id()
     uri = os.getenv("NEO4J_URI")
     user = os.getenv("NEO4J_USER")
     pwd = os.getenv("NEO4J_PASSWORD")
     driver = GraphDatabase.driver(uri, auth=(user, pwd))
-    with driver.session() as sess:
-        sess.execute_write(cypher_upsert, companies, batch_id)
-    print("ETL done, batch:", batch_id)
+    try:
+        ensure_schema(driver)
+        progress = load_prefix(
+            mc, driver, bucket, args.prefix, batch_id, args.chunk_rows, 0 if args.serial else args.workers, args.force
+        )
+    finally:
+        driver.close()
+    changes = progress.changes
+    print(
+        f"ETL done, batch: {batch_id} ({progress.shards} shards, {progress.companies} companies, "
+        f"{progress.rows} rows in {progress.chunks} chunks; written {changes.companies_written} companies, "
+        f"{changes.people_written} people; skipped {changes.companies_skipped} companies, "
+        f"{changes.people_skipped} people unchanged)"
+    )
 
 
 if __name__ == "__main__":
@@ -20,15 +20,40 @@ Env (examples):
 
   # Fallback (FastEmbed)
   EMBED_MODEL=BAAI/bge-small-en-v1.5
+
+Each point's payload carries a `content_hash` of its text, payload and embedding
+model. Points whose stored hash matches are not re-embedded or re-written
+(--force to override); the run reports written and skipped counts.
+
+Texts are embedded through the shared embedding store
+(atlas.services.embedding_store, EMBED_STORE_PATH): a text already embedded by
+this or any other producer with the same model is not sent to the model again.
+
+Loading is pipelined (VectorPipeline): the reader streams every shard and cuts
+batches into a bounded queue, N workers embed and upsert with wait=False, so
+embedding, Qdrant writes and reading overlap. One wait=True write at the end is
+the consistency barrier. Batch size adapts to the observed embed latency, and
+OpenAI calls are spaced to stay under OPENAI_EMBED_RPM. --sequential runs the
+old one-batch-at-a-time loop.
+
+  VECTOR_ETL_WORKERS=4            # concurrent embed/upsert workers
+  VECTOR_ETL_QUEUE=8              # batches buffered between reader and workers
+  VECTOR_ETL_BATCH=128            # initial batch size
+  VECTOR_ETL_MIN_BATCH=16
+  VECTOR_ETL_MAX_BATCH=1024
+  VECTOR_ETL_TARGET_SECONDS=2     # embed latency per batch the sizing aims for
+  OPENAI_EMBED_RPM=3000           # OpenAI embedding requests per minute (0 = unlimited)
 """
 
 from __future__ import annotations
 
 import argparse
-import json
 import os
-from collections.abc import Iterable
-from dataclasses import dataclass
+import queue
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from typing import Any
 from uuid import UUID, uuid5
 
@@ -37,6 +62,10 @@ from minio import Minio
 from qdrant_client import QdrantClient
 from qdrant_client.models import Distance, PointStruct, VectorParams
 
+from atlas.etl.common.content_hash import content_hash
+from atlas.ingestors.common.lake_stream import is_record_key, iter_records
+from atlas.services.embedding_store import embed_through_store, shared_store
+
 # ----------------------------
 # Embedding backends
 # ----------------------------
@@ -79,12 +108,14 @@ class FastEmbedder(_BaseEmbedder):
         from fastembed import TextEmbedding
 
         self.model_name = model_name
-        self.embedding_dimension = self._emb.embedding_dimension
         self._emb = TextEmbedding(model_name=model_name)
 
     def embed(self, texts: list[str]) -> list[list[float]]:
         # fastembed yields numpy arrays; convert to lists
-        return [v.tolist() for v in self._emb.embed(texts)]
+        vecs = [v.tolist() for v in self._emb.embed(texts)]
+        if self.embedding_dimension is None and vecs:
+            self.embedding_dimension = len(vecs[0])
+        return vecs
 
 
 def build_embedder() -> _BaseEmbedder:
@@ -138,12 +169,14 @@ def qdrant_client() -> QdrantClient:
 
 def list_json_keys(mc: Minio, bucket: str, prefix: str) -> list[str]:
     objs = mc.list_objects(bucket, prefix=prefix, recursive=True)
-    return [o.object_name for o in objs if o.object_name.endswith(".json")]
+    return [o.object_name for o in objs if is_record_key(o.object_name)]
 
 
-def read_json(mc: Minio, bucket: str, key: str) -> dict:
-    data = mc.get_object(bucket, key).read()
-    return json.loads(data.decode("utf-8"))
+def iter_shard_companies(mc: Minio, bucket: str, key: str) -> Iterator[dict]:
+    """
+    Companies of one lake object (JSON, NDJSON or .zst), decoded incrementally.
+    """
+    yield from iter_records(mc, bucket, key, "companies")
 
 
 # ----------------------------
@@ -247,45 +280,335 @@ def _qdrant_point_id(raw: str) -> str:
     return str(uuid5(_QDRANT_NS, raw))
 
 
+def _model_id(embedder: _BaseEmbedder) -> str:
+    return getattr(embedder, "model", None) or getattr(embedder, "model_name", "") or type(embedder).__name__
+
+
+def _store_model(embedder: _BaseEmbedder) -> str:
+    """
+    Embedding store key, same "<provider>:<model>" naming as the query API.
+    """
+    if isinstance(embedder, OpenAIEmbedder):
+        return f"openai:{embedder.model}"
+    if isinstance(embedder, FastEmbedder):
+        return f"fastembed:{embedder.model_name}"
+    return _model_id(embedder)
+
+
+def embed_texts(embedder: _BaseEmbedder, texts: list[str], before_call=None) -> list[list[float]]:
+    """
+    Embed through the shared embedding store; only texts it doesn't have reach
+    the model (`before_call` runs before that call, e.g. rate limiting).
+    """
+
+    def call(missing: list[str]) -> list[list[float]]:
+        if before_call is not None:
+            before_call()
+        return embedder.embed(missing)
+
+    return embed_through_store(_store_model(embedder), texts, call, dim=embedder.embedding_dimension)
+
+
+def entity_hash(entity: Entity, model: str) -> str:
+    return content_hash({"text": entity.text, "payload": entity.payload, "model": model})
+
+
+def stored_hashes(client: QdrantClient, point_ids: list[str]) -> dict[str, str]:
+    """
+    point id -> stored content_hash; empty if the collection doesn't exist yet.
+    """
+    try:
+        points = client.retrieve(
+            collection_name=COLLECTION, ids=point_ids, with_payload=["content_hash"], with_vectors=False
+        )
+    except Exception:
+        return {}
+    return {str(p.id): (p.payload or {}).get("content_hash") for p in points}
+
+
 def upsert_entities(
     client: QdrantClient,
     embedder: _BaseEmbedder,
     entities: list[Entity],
     batch_size: int = 128,
-) -> int:
+    force: bool = False,
+) -> tuple[int, int]:
+    """
+    Embed and upsert entities whose content changed. Returns (written, skipped).
+    """
     total = 0
+    skipped = 0
+    ensured = False
     # Embed in batches to respect API limits (OpenAI) and keep RAM low (FastEmbed)
     for i in range(0, len(entities), batch_size):
         chunk = entities[i : i + batch_size]
+        if not force:
+            stored = stored_hashes(client, [_qdrant_point_id(e.id) for e in chunk])
+            model = _model_id(embedder)
+            fresh = [e for e in chunk if stored.get(_qdrant_point_id(e.id)) != entity_hash(e, model)]
+            skipped += len(chunk) - len(fresh)
+            chunk = fresh
+            if not chunk:
+                continue
         texts = [e.text for e in chunk]
         try:
-            vectors = embedder.embed(texts)  # type: ignore[assignment]
+            vectors = embed_texts(embedder, texts)
         except Exception as e:
             # If OpenAI failed mid-run, fallback to FastEmbed for the rest
             if not isinstance(embedder, FastEmbedder):
                 print(f"[embed] OpenAI failed ({e}); switching to FastEmbed for remaining batches.")
                 embedder = FastEmbedder(os.getenv("EMBED_MODEL", "BAAI/bge-small-en-v1.5"))
-                vectors = embedder.embed(texts)
+                vectors = embed_texts(embedder, texts)
             else:
                 raise
 
+        # The fallback may have replaced the embedder: hash with the model that produced the vectors
+        hashes = [entity_hash(e, _model_id(embedder)) for e in chunk]
+
         if embedder.embedding_dimension is None and vectors:
             embedder.embedding_dimension = len(vectors[0])
 
-        if i == 0:
+        if not ensured:
             ensure_collection(client, embedder.embedding_dimension or len(vectors[0]))
+            ensured = True
 
         points = [
             PointStruct(
                 id=_qdrant_point_id(e.id),  # UUIDv5 ID
                 vector=v,
-                payload={**e.payload, "ext_id": e.id},  # keep original external id
+                payload={**e.payload, "ext_id": e.id, "content_hash": h},  # keep original external id
             )
-            for e, v in zip(chunk, vectors, strict=False)
+            for e, v, h in zip(chunk, vectors, hashes, strict=False)
         ]
         client.upsert(collection_name=COLLECTION, points=points, wait=True)
         total += len(points)
-    return total
+    return total, skipped
+
+
+# ----------------------------
+# Pipelined loader
+# ----------------------------
+
+WORKERS = int(os.getenv("VECTOR_ETL_WORKERS", "4"))
+QUEUE_SIZE = int(os.getenv("VECTOR_ETL_QUEUE", "8"))
+BATCH_SIZE = int(os.getenv("VECTOR_ETL_BATCH", "128"))
+MIN_BATCH = int(os.getenv("VECTOR_ETL_MIN_BATCH", "16"))
+MAX_BATCH = int(os.getenv("VECTOR_ETL_MAX_BATCH", "1024"))
+TARGET_SECONDS = float(os.getenv("VECTOR_ETL_TARGET_SECONDS", "2"))
+OPENAI_RPM = int(os.getenv("OPENAI_EMBED_RPM", "3000"))
+
+
+class RequestSpacer:
+    """
+    Spaces calls evenly to stay under `per_minute` across all threads.
+    """
+
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class AdaptiveBatchSize:
+    """
+    Doubles the batch while embedding is well under `target` seconds per batch,
+    halves it when a batch takes longer (or the provider pushes back).
+    """
+
+    def __init__(
+        self,
+        initial: int = BATCH_SIZE,
+        minimum: int = MIN_BATCH,
+        maximum: int = MAX_BATCH,
+        target: float = TARGET_SECONDS,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target = target
+        self.size = max(minimum, min(maximum, initial))
+        self._lock = threading.Lock()
+
+    def observe(self, n: int, seconds: float) -> None:
+        with self._lock:
+            if seconds > self.target:
+                self.size = max(self.minimum, self.size // 2)
+            elif seconds < self.target / 2 and n >= self.size:
+                self.size = min(self.maximum, self.size * 2)
+
+    def shrink(self) -> None:
+        with self._lock:
+            self.size = max(self.minimum, self.size // 2)
+
+
+@dataclass
+class PipelineStats:
+    written: int = 0
+    skipped: int = 0
+    batches: int = 0
+    embed_seconds: float = 0.0
+    upsert_seconds: float = 0.0
+    seconds: float = 0.0
+    batch_sizes: list[int] = field(default_factory=list)
+
+    @property
+    def docs_per_second(self) -> float:
+        return (self.written + self.skipped) / self.seconds if self.seconds else 0.0
+
+
+class VectorPipeline:
+    """
+    reader -> bounded queue -> N embed+upsert workers -> final barrier.
+
+    The reader thread (the caller) filters unchanged entities and blocks when
+    the queue is full, so memory is bounded by QUEUE_SIZE batches. Workers
+    upsert with wait=False; Qdrant applies a collection's updates in order, so
+    re-writing the last batch with wait=True at the end returns only once every
+    earlier write is applied.
+    """
+
+    def __init__(
+        self,
+        client: QdrantClient,
+        embedder: _BaseEmbedder,
+        workers: int = WORKERS,
+        queue_size: int = QUEUE_SIZE,
+        batch: AdaptiveBatchSize | None = None,
+        rpm: int = OPENAI_RPM,
+        force: bool = False,
+    ):
+        self.client = client
+        self.embedder = embedder
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.batch = batch or AdaptiveBatchSize()
+        self.spacer = RequestSpacer(rpm)
+        self.force = force
+        self.stats = PipelineStats()
+        self._lock = threading.Lock()
+        self._errors: list[BaseException] = []
+        self._collection_ready = False
+        self._last_points: list[PointStruct] = []
+
+    # ---- reader ----
+
+    def _enqueue(self, batch: list[Entity], q: queue.Queue) -> None:
+        if not self.force:
+            stored = stored_hashes(self.client, [_qdrant_point_id(e.id) for e in batch])
+            model = _model_id(self.embedder)
+            fresh = [e for e in batch if stored.get(_qdrant_point_id(e.id)) != entity_hash(e, model)]
+            with self._lock:
+                self.stats.skipped += len(batch) - len(fresh)
+            batch = fresh
+        if batch:
+            q.put(batch)
+
+    def _produce(self, entities: Iterable[Entity], q: queue.Queue) -> None:
+        batch: list[Entity] = []
+        for entity in entities:
+            if self._errors:
+                return
+            batch.append(entity)
+            if len(batch) >= self.batch.size:
+                self._enqueue(batch, q)
+                batch = []
+        if batch:
+            self._enqueue(batch, q)
+
+    # ---- workers ----
+
+    def _embed(self, texts: list[str]) -> tuple[list[list[float]], _BaseEmbedder]:
+        embedder = self.embedder
+        spacer = self.spacer.wait if isinstance(embedder, OpenAIEmbedder) else None
+        try:
+            return embed_texts(embedder, texts, spacer), embedder
+        except Exception as e:
+            if isinstance(embedder, FastEmbedder):
+                raise
+            self.batch.shrink()
+            with self._lock:
+                # First worker to fail swaps the embedder for everyone
+                if self.embedder is embedder:
+                    print(f"[embed] OpenAI failed ({e}); switching to FastEmbed for remaining batches.")
+                    self.embedder = FastEmbedder(os.getenv("EMBED_MODEL", "BAAI/bge-small-en-v1.5"))
+                embedder = self.embedder
+            return embed_texts(embedder, texts), embedder
+
+    def _write(self, batch: list[Entity]) -> None:
+        t0 = time.perf_counter()
+        vectors, embedder = self._embed([e.text for e in batch])
+        embedded = time.perf_counter()
+        self.batch.observe(len(batch), embedded - t0)
+
+        with self._lock:
+            if not self._collection_ready:
+                ensure_collection(self.client, embedder.embedding_dimension or len(vectors[0]))
+                self._collection_ready = True
+
+        model = _model_id(embedder)
+        points = [
+            PointStruct(
+                id=_qdrant_point_id(e.id),
+                vector=v,
+                payload={**e.payload, "ext_id": e.id, "content_hash": entity_hash(e, model)},
+            )
+            for e, v in zip(batch, vectors, strict=False)
+        ]
+        self.client.upsert(collection_name=COLLECTION, points=points, wait=False)
+        with self._lock:
+            self._last_points = points
+            self.stats.written += len(points)
+            self.stats.batches += 1
+            self.stats.batch_sizes.append(len(points))
+            self.stats.embed_seconds += embedded - t0
+            self.stats.upsert_seconds += time.perf_counter() - embedded
+
+    def _work(self, q: queue.Queue) -> None:
+        while True:
+            batch = q.get()
+            if batch is None:
+                return
+            if self._errors:
+                continue  # drain so the reader never blocks on a dead pipeline
+            try:
+                self._write(batch)
+            except BaseException as e:
+                self._errors.append(e)
+
+    # ---- run ----
+
+    def run(self, entities: Iterable[Entity]) -> PipelineStats:
+        t0 = time.perf_counter()
+        q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        threads = [
+            threading.Thread(target=self._work, args=(q,), name=f"vector-etl-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in threads:
+            t.start()
+        try:
+            self._produce(entities, q)
+        finally:
+            for _ in threads:
+                q.put(None)
+            for t in threads:
+                t.join()
+        if self._errors:
+            raise self._errors[0]
+        if self._last_points:
+            # Consistency barrier: returns once every earlier wait=False write is applied
+            self.client.upsert(collection_name=COLLECTION, points=self._last_points, wait=True)
+        self.stats.seconds = time.perf_counter() - t0
+        return self.stats
 
 
 # ----------------------------
@@ -293,10 +616,30 @@ def upsert_entities(
 # ----------------------------
 
 
+def load_prefix(
+    mc: Minio,
+    client: QdrantClient,
+    embedder: _BaseEmbedder,
+    bucket: str,
+    keys: list[str],
+    workers: int = WORKERS,
+    force: bool = False,
+) -> PipelineStats:
+    """
+    Pipelined load of the given lake objects (one batch prefix), streaming
+    every shard. Callers share the Qdrant client and the loaded embedder.
+    """
+    entities = (e for key in keys for e in iter_entities({"companies": iter_shard_companies(mc, bucket, key)}))
+    return VectorPipeline(client, embedder, workers=workers, force=force).run(entities)
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--prefix", required=True, help="like apollo/raw/2025-10-26T14:22:11Z")
     parser.add_argument("--bucket", default=os.getenv("MINIO_BUCKET", "datalake"))
+    parser.add_argument("--force", action="store_true", help="re-embed even if the content hash is unchanged")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="concurrent embed/upsert workers")
+    parser.add_argument("--sequential", action="store_true", help="embed and upsert one batch at a time")
     args = parser.parse_args()
 
     mc = minio_client()
@@ -308,19 +651,40 @@ def main():
         print(f"No JSON files found under s3://{args.bucket}/{args.prefix}")
         return
 
+    if not args.sequential:
+        stats = load_prefix(mc, qc, embedder, args.bucket, keys, args.workers, args.force)
+        print(
+            f"Vector ETL done: files={len(keys)}, points={stats.written}, skipped={stats.skipped}, "
+            f"batches={stats.batches}, {stats.docs_per_second:.0f} docs/s, collection={COLLECTION}"
+        )
+        _print_store_stats()
+        return
+
     total_files = 0
     total_points = 0
+    total_skipped = 0
     for key in keys:
-        doc = read_json(mc, args.bucket, key)
-        ents = list(iter_entities(doc))
+        ents = list(iter_entities({"companies": iter_shard_companies(mc, args.bucket, key)}))
         if not ents:
             continue
-        upserted = upsert_entities(qc, embedder, ents)
+        upserted, skipped = upsert_entities(qc, embedder, ents, force=args.force)
         total_files += 1
         total_points += upserted
-        print(f"Upserted {upserted} points from {key}")
+        total_skipped += skipped
+        print(f"Upserted {upserted} points from {key} ({skipped} unchanged, skipped)")
+
+    print(
+        f"Vector ETL done: files={total_files}, points={total_points}, "
+        f"skipped={total_skipped}, collection={COLLECTION}"
+    )
+    _print_store_stats()
+
 
-    print(f"Vector ETL done: files={total_files}, points={total_points}, collection={COLLECTION}")
+def _print_store_stats() -> None:
+    store = shared_store()
+    if store is not None:
+        st = store.stats()
+        print(f"[embed-store] hits={st['hits']} misses={st['misses']} hit_ratio={st['hit_ratio']:.1%} ({st['path']})")
 
 
 if __name__ == "__main__":
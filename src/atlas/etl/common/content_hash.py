@@ -0,0 +1,36 @@
+"""
+Stable content hashes for lake records.
+
+Loaders store the hash next to the data they write (a `content_hash` property
+in Neo4j, a payload field in Qdrant) and skip records whose hash did not
+change, so re-running an unchanged batch costs reads, not writes.
+
+Hashes cover the record's own fields only: a company's hash excludes its
+people, a person's hash includes the company it works at and its emails
+(everything its rows and relationships are built from).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+import orjson
+
+# Bump to invalidate every stored hash when the write logic changes
+HASH_VERSION = "1"
+
+
+def content_hash(obj: Any) -> str:
+    payload = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return hashlib.sha256(HASH_VERSION.encode() + payload).hexdigest()
+
+
+def company_hash(company: dict) -> str:
+    return content_hash({k: v for k, v in company.items() if k not in ("people", "content_hash")})
+
+
+def person_hash(person: dict, company_id: str) -> str:
+    return content_hash(
+        {**{k: v for k, v in person.items() if k != "content_hash"}, "company_id": company_id}
+    )
@@ -0,0 +1,60 @@
+"""
+Neo4j schema bootstrap shared by the graph ETLs.
+
+Idempotent (IF NOT EXISTS): safe to run before every batch. Creates the merge-key
+constraints the upserts rely on, the range indexes behind keyset-paged lists
+(filter property first, then the sort key) and the full-text indexes used by
+atlas.services.query_api.search.
+"""
+
+from __future__ import annotations
+
+from neo4j.exceptions import ClientError
+
+CONSTRAINTS = [
+    "CREATE CONSTRAINT company_id IF NOT EXISTS FOR (c:Company) REQUIRE c.id IS UNIQUE",
+    "CREATE CONSTRAINT person_id IF NOT EXISTS FOR (p:Person) REQUIRE p.id IS UNIQUE",
+    "CREATE CONSTRAINT email_addr IF NOT EXISTS FOR (e:Email) REQUIRE e.address IS UNIQUE",
+]
+
+# Keyset pagination seeks: see query_api.paging and the list queries
+RANGE_INDEXES = [
+    "CREATE INDEX company_industry_name IF NOT EXISTS FOR (c:Company) ON (c.industry, c.name)",
+    "CREATE INDEX company_location_name IF NOT EXISTS FOR (c:Company) ON (c.location, c.name)",
+    "CREATE INDEX company_name IF NOT EXISTS FOR (c:Company) ON (c.name)",
+    "CREATE INDEX person_department_name IF NOT EXISTS FOR (p:Person) ON (p.department, p.full_name)",
+    "CREATE INDEX person_full_name IF NOT EXISTS FOR (p:Person) ON (p.full_name)",
+    "CREATE INDEX deal_value IF NOT EXISTS FOR (d:Deal) ON (d.value)",
+    "CREATE INDEX signal_detected_at IF NOT EXISTS FOR (s:Signal) ON (s.detected_at)",
+]
+
+# name -> (label, properties). The Apollo ETL writes Person.title, the CRM data
+# uses Person.job_title; both are indexed so either source is searchable.
+FULLTEXT_INDEXES: dict[str, tuple[str, list[str]]] = {
+    "company_search": ("Company", ["name", "domain", "industry"]),
+    "person_search": ("Person", ["full_name", "title", "job_title"]),
+    "deal_search": ("Deal", ["name", "product"]),
+}
+
+
+def fulltext_statements() -> list[str]:
+    out = []
+    for name, (label, props) in FULLTEXT_INDEXES.items():
+        fields = ", ".join(f"n.{p}" for p in props)
+        out.append(f"CREATE FULLTEXT INDEX {name} IF NOT EXISTS FOR (n:{label}) ON EACH [{fields}]")
+    return out
+
+
+def ensure_schema(driver) -> None:
+    """
+    Create constraints, range and full-text indexes (no-op when they already exist).
+    Schema statements cannot share a transaction with writes, so each runs on its own.
+    A statement that conflicts with existing schema (e.g. a plain index on the same
+    property created by the synthetic data generator) is reported and skipped.
+    """
+    with driver.session() as sess:
+        for stmt in CONSTRAINTS + RANGE_INDEXES + fulltext_statements():
+            try:
+                sess.run(stmt).consume()
+            except ClientError as e:
+                print(f"[schema] skipped ({e.code}): {stmt}")
@@ -0,0 +1,129 @@
+"""
+Incremental reader for large JSON documents in the lake.
+
+Raw batches are single objects like {"companies": [...], ...}. Instead of
+reading the whole object and json.loads-ing it, iter_array_items walks the
+top-level object from a byte stream and yields the elements of one array as
+they are decoded, so memory is bounded by the largest element plus one read
+buffer, not by the document.
+
+Stdlib only (json.JSONDecoder.raw_decode over a sliding buffer).
+
+Usage:
+    resp = mc.get_object(bucket, key)
+    try:
+        for company in iter_array_items(resp, "companies"):
+            ...
+    finally:
+        resp.close()
+        resp.release_conn()
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from collections.abc import Iterator
+from typing import Any, BinaryIO
+
+READ_SIZE = 1 << 16
+_WS = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """
+    Decoded text window over a byte stream; consumed text is dropped.
+    """
+
+    def __init__(self, stream: BinaryIO, read_size: int):
+        self.stream = stream
+        self.read_size = read_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.read_size)
+        if not chunk:
+            self.eof = True
+            self.text = self.text[self.pos :] + self._utf8.decode(b"", final=True)
+        else:
+            self.text = self.text[self.pos :] + self._utf8.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Next non-whitespace character (not consumed), "" at end of input.
+        """
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        got = self.peek()
+        if got != char:
+            raise ValueError(f"expected {char!r}, got {got!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """
+        Decode the next JSON value, reading more input until it is complete.
+        """
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number (or literal) that ends exactly at the buffer edge may continue
+            if end == len(self.text) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_array_items(stream: BinaryIO, key: str, read_size: int = READ_SIZE) -> Iterator[Any]:
+    """
+    Yield each element of the top-level `key` array of a JSON object.
+    Other top-level members are decoded and skipped. Yields nothing if `key` is absent.
+    """
+    buf = _Buffer(stream, read_size)
+    buf.expect("{")
+    if buf.peek() == "}":
+        return
+    while True:
+        name = buf.value()
+        buf.expect(":")
+        if name == key and buf.peek() == "[":
+            buf.pos += 1
+            if buf.peek() == "]":
+                buf.pos += 1
+            else:
+                while True:
+                    yield buf.value()
+                    sep = buf.peek()
+                    buf.pos += 1
+                    if sep == "]":
+                        break
+                    if sep != ",":
+                        raise ValueError(f"expected ',' or ']' in {key!r}, got {sep!r}")
+        else:
+            buf.value()
+        sep = buf.peek()
+        buf.pos += 1
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError(f"expected ',' or '}}', got {sep!r}")
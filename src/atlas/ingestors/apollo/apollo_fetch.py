@@ -7,6 +7,7 @@ Writes to s3://{bucket}/apollo/raw/{ISO_TS}/companies-00001.json and _meta.json
 import datetime
 import os
 
+from atlas.ingestors.common.lake_catalog import batch_recording
 from atlas.ingestors.common.s3_writer import ensure_bucket, put_json
 from atlas.ingestors.common.sidecar import make_sidecar
 
@@ -305,9 +306,10 @@ def main():
     ts = datetime.datetime.utcnow().isoformat() + "Z"
     prefix = f"apollo/raw/{ts}"
     data = fetch_apollo_mock()
-    put_json(bucket, f"{prefix}/companies-00001.json", data)
-    sidecar = make_sidecar("apollo.ai", count=len(data.get("companies", [])))
-    put_json(bucket, f"{prefix}/_meta.json", sidecar)
+    with batch_recording():
+        put_json(bucket, f"{prefix}/companies-00001.json", data)
+        sidecar = make_sidecar("apollo.ai", count=len(data.get("companies", [])))
+        put_json(bucket, f"{prefix}/_meta.json", sidecar)
     print(f"Wrote to s3://{bucket}/{prefix}")
 
 
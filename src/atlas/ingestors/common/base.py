@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
 
+from atlas.ingestors.common.transport import HttpTransport, shared_transport
+
 
 class CompanyIngestor(ABC):
+    @property
+    def http(self) -> HttpTransport:
+        """Shared pooled, retrying HTTP transport (see common.transport)"""
+        return shared_transport()
+
     @abstractmethod
     def search(self, query: str, limit: int = 20) -> list[dict]:
         """
@@ -22,8 +29,21 @@ class CompanyPeopleFinder(ABC):
     """
     Abstract base class for finding people at a company by domain.
     Takes a company domain and returns a list of people associated with that company.
+
+    `provider` names the upstream API; IngestionPipeline rate limits each
+    provider to `requests_per_minute` (None = unlimited). Lookups should raise
+    on transient errors (timeouts, 429, 5xx) so they count as failures, not as
+    companies without people.
     """
 
+    provider: str = "people"
+    requests_per_minute: int | None = None
+
+    @property
+    def http(self) -> HttpTransport:
+        """Shared pooled, retrying HTTP transport (see common.transport)"""
+        return shared_transport()
+
     @abstractmethod
     def find_by_company_domain(self, domain: str) -> list[dict]:
         """
@@ -0,0 +1,318 @@
+"""
+Lake catalog: batch discovery without recursive listings of the bucket.
+
+Raw batches live at `<source>/raw/<ISO timestamp>/<object>`
+(e.g. apollo/raw/2025-10-28T16:56:34.804420Z/companies-00001.json). Discovery
+used to list every object recursively and derive the batch prefixes from the
+keys. The catalog instead:
+
+  1) reads a small manifest object (`_catalog/manifest.json`, one entry per
+     batch: {"batches": {prefix: {"date", "objects", "bytes"}}}): one GET
+     returns every batch. Each batch's object listing is a separate index
+     (`_catalog/batches/<prefix>.json`, {"objects": {key: size}}), so a write
+     reads and rewrites its own batch's index and one small root entry, never
+     a listing of the whole lake;
+  2) without a manifest (or with use_manifest=False), lists one level at a
+     time with the "/" delimiter: the batch prefixes under `<source>/raw/`
+     are common prefixes, their objects are never listed. Listing starts
+     after the `since` timestamp and stops past `until` (keys sort by
+     timestamp), results are yielded page by page as the SDK fetches them.
+
+`s3_writer.put_json` and `LakeWriter` record every object they write. Inside
+`batch_recording()` the records are buffered and applied once per batch when
+the block exits, so an ingest run updates the catalog once, not per object.
+
+A missing manifest is rebuilt from the listing on first discovery (writes
+never create it: a manifest holding only the newest batch would hide the
+others). Objects written without put_json (other tools, manual uploads) are
+not in the manifest until `rebuild_manifest` (`lake_ls --rebuild-manifest`)
+runs. Updates are serialized within a process only: writers in different
+processes finishing batches at the same moment can drop each other's root
+entry; the rebuild repairs that too.
+
+Usage:
+    catalog = LakeCatalog(client, "datalake")
+    for batch in catalog.iter_batches("apollo/raw/", since=date(2025, 10, 26)):
+        print(batch.prefix, batch.objects)
+
+    with batch_recording():
+        put_json(bucket, f"{prefix}/companies-00001.json", data)
+        put_json(bucket, f"{prefix}/_meta.json", sidecar)
+
+Env:
+  LAKE_MANIFEST_KEY=_catalog/manifest.json
+  LAKE_MANIFEST=1      # 0 disables manifest reads and updates
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import posixpath
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time
+from io import BytesIO
+
+from minio import Minio
+from minio.error import S3Error
+
+MANIFEST_KEY = os.getenv("LAKE_MANIFEST_KEY", "_catalog/manifest.json")
+MANIFEST_ENABLED = os.getenv("LAKE_MANIFEST", "1").lower() in {"1", "true", "yes", "on"}
+_MANIFEST_VERSION = 2
+_manifest_lock = threading.Lock()
+_recording = threading.local()  # .pending: {(bucket, prefix): (client, {key: size})}
+
+
+@dataclass
+class Batch:
+    prefix: str  # no trailing slash, e.g. apollo/raw/2025-10-28T16:56:34.804420Z
+    ts: datetime | None
+    objects: int = 0
+    bytes: int = 0
+
+    @property
+    def source(self) -> str:
+        return self.prefix.split("/", 1)[0]
+
+
+def parse_batch_ts(prefix: str) -> datetime | None:
+    """
+    'apollo/raw/2025-10-28T16:56:34.804420Z' -> aware datetime (None if not a timestamp).
+    """
+    try:
+        ts = datetime.fromisoformat(prefix.rstrip("/").rsplit("/", 1)[1].replace("Z", "+00:00"))
+    except (IndexError, ValueError):
+        return None
+    return ts if ts.tzinfo else ts.replace(tzinfo=UTC)
+
+
+def batch_prefix_of(key: str) -> str | None:
+    """
+    Batch prefix of an object key in the `<source>/raw/<ts>/<object>` layout.
+    """
+    parts = key.split("/")
+    if len(parts) < 4 or parts[1] != "raw" or parse_batch_ts("/".join(parts[:3])) is None:
+        return None
+    return "/".join(parts[:3])
+
+
+def _as_datetime(value: date | datetime | None, end: bool = False) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        return value if value is None or value.tzinfo else value.replace(tzinfo=UTC)
+    return datetime.combine(value, time.max if end else time.min, tzinfo=UTC)
+
+
+def _in_range(ts: datetime | None, since: datetime | None, until: datetime | None) -> bool:
+    if ts is None:
+        return since is None and until is None
+    return (since is None or ts >= since) and (until is None or ts <= until)
+
+
+class LakeCatalog:
+    def __init__(self, client: Minio, bucket: str, manifest_key: str = MANIFEST_KEY):
+        self.client = client
+        self.bucket = bucket
+        self.manifest_key = manifest_key
+        self.index_prefix = posixpath.join(posixpath.dirname(manifest_key), "batches", "")
+
+    # ---- delimiter listing ----
+
+    def iter_prefixes(self, prefix: str, start_after: str | None = None) -> Iterator[str]:
+        """
+        Child "directories" of `prefix` (one level, trailing slash), in key order.
+        """
+        for obj in self.client.list_objects(self.bucket, prefix=prefix, recursive=False, start_after=start_after):
+            if obj.is_dir:
+                yield obj.object_name
+
+    def iter_objects(self, prefix: str) -> Iterator:
+        """
+        Objects directly under `prefix` (a batch): no recursion below it.
+        """
+        for obj in self.client.list_objects(self.bucket, prefix=prefix.rstrip("/") + "/", recursive=False):
+            if not obj.is_dir:
+                yield obj
+
+    def list_batches(
+        self,
+        base_prefix: str = "apollo/raw/",
+        since: date | datetime | None = None,
+        until: date | datetime | None = None,
+    ) -> Iterator[Batch]:
+        """
+        Batches under `base_prefix` from the listing, oldest first, streamed.
+        Object counts are not filled in (that would list every batch).
+        """
+        since_dt, until_dt = _as_datetime(since), _as_datetime(until, end=True)
+        base = base_prefix.rstrip("/") + "/"
+        # ISO timestamps sort like the times they encode: skip straight past `since`
+        start_after = f"{base}{since_dt.astimezone(UTC):%Y-%m-%dT%H:%M:%S}" if since_dt else None
+        for child in self.iter_prefixes(base, start_after=start_after):
+            prefix = child.rstrip("/")
+            ts = parse_batch_ts(prefix)
+            if ts is not None and until_dt is not None and ts > until_dt:
+                return
+            if _in_range(ts, since_dt, until_dt):
+                yield Batch(prefix=prefix, ts=ts)
+
+    # ---- manifest ----
+
+    def _get_doc(self, key: str) -> dict | None:
+        try:
+            resp = self.client.get_object(self.bucket, key)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchBucket"):
+                return None
+            raise
+        try:
+            return json.loads(resp.read().decode("utf-8"))
+        finally:
+            resp.close()
+            resp.release_conn()
+
+    def _put_doc(self, key: str, doc: dict) -> None:
+        data = json.dumps(doc, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        self.client.put_object(self.bucket, key, BytesIO(data), length=len(data), content_type="application/json")
+
+    def read_manifest(self) -> dict | None:
+        doc = self._get_doc(self.manifest_key)
+        return doc if doc and doc.get("version") == _MANIFEST_VERSION else None
+
+    def write_manifest(self, doc: dict) -> None:
+        doc["version"] = _MANIFEST_VERSION
+        doc["updated_at"] = datetime.now(UTC).isoformat()
+        self._put_doc(self.manifest_key, doc)
+
+    def batch_index_key(self, prefix: str) -> str:
+        return f"{self.index_prefix}{prefix}.json"
+
+    def read_batch_index(self, prefix: str) -> dict[str, int]:
+        """
+        Objects of one batch from its index: {key: size} (empty without one).
+        """
+        doc = self._get_doc(self.batch_index_key(prefix))
+        return doc.get("objects", {}) if doc else {}
+
+    def write_batch_index(self, prefix: str, sizes: dict[str, int]) -> None:
+        self._put_doc(self.batch_index_key(prefix), {"prefix": prefix, "objects": sizes})
+
+    @staticmethod
+    def _entry(prefix: str, sizes: dict[str, int]) -> dict:
+        ts = parse_batch_ts(prefix)
+        return {"date": ts.date().isoformat() if ts else None, "objects": len(sizes), "bytes": sum(sizes.values())}
+
+    def record_batch(self, prefix: str, sizes: dict[str, int]) -> None:
+        """
+        Merge written objects ({key: size}) into their batch's index, then set
+        the batch's root entry from it. The root manifest is left alone while
+        it does not exist: discovery rebuilds it from the listing.
+        """
+        with _manifest_lock:
+            sizes = {**self.read_batch_index(prefix), **sizes}
+            self.write_batch_index(prefix, sizes)
+            doc = self.read_manifest()
+            if doc is not None:
+                doc["batches"][prefix] = self._entry(prefix, sizes)
+                self.write_manifest(doc)
+
+    def record_object(self, key: str, size: int) -> None:
+        prefix = batch_prefix_of(key)
+        if prefix is not None:
+            self.record_batch(prefix, {key: size})
+
+    def rebuild_manifest(self, base_prefixes: list[str] | None = None) -> int:
+        """
+        Relist every batch (two delimiter levels, then the objects of each
+        batch), rewrite the batch indexes and replace the manifest. Returns
+        the number of batches.
+        """
+        if base_prefixes is None:
+            catalog_dir = self.manifest_key.split("/", 1)[0] + "/"
+            base_prefixes = [f"{p}raw/" for p in self.iter_prefixes("") if p != catalog_dir]
+        batches: dict[str, dict] = {}
+        with _manifest_lock:
+            for base in base_prefixes:
+                for batch in self.list_batches(base):
+                    sizes = {o.object_name: o.size or 0 for o in self.iter_objects(batch.prefix)}
+                    self.write_batch_index(batch.prefix, sizes)
+                    batches[batch.prefix] = self._entry(batch.prefix, sizes)
+            self.write_manifest({"batches": batches})
+        return len(batches)
+
+    # ---- discovery ----
+
+    def iter_batches(
+        self,
+        base_prefix: str = "apollo/raw/",
+        since: date | datetime | None = None,
+        until: date | datetime | None = None,
+        use_manifest: bool = MANIFEST_ENABLED,
+    ) -> Iterator[Batch]:
+        """
+        Batches under `base_prefix` in [since, until], oldest first: from the
+        manifest (built on first use) or, with use_manifest=False, streamed
+        from a delimiter listing.
+        """
+        if not use_manifest:
+            yield from self.list_batches(base_prefix, since, until)
+            return
+        doc = self.read_manifest()
+        if doc is None:
+            print(f"[lake] no manifest at s3://{self.bucket}/{self.manifest_key}; rebuilding from listing")
+            self.rebuild_manifest()
+            doc = self.read_manifest() or {"batches": {}}
+        since_dt, until_dt = _as_datetime(since), _as_datetime(until, end=True)
+        base = base_prefix.rstrip("/") + "/"
+        batches = [
+            Batch(prefix=p, ts=parse_batch_ts(p), objects=entry["objects"], bytes=entry["bytes"])
+            for p, entry in doc.get("batches", {}).items()
+            if p.startswith(base)
+        ]
+        batches.sort(key=lambda b: (b.ts or datetime.min.replace(tzinfo=UTC), b.prefix))
+        for batch in batches:
+            if _in_range(batch.ts, since_dt, until_dt):
+                yield batch
+
+
+def _record(client: Minio, bucket: str, prefix: str, sizes: dict[str, int]) -> None:
+    try:
+        LakeCatalog(client, bucket).record_batch(prefix, sizes)
+    except Exception as e:
+        print(f"[lake] manifest update failed for {prefix} ({e}); run lake_ls --rebuild-manifest")
+
+
+def record_written(client: Minio, bucket: str, key: str, size: int) -> None:
+    """
+    Catalog update after a successful write (buffered inside batch_recording);
+    a failure is logged, never raised.
+    """
+    prefix = batch_prefix_of(key)
+    if not MANIFEST_ENABLED or prefix is None:
+        return
+    pending = getattr(_recording, "pending", None)
+    if pending is not None:
+        pending.setdefault((bucket, prefix), (client, {}))[1][key] = size
+    else:
+        _record(client, bucket, prefix, {key: size})
+
+
+@contextmanager
+def batch_recording() -> Iterator[None]:
+    """
+    Buffer this thread's catalog updates and apply them once per batch when
+    the block exits (also on error: the objects were written). Nested blocks
+    join the outermost one.
+    """
+    if getattr(_recording, "pending", None) is not None:
+        yield
+        return
+    _recording.pending = {}
+    try:
+        yield
+    finally:
+        pending, _recording.pending = _recording.pending, None
+        for (bucket, prefix), (client, sizes) in pending.items():
+            _record(client, bucket, prefix, sizes)
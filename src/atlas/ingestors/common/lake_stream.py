@@ -0,0 +1,275 @@
+"""
+Streaming writer and reader for large lake objects.
+
+`put_json` serializes a whole document in memory before uploading it. For big
+pulls, LakeWriter uploads while records are produced instead: records are
+serialized one at a time into a bounded buffer that a background thread feeds
+to a multipart `put_object` (length unknown, one part per `part_size` bytes).
+Memory stays at about one part plus the buffer, whatever the object size.
+
+The format follows the key:
+
+  *.json          {"companies": [record, ...], <extra fields>}  (what the ETL reads today)
+  *.ndjson/.jsonl one record per line
+  *.zst suffix    zstd-compressed (optional `zstandard` package)
+
+iter_records reads any of these back as a stream of records.
+
+Usage:
+    with LakeWriter(bucket, f"{prefix}/companies-00001.ndjson.zst") as w:
+        for company in companies:
+            w.write(company)
+
+    for company in iter_records(client, bucket, key):
+        ...
+
+Env:
+  LAKE_PART_SIZE_MB=16      # multipart part size (S3 minimum 5)
+  LAKE_WRITE_BUFFER_MB=16   # serialized bytes buffered ahead of the upload
+  LAKE_ZSTD_LEVEL=3
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import orjson
+from minio import Minio
+
+from atlas.etl.common.json_stream import iter_array_items
+from atlas.ingestors.common.lake_catalog import record_written
+from atlas.ingestors.common.s3_writer import get_client
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+PART_SIZE = max(5, int(os.getenv("LAKE_PART_SIZE_MB", "16"))) * 1024 * 1024
+_CHUNK = 1024 * 1024
+WRITE_BUFFER_CHUNKS = max(1, int(os.getenv("LAKE_WRITE_BUFFER_MB", "16")))
+ZSTD_LEVEL = int(os.getenv("LAKE_ZSTD_LEVEL", "3"))
+_RECORD_SUFFIXES = (".json", ".ndjson", ".jsonl")
+
+
+def is_record_key(key: str) -> bool:
+    """
+    Keys iter_records can read (JSON / NDJSON, optionally .zst).
+    """
+    return key.removesuffix(".zst").endswith(_RECORD_SUFFIXES)
+
+
+def _is_ndjson(key: str) -> bool:
+    return key.removesuffix(".zst").endswith((".ndjson", ".jsonl"))
+
+
+def _require_zstd() -> None:
+    if zstandard is None:
+        raise RuntimeError("zstd lake objects need the 'zstandard' package (pip install zstandard)")
+
+
+# ---------------------------
+# Writer
+# ---------------------------
+
+
+class _Pipe:
+    """
+    Bounded producer -> uploader hand-off. The uploader reads it like a file;
+    items are byte chunks, None (end of data) or an exception (abort).
+    """
+
+    def __init__(self, max_chunks: int):
+        self._q: queue.Queue = queue.Queue(maxsize=max_chunks)
+        self._buf = b""
+        self._eof = False
+
+    def put(self, item, timeout: float) -> None:
+        self._q.put(item, timeout=timeout)
+
+    def drain(self) -> None:
+        while True:
+            try:
+                self._q.get_nowait()
+            except queue.Empty:
+                return
+
+    def read(self, size: int = -1) -> bytes:
+        # Short reads are fine: the SDK keeps reading until a part is full
+        if not self._buf and not self._eof:
+            item = self._q.get()
+            if item is None:
+                self._eof = True
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                self._buf = item
+        if size < 0:
+            size = len(self._buf)
+        out, self._buf = self._buf[:size], self._buf[size:]
+        return out
+
+
+class LakeWriter:
+    """
+    Record-at-a-time writer to one lake object, uploaded with multipart while
+    writing. Use as a context manager: a clean exit completes the upload (and
+    records it in the lake manifest), an exception aborts it.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        key: str,
+        array_key: str = "companies",
+        extra: dict[str, Any] | None = None,
+        client: Minio | None = None,
+        part_size: int = PART_SIZE,
+    ):
+        self.bucket = bucket
+        self.key = key
+        self.client = client or get_client()
+        self.records = 0
+        self.bytes_in = 0  # serialized, before compression
+        self.bytes_out = 0  # uploaded
+        self._ndjson = _is_ndjson(key)
+        self._extra = extra or {}
+        self._compressor = None
+        if key.endswith(".zst"):
+            _require_zstd()
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        self._buf = bytearray()
+        self._pipe = _Pipe(WRITE_BUFFER_CHUNKS)
+        self._error: BaseException | None = None
+        self._closed = False
+        content_type = "application/x-ndjson" if self._ndjson else "application/json"
+        if self._compressor is not None:
+            content_type = "application/zstd"
+        self._thread = threading.Thread(
+            target=self._upload, args=(content_type, part_size), name="lake-writer", daemon=True
+        )
+        self._thread.start()
+        if not self._ndjson:
+            self._emit(b"{" + orjson.dumps(array_key) + b":[")
+
+    def _upload(self, content_type: str, part_size: int) -> None:
+        try:
+            self.client.put_object(
+                self.bucket, self.key, self._pipe, length=-1, part_size=part_size, content_type=content_type
+            )
+        except BaseException as e:
+            self._error = e
+            self._pipe.drain()  # unblock a producer waiting on a full pipe
+
+    def _raise_upload_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"upload of s3://{self.bucket}/{self.key} failed: {self._error}") from self._error
+
+    def _put(self, item) -> None:
+        while True:
+            self._raise_upload_error()
+            try:
+                self._pipe.put(item, timeout=1.0)
+                return
+            except queue.Full:
+                continue
+
+    def _emit(self, data: bytes, flush: bool = False) -> None:
+        self.bytes_in += len(data)
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+            if flush:
+                data += self._compressor.flush()
+        self._buf += data
+        while len(self._buf) >= _CHUNK or (flush and self._buf):
+            chunk = bytes(self._buf[:_CHUNK])
+            del self._buf[:_CHUNK]
+            self.bytes_out += len(chunk)
+            self._put(chunk)
+
+    def write(self, record: Any) -> None:
+        data = orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS)
+        if self._ndjson:
+            self._emit(data + b"\n")
+        else:
+            self._emit(data if self.records == 0 else b"," + data)
+        self.records += 1
+
+    def write_many(self, records: Iterable[Any]) -> None:
+        for record in records:
+            self.write(record)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        tail = b""
+        if not self._ndjson:
+            fields = b"".join(b"," + orjson.dumps(k) + b":" + orjson.dumps(v) for k, v in self._extra.items())
+            tail = b"]" + fields + b"}"
+        self._emit(tail, flush=True)
+        self._put(None)
+        self._thread.join()
+        self._raise_upload_error()
+        record_written(self.client, self.bucket, self.key, self.bytes_out)
+
+    def abort(self, exc: BaseException | None = None) -> None:
+        """
+        Fail the upload: put_object aborts the multipart upload, nothing is written.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._error is None:
+            # RuntimeError: the upload already failed
+            with contextlib.suppress(RuntimeError):
+                self._put(exc or RuntimeError("lake write aborted"))
+        self._thread.join()
+
+    def __enter__(self) -> LakeWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc is None:
+            self.close()
+        else:
+            self.abort(exc)
+        return False
+
+
+# ---------------------------
+# Reader
+# ---------------------------
+
+
+def iter_records(client: Minio, bucket: str, key: str, array_key: str = "companies") -> Iterator[Any]:
+    """
+    Records of one lake object, streamed: the elements of `array_key` for
+    JSON documents, every line for NDJSON, decompressed on the fly for .zst.
+    """
+    resp = client.get_object(bucket, key)
+    try:
+        stream = resp
+        if key.endswith(".zst"):
+            _require_zstd()
+            stream = zstandard.ZstdDecompressor().stream_reader(resp)
+        if _is_ndjson(key):
+            pending = b""
+            while chunk := stream.read(_CHUNK):
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    if line.strip():
+                        yield orjson.loads(line)
+            if pending.strip():
+                yield orjson.loads(pending)
+        else:
+            yield from iter_array_items(stream, array_key)
+    finally:
+        resp.close()
+        resp.release_conn()
@@ -0,0 +1,191 @@
+"""
+Shared HTTP transport for the sync ingestors (CompanyIngestor / CompanyPeopleFinder).
+
+One process-wide httpx.Client, so every Places / Hunter call reuses pooled
+keep-alive connections (and, with INGEST_HTTP2=1, multiplexes over HTTP/2)
+instead of a new TCP + TLS handshake per request. Requests answered with 429
+or 5xx, and connection errors, are retried with jittered exponential backoff
+(Retry-After is honored, capped at the max backoff). Latency is recorded per
+host in a bucketed histogram.
+
+Usage:
+    resp = shared_transport().get(url, params={...})
+    shared_transport().stats()   # {"maps.googleapis.com": {"count": ..., "p95_ms": ...}}
+
+Env:
+  INGEST_HTTP2=0                 # 1 = negotiate HTTP/2 (needs the h2 package)
+  INGEST_HTTP_MAX_CONNECTIONS=32
+  INGEST_HTTP_KEEPALIVE=16       # idle connections kept open
+  INGEST_HTTP_TIMEOUT=30         # seconds
+  INGEST_HTTP_RETRIES=3
+  INGEST_HTTP_BACKOFF=0.5        # first retry delay (s), doubled per attempt
+  INGEST_HTTP_BACKOFF_MAX=20
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import httpx
+
+HTTP2 = os.getenv("INGEST_HTTP2", "0").lower() in {"1", "true", "yes", "on"}
+MAX_CONNECTIONS = int(os.getenv("INGEST_HTTP_MAX_CONNECTIONS", "32"))
+KEEPALIVE = int(os.getenv("INGEST_HTTP_KEEPALIVE", "16"))
+TIMEOUT = float(os.getenv("INGEST_HTTP_TIMEOUT", "30"))
+RETRIES = int(os.getenv("INGEST_HTTP_RETRIES", "3"))
+BACKOFF = float(os.getenv("INGEST_HTTP_BACKOFF", "0.5"))
+BACKOFF_MAX = float(os.getenv("INGEST_HTTP_BACKOFF_MAX", "20"))
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+
+class LatencyHistogram:
+    """
+    Request latencies of one host in fixed buckets (upper bounds in ms).
+    """
+
+    def __init__(self):
+        self.counts = [0] * len(_BUCKETS_MS)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.retries = 0
+        self.errors = 0
+        self.statuses: dict[int, int] = {}
+
+    def observe(self, ms: float, status: int | None) -> None:
+        self.total += 1
+        self.sum_ms += ms
+        for i, bound in enumerate(_BUCKETS_MS):
+            if ms <= bound:
+                self.counts[i] += 1
+                break
+        if status is None:
+            self.errors += 1
+        else:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the q-quantile.
+        """
+        if not self.total:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for bound, n in zip(_BUCKETS_MS, self.counts, strict=True):
+            seen += n
+            if seen >= rank:
+                return bound
+        return _BUCKETS_MS[-1]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.total,
+            "avg_ms": round(self.sum_ms / self.total, 1) if self.total else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "retries": self.retries,
+            "errors": self.errors,
+            "statuses": dict(sorted(self.statuses.items())),
+            "histogram_ms": {f"<={b:g}": n for b, n in zip(_BUCKETS_MS, self.counts, strict=True) if n},
+        }
+
+
+class HttpTransport:
+    """
+    Pooled, retrying, instrumented HTTP client. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        http2: bool = HTTP2,
+        max_connections: int = MAX_CONNECTIONS,
+        keepalive: int = KEEPALIVE,
+        timeout: float = TIMEOUT,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        backoff_max: float = BACKOFF_MAX,
+    ):
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("[http] INGEST_HTTP2=1 but the h2 package is missing; using HTTP/1.1")
+                http2 = False
+        self.http2 = http2
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.client = httpx.Client(
+            http2=http2,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=keepalive),
+            follow_redirects=True,
+        )
+        self._hosts: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, host: str) -> LatencyHistogram:
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = LatencyHistogram()
+            return self._hosts[host]
+
+    def _delay(self, attempt: int, resp: httpx.Response | None) -> float:
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after:
+            try:
+                return min(self.backoff_max, float(retry_after))
+            except ValueError:
+                pass  # HTTP-date form: fall back to backoff
+        # Full jitter: spread retries of concurrent callers apart
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2**attempt))
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send with retries; returns the last response (callers check the status)
+        or raises the last transport error.
+        """
+        host = urlparse(url).netloc
+        hist = self._histogram(host)
+        for attempt in range(self.retries + 1):
+            resp = None
+            t0 = time.perf_counter()
+            try:
+                resp = self.client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                with self._lock:
+                    hist.observe((time.perf_counter() - t0) * 1000, None)
+                if attempt == self.retries:
+                    raise
+            else:
+                with self._lock:
+                    hist.observe((time.perf_counter() - t0) * 1000, resp.status_code)
+                if resp.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return resp
+            with self._lock:
+                hist.retries += 1
+            time.sleep(self._delay(attempt, resp))
+        raise AssertionError("unreachable")
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {host: h.snapshot() for host, h in sorted(self._hosts.items())}
+
+    def close(self) -> None:
+        self.client.close()
+
+
+@lru_cache(maxsize=1)
+def shared_transport() -> HttpTransport:
+    return HttpTransport()
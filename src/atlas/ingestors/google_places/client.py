@@ -1,9 +1,12 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
-import requests
-
 from atlas.ingestors.common.base import CompanyIngestor
 
+# Place detail lookups in flight at once (over the shared transport's pool)
+DETAIL_CONCURRENCY = int(os.getenv("PLACES_DETAIL_CONCURRENCY", "8"))
+
 
 class GooglePlacesIngestor(CompanyIngestor):
     """Google Places API ingestor"""
@@ -14,7 +17,7 @@ class GooglePlacesIngestor(CompanyIngestor):
 
     def search(self, query: str, limit: int = 20) -> list[dict]:
         """Search companies"""
-        resp = requests.get(
+        resp = self.http.get(
             f"{self.base_url}/textsearch/json",
             params={"query": query, "key": self.api_key},
         )
@@ -24,17 +27,12 @@ class GooglePlacesIngestor(CompanyIngestor):
         if data.get("status") != "OK":
             return []
 
+        places = data.get("results", [])[:limit]
+        with ThreadPoolExecutor(max_workers=max(1, min(DETAIL_CONCURRENCY, len(places)))) as pool:
+            details = list(pool.map(self._details, places))
+
         companies = []
-        for place in data.get("results", [])[:limit]:
-            detail_resp = requests.get(
-                f"{self.base_url}/details/json",
-                params={
-                    "place_id": place["place_id"],
-                    "key": self.api_key,
-                    "fields": "website,name",
-                },
-            )
-            detail = detail_resp.json().get("result", {})
+        for place, detail in zip(places, details, strict=True):
             website = detail.get("website")
             domain = self._extract_domain(website)
 
@@ -57,6 +55,17 @@ class GooglePlacesIngestor(CompanyIngestor):
 
         return companies
 
+    def _details(self, place: dict) -> dict:
+        detail_resp = self.http.get(
+            f"{self.base_url}/details/json",
+            params={
+                "place_id": place["place_id"],
+                "key": self.api_key,
+                "fields": "website,name",
+            },
+        )
+        return detail_resp.json().get("result", {})
+
     def _extract_domain(self, url: str) -> str | None:
         """Extract clean domain(without www prefix)"""
         if not url:
@@ -1,4 +1,4 @@
-import requests
+import os
 
 from atlas.ingestors.common.base import CompanyPeopleFinder
 
@@ -6,17 +6,24 @@ from atlas.ingestors.common.base import CompanyPeopleFinder
 class HunterPeopleFinder(CompanyPeopleFinder):
     """Hunter.io API people finder"""
 
+    provider = "hunter"
+    # Hunter allows 15 req/s and 500 req/min on domain-search
+    requests_per_minute = int(os.getenv("HUNTER_RPM", "300"))
+
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://api.hunter.io/v2"
 
     def find_by_company_domain(self, domain: str) -> list[dict]:
         """Find people at domain via Hunter.io API"""
-        resp = requests.get(
+        resp = self.http.get(
             f"{self.base_url}/domain-search",
             params={"domain": domain, "api_key": self.api_key, "limit": 10},
         )
 
+        # Still 429 / 5xx after the transport's retries
+        if resp.status_code == 429 or resp.status_code >= 500:
+            resp.raise_for_status()
         if resp.status_code != 200:
             return []
 
@@ -1,9 +1,59 @@
+"""
+Company search + people enrichment -> data lake.
+
+Enrichment runs on an asyncio worker pool: up to ENRICH_CONCURRENCY companies
+are looked up at once, each people-finder provider is rate limited on its own
+(RateLimiter keyed by provider, Redis-backed when REDIS_URL is set), and every
+lookup has its own timeout. A failed or timed-out lookup leaves that company
+with no people and is counted in the sidecar's "enrichment" stats instead of
+failing the pull. Companies are streamed into the lake object as their
+enrichment completes (completion order, not search order).
+
+Env:
+  INGEST_ENRICH_CONCURRENCY=16   # concurrent people lookups
+  INGEST_ENRICH_TIMEOUT=30       # seconds per company (rate-limit wait included)
+"""
+
+import asyncio
 import datetime
 import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 
+from atlas.connectors.utils.rate_limiter import RateLimiter
 from atlas.ingestors.common.base import CompanyIngestor, CompanyPeopleFinder
+from atlas.ingestors.common.lake_catalog import batch_recording
+from atlas.ingestors.common.lake_stream import LakeWriter
 from atlas.ingestors.common.s3_writer import ensure_bucket, put_json
 from atlas.ingestors.common.sidecar import make_sidecar
+from atlas.ingestors.common.transport import shared_transport
+
+ENRICH_CONCURRENCY = int(os.getenv("INGEST_ENRICH_CONCURRENCY", "16"))
+ENRICH_TIMEOUT = float(os.getenv("INGEST_ENRICH_TIMEOUT", "30"))
+_MAX_REPORTED_FAILURES = 50
+
+
+@dataclass
+class EnrichmentStats:
+    companies: int = 0
+    enriched: int = 0  # at least one person found
+    empty: int = 0  # lookup succeeded, nobody found
+    skipped: int = 0  # no domain
+    failed: int = 0
+    timed_out: int = 0
+    people: int = 0
+    seconds: float = 0.0
+    failures: list[dict] = field(default_factory=list)  # first few, for the sidecar
+
+    def fail(self, domain: str, error: str, timed_out: bool = False) -> None:
+        if timed_out:
+            self.timed_out += 1
+        else:
+            self.failed += 1
+        if len(self.failures) < _MAX_REPORTED_FAILURES:
+            self.failures.append({"domain": domain, "error": error})
 
 
 class IngestionPipeline:
@@ -12,8 +62,9 @@ class IngestionPipeline:
 
     High-level flow:
     1. Search for companies using a CompanyIngestor (e.g., Google Places)
-    2. Optionally enrich each company with people data using a CompanyPeopleFinder (e.g., Hunter.io)
-    3. Save the results to MinIO data lake with metadata
+    2. Optionally enrich each company with people data using a CompanyPeopleFinder (e.g., Hunter.io),
+       concurrently, rate limited per provider
+    3. Stream the results to the MinIO data lake as they complete, then save metadata
 
     Returns a MinIO prefix that can be used for subsequent ETL processing.
     """
@@ -22,9 +73,84 @@ class IngestionPipeline:
         self,
         company_ingestor: CompanyIngestor,
         people_finder: CompanyPeopleFinder | None = None,
+        concurrency: int = ENRICH_CONCURRENCY,
+        timeout: float = ENRICH_TIMEOUT,
     ):
         self.company_ingestor = company_ingestor
         self.people_finder = people_finder
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self._limiters: dict[str, RateLimiter] = {}
+
+    def _limiter(self, finder: CompanyPeopleFinder) -> RateLimiter | None:
+        if not finder.requests_per_minute:
+            return None
+        if finder.provider not in self._limiters:
+            self._limiters[finder.provider] = RateLimiter(
+                f"ingest:{finder.provider}", limit=finder.requests_per_minute, window=60
+            )
+        return self._limiters[finder.provider]
+
+    async def enrich(self, companies: list[dict], sink: Callable[[dict], None]) -> EnrichmentStats:
+        """
+        Set company["people"] for every company and hand each one to `sink` as
+        soon as its lookup finishes (or fails).
+        """
+        finder = self.people_finder
+        stats = EnrichmentStats(companies=len(companies))
+        limiter = self._limiter(finder)
+        sem = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        t0 = time.perf_counter()
+
+        async def lookup(domain: str) -> list[dict]:
+            if limiter is not None and not await limiter.wait_and_acquire(max_wait=self.timeout):
+                raise TimeoutError(f"{finder.provider} rate limit wait exceeded {self.timeout:.0f}s")
+            return await loop.run_in_executor(executor, finder.find_by_company_domain, domain)
+
+        async def one(company: dict) -> dict:
+            domain = company.get("domain")
+            company["people"] = []
+            if not domain:
+                stats.skipped += 1
+                return company
+            async with sem:
+                try:
+                    people = await asyncio.wait_for(lookup(domain), self.timeout)
+                except TimeoutError as e:
+                    stats.fail(domain, str(e) or f"timed out after {self.timeout:.0f}s", timed_out=True)
+                    return company
+                except Exception as e:
+                    stats.fail(domain, f"{type(e).__name__}: {e}")
+                    return company
+            company["people"] = people
+            stats.people += len(people)
+            if people:
+                stats.enriched += 1
+            else:
+                stats.empty += 1
+            return company
+
+        # A timed-out lookup keeps its thread until the HTTP call returns; the
+        # pool is sized so that does not starve the next lookups right away
+        executor = ThreadPoolExecutor(max_workers=self.concurrency * 2, thread_name_prefix="enrich")
+        try:
+            tasks = [asyncio.create_task(one(c)) for c in companies]
+            for done, fut in enumerate(asyncio.as_completed(tasks), 1):
+                company = await fut
+                sink(company)
+                if done % 25 == 0 or done == len(tasks):
+                    print(
+                        f"  enriched {done}/{len(tasks)}: {stats.people} people, "
+                        f"{stats.failed} failed, {stats.timed_out} timed out"
+                    )
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            if limiter is not None:
+                # Its Redis client is bound to this call's event loop
+                await limiter.close()
+        stats.seconds = time.perf_counter() - t0
+        return stats
 
     def run(self, query: str, limit: int = 20) -> str:
         """
@@ -42,26 +168,33 @@ class IngestionPipeline:
         if not companies:
             raise ValueError("No companies found")
 
-        # Step 2: Enrich with people (optional)
-        if self.people_finder:
-            print("Enriching with people data...")
-            for i, company in enumerate(companies, 1):
-                domain = company.get("domain")
-                print(f"  {i}/{len(companies)} {company['name']} ({domain})")
-                people = self.people_finder.find_by_company_domain(domain)
-                company["people"] = people
-                print(f"    Found {len(people)} people")
-
-        # Step 3: Save to MinIO
         ts = datetime.datetime.utcnow().isoformat() + "Z"
         source = "enriched" if self.people_finder else "companies"
         prefix = f"{source}/raw/{ts}"
 
-        data = {"companies": companies}
-        put_json(bucket, f"{prefix}/companies.json", data)
+        # Step 2 + 3: Enrich with people (optional), streaming each company to MinIO
+        stats = None
+        # One catalog update for the batch (companies.json and _meta.json)
+        with batch_recording():
+            with LakeWriter(bucket, f"{prefix}/companies.json") as writer:
+                if self.people_finder:
+                    print(f"Enriching with people data ({self.concurrency} concurrent)...")
+                    stats = asyncio.run(self.enrich(companies, writer.write))
+                    print(
+                        f"Enriched {stats.enriched}/{stats.companies} companies ({stats.people} people) "
+                        f"in {stats.seconds:.1f}s; {stats.empty} empty, {stats.failed} failed, "
+                        f"{stats.timed_out} timed out, {stats.skipped} without domain"
+                    )
+                else:
+                    writer.write_many(companies)
 
-        sidecar = make_sidecar("ingestion_pipeline", count=len(companies))
-        put_json(bucket, f"{prefix}/_meta.json", sidecar)
+            sidecar = make_sidecar("ingestion_pipeline", count=len(companies))
+            if stats is not None:
+                sidecar["enrichment"] = asdict(stats)
+            sidecar["http"] = shared_transport().stats()
+            for host, h in sidecar["http"].items():
+                print(f"  {host}: {h['count']} requests, p50 {h['p50_ms']:g}ms, p95 {h['p95_ms']:g}ms, {h['retries']} retries")
+            put_json(bucket, f"{prefix}/_meta.json", sidecar)
 
         print(f"\nSaved to s3://{bucket}/{prefix}")
         return prefix
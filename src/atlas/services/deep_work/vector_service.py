@@ -9,10 +9,11 @@ from __future__ import annotations
 
 import os
 import uuid
-import hashlib
 from typing import Any
 from dataclasses import dataclass
 
+from atlas.services.embedding_store import embed_through_store
+
 # Optional imports - graceful fallback if not available
 try:
     from qdrant_client import QdrantClient
@@ -53,7 +54,6 @@ class VectorService:
         self._embed_model: str | None = None
         self._embed_dim: int = self.OPENAI_SMALL_DIM
         self._initialized = False
-        self._cache: dict[str, list[float]] = {}  # Simple embedding cache
 
     def initialize(self) -> bool:
         """Initialize connections to Qdrant and embedding service"""
@@ -119,27 +119,25 @@ class VectorService:
         if not text:
             return None
 
-        # Check cache first
-        cache_key = hashlib.md5(text.encode()).hexdigest()
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-
-        # Try OpenAI
+        # Try OpenAI, through the shared on-disk embedding store
         if self._openai_client and self._embed_model:
             try:
-                response = self._openai_client.embeddings.create(
-                    model=self._embed_model,
-                    input=text[:8000],  # Truncate to avoid token limits
-                )
-                embedding = response.data[0].embedding
-                self._cache[cache_key] = embedding
-                return embedding
+                return embed_through_store(
+                    f"openai:{self._embed_model}",
+                    [text[:8000]],  # Truncate to avoid token limits
+                    self._openai_embed,
+                    dim=self._embed_dim,
+                )[0]
             except Exception as e:
                 print(f"[VectorService] OpenAI embedding failed: {e}")
 
         # Fallback: return None (will use keyword search)
         return None
 
+    def _openai_embed(self, texts: list[str]) -> list[list[float]]:
+        response = self._openai_client.embeddings.create(model=self._embed_model, input=texts)
+        return [d.embedding for d in response.data]
+
     def is_available(self) -> bool:
         """Check if vector service is fully operational"""
         return self._qdrant is not None and self._openai_client is not None
@@ -0,0 +1,258 @@
+"""
+Persistent, content-addressed embedding store shared by every embedding producer.
+
+The vector ETL, the query API, SignalVectorRAG, VectorService and the
+KnowledgeEngine all embed overlapping texts (company/person descriptions,
+signal texts, recurring queries). Each of them asks this store first and only
+sends the misses to a model:
+
+    vectors = shared_store().embed_with("openai:text-embedding-3-small", texts, embedder.embed)
+
+Entries are keyed by (model, dimension, sha256 of the normalized text), so
+different models or dimensions never mix, and texts that differ only in Unicode
+form or whitespace share one vector. Vectors are float32 blobs in SQLite (WAL
+mode): several processes (API workers, ETL runs) can read and write the same
+file concurrently. Store errors never fail an embedding call: the store is
+skipped and the model is used.
+
+Model names are "<provider>:<model>" (openai:, fastembed:, mistral:), the same
+strings the query API's EmbeddingService uses.
+
+Env:
+  EMBED_STORE_PATH=~/.cache/atlas/embeddings.sqlite3   # empty to disable
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+
+STORE_PATH = os.path.expanduser(os.getenv("EMBED_STORE_PATH", "~/.cache/atlas/embeddings.sqlite3"))
+_IN_CHUNK = 500  # keys per SELECT ... IN (...)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    dim INTEGER NOT NULL,
+    text_hash BLOB NOT NULL,
+    vector BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model, dim, text_hash)
+) WITHOUT ROWID
+"""
+
+
+def normalize(text: str) -> str:
+    """
+    NFKC and collapsed whitespace. Case is kept: embedding models are case-sensitive.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def text_hash(text: str) -> bytes:
+    return hashlib.sha256(normalize(text).encode("utf-8")).digest()
+
+
+def _pack(vector: list[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> list[float]:
+    out = array("f")
+    out.frombytes(blob)
+    return out.tolist()
+
+
+class EmbeddingStore:
+    """
+    Thread-safe (one SQLite connection per thread) batch get/put of vectors.
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn().execute(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    # ---- batch API ----
+
+    def get_many(self, model: str, texts: list[str], dim: int | None = None) -> dict[str, list[float]]:
+        """
+        Stored vectors for the texts that have one. `dim=None` accepts any
+        dimension stored for the model (before the producer knows its dimension).
+        """
+        by_hash: dict[bytes, list[str]] = {}
+        for text in texts:
+            by_hash.setdefault(text_hash(text), []).append(text)
+        hashes = list(by_hash)
+        found: dict[str, list[float]] = {}
+        conn = self._conn()
+        for i in range(0, len(hashes), _IN_CHUNK):
+            part = hashes[i : i + _IN_CHUNK]
+            marks = ",".join("?" * len(part))
+            rows = conn.execute(
+                f"SELECT text_hash, vector FROM embeddings "
+                f"WHERE model = ? AND (? IS NULL OR dim = ?) AND text_hash IN ({marks})",
+                (model, dim, dim, *part),
+            ).fetchall()
+            for h, blob in rows:
+                vector = _unpack(blob)
+                for text in by_hash[h]:
+                    found[text] = vector
+        return found
+
+    def put_many(self, model: str, items: dict[str, list[float]]) -> int:
+        rows = [(model, len(v), text_hash(t), _pack(v), time.time()) for t, v in items.items() if v]
+        if not rows:
+            return 0
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany("INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    # ---- read-through helpers ----
+
+    def _lookup(self, model: str, texts: list[str], dim: int | None) -> dict[str, list[float]]:
+        try:
+            return self.get_many(model, texts, dim)
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"[embed-store] read failed ({e}); embedding without the store")
+            return {}
+
+    def _save(self, model: str, computed: dict[str, list[float]]) -> None:
+        try:
+            self.put_many(model, computed)
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"[embed-store] write failed ({e})")
+
+    def embed_with(
+        self,
+        model: str,
+        texts: list[str],
+        embed_fn: Callable[[list[str]], list[list[float]]],
+        dim: int | None = None,
+    ) -> list[list[float]]:
+        """
+        Vectors for `texts` in order: stored ones from the store, the rest from
+        one `embed_fn` call over the distinct misses, which are then stored.
+        """
+        found = self._lookup(model, texts, dim)
+        misses = sum(1 for t in texts if t not in found)
+        self._count(len(texts) - misses, misses)
+        missing = list(dict.fromkeys(t for t in texts if t not in found))
+        if missing:
+            computed = dict(zip(missing, embed_fn(missing), strict=True))
+            self._save(model, computed)
+            found.update(computed)
+        return [found[t] for t in texts]
+
+    async def aembed_with(
+        self,
+        model: str,
+        texts: list[str],
+        embed_fn: Callable[[list[str]], Awaitable[list[list[float]]]],
+        dim: int | None = None,
+    ) -> list[list[float]]:
+        """
+        embed_with for async producers; store I/O runs in a worker thread.
+        """
+        found = await asyncio.to_thread(self._lookup, model, texts, dim)
+        misses = sum(1 for t in texts if t not in found)
+        self._count(len(texts) - misses, misses)
+        missing = list(dict.fromkeys(t for t in texts if t not in found))
+        if missing:
+            computed = dict(zip(missing, await embed_fn(missing), strict=True))
+            await asyncio.to_thread(self._save, model, computed)
+            found.update(computed)
+        return [found[t] for t in texts]
+
+    # ---- metrics ----
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        try:
+            rows = self._conn().execute("SELECT model, dim, count(*) FROM embeddings GROUP BY model, dim").fetchall()
+        except sqlite3.Error:
+            rows = []
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "errors": self.errors,
+            "entries": {f"{m}/{d}": n for m, d, n in rows},
+        }
+
+
+@lru_cache(maxsize=1)
+def shared_store() -> EmbeddingStore | None:
+    """
+    Process-wide store, or None if EMBED_STORE_PATH is empty or unusable.
+    """
+    if not os.getenv("EMBED_STORE_PATH", "~").strip():
+        return None
+    try:
+        return EmbeddingStore(STORE_PATH)
+    except (OSError, sqlite3.Error) as e:
+        print(f"[embed-store] disabled ({e})")
+        return None
+
+
+def embed_through_store(
+    model: str,
+    texts: list[str],
+    embed_fn: Callable[[list[str]], list[list[float]]],
+    dim: int | None = None,
+) -> list[list[float]]:
+    """
+    embed_with on the shared store, or straight to the model when it is disabled.
+    """
+    store = shared_store()
+    if store is None:
+        return embed_fn(texts)
+    return store.embed_with(model, texts, embed_fn, dim)
+
+
+async def aembed_through_store(
+    model: str,
+    texts: list[str],
+    embed_fn: Callable[[list[str]], Awaitable[list[list[float]]]],
+    dim: int | None = None,
+) -> list[list[float]]:
+    store = shared_store()
+    if store is None:
+        return await embed_fn(texts)
+    return await store.aembed_with(model, texts, embed_fn, dim)
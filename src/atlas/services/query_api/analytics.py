@@ -0,0 +1,399 @@
+"""
+Materialized analytics snapshots.
+
+Aggregates that scan whole labels (industry distribution, dashboard counters,
+deal pipeline by stage) are computed off the request path and stored as
+snapshot documents in Redis. Endpoints read a snapshot in O(1): a process-local
+copy for SNAPSHOT_LOCAL_TTL seconds, otherwise one Redis GET.
+
+Snapshots are refreshed:
+  - incrementally after each graph ETL batch (refresh_after_batch): only the
+    industries the batch touched (the companies' new industries and the ones
+    they moved out of) are re-aggregated and merged, plus the dashboard
+    counters;
+  - fully on a schedule by the API process (SnapshotMaterializer), which also
+    covers writes that don't go through the ETL (synthetic data, CRM sync).
+A Redis lock per snapshot keeps concurrent refreshes from overwriting each
+other. A refresh requested while the lock is held is queued in Redis
+(snapshot:<name>:pending) and run by the lock holder before it releases, so
+no post-batch refresh is dropped.
+
+Env:
+  ANALYTICS_REFRESH_SECONDS=120     # full refresh interval in the API process
+  ANALYTICS_SAMPLE_SIZE=10          # sample companies kept per industry
+  SNAPSHOT_LOCAL_TTL=5              # seconds a process reuses its local copy
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import orjson
+
+from atlas.services.query_api.cache import r
+from atlas.services.query_api.neo4j_pool import get_manager
+
+REFRESH_SECONDS = float(os.getenv("ANALYTICS_REFRESH_SECONDS", "120"))
+SAMPLE_SIZE = int(os.getenv("ANALYTICS_SAMPLE_SIZE", "10"))
+LOCAL_TTL = float(os.getenv("SNAPSHOT_LOCAL_TTL", "5"))
+_LOCK_TIMEOUT_MS = 60_000
+_FULL = "*"  # pending marker: full recompute
+
+# Delete the lock only if it is still ours (it may have expired and been re-taken)
+_RELEASE_LOCK = r.register_script(
+    """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+)
+
+INDUSTRY_STATS = "industry_stats"
+DASHBOARD_METRICS = "dashboard_metrics"
+PIPELINE_STATS = "pipeline_stats"
+
+# ---------------------------
+# Aggregates
+# ---------------------------
+
+# Top-N largest companies per industry instead of every company in one list.
+# $industries = null aggregates everything; a list re-aggregates just those.
+# Nulls sort first under DESC: unknown sizes go last, and c.id keeps the
+# sample the same from one run to the next.
+INDUSTRY_STATS_QUERY = """
+MATCH (c:Company)
+WHERE $industries IS NULL OR c.industry IN $industries
+WITH c ORDER BY coalesce(c.employee_count, -1) DESC, c.id
+WITH c.industry AS industry, count(c) AS company_count, collect(c)[..$sample_size] AS sample
+RETURN
+  industry,
+  company_count,
+  [x IN sample | {name: x.name, domain: x.domain, location: x.location}] AS companies
+ORDER BY company_count DESC, industry
+"""
+
+DASHBOARD_QUERIES = {
+    "companies": "MATCH (c:Company) RETURN count(c) as count",
+    "contacts": "MATCH (p:Person) RETURN count(p) as count",
+    "open_deals": """
+        MATCH (d:Deal)
+        WHERE NOT d.stage IN ['Closed Won', 'Closed Lost']
+        RETURN count(d) as count, sum(d.value) as value
+    """,
+    "unread_signals": "MATCH (s:Signal) WHERE s.is_read = false RETURN count(s) as count",
+    "meetings": "MATCH (m:Meeting) RETURN count(m) as count",
+    "activities": """
+        MATCH (a:Activity)
+        RETURN a.type as type, count(a) as count
+    """,
+    "won": """
+        MATCH (d:Deal {stage: 'Closed Won'})
+        RETURN count(d) as won_count, sum(d.value) as won_value
+    """,
+}
+
+PIPELINE_STATS_QUERY = """
+MATCH (d:Deal)
+WITH d.stage as stage, count(d) as count, sum(d.value) as value
+RETURN stage, count, value
+ORDER BY
+    CASE stage
+        WHEN 'Discovery' THEN 1
+        WHEN 'Qualification' THEN 2
+        WHEN 'Proposal' THEN 3
+        WHEN 'Negotiation' THEN 4
+        WHEN 'Closed Won' THEN 5
+        WHEN 'Closed Lost' THEN 6
+    END
+"""
+
+STAGE_PROBABILITY = {
+    "Discovery": 0.1,
+    "Qualification": 0.25,
+    "Proposal": 0.5,
+    "Negotiation": 0.75,
+    "Closed Won": 1.0,
+    "Closed Lost": 0,
+}
+
+
+def _read(query: str, **params) -> list[dict]:
+    with get_manager().session() as s:
+        return s.execute_read(lambda tx: [rec.data() for rec in tx.run(query, **params)])
+
+
+INDUSTRIES_OF_QUERY = """
+MATCH (c:Company)
+WHERE (c.id IN $ids OR c.domain IN $domains) AND c.industry IS NOT NULL
+RETURN DISTINCT c.industry AS industry
+"""
+
+
+def industries_of(companies: Iterable[dict]) -> set[str]:
+    """
+    Industries the stored versions of `companies` (matched by id or domain)
+    are in now. Read before an ETL batch writes, so refresh_after_batch can
+    also re-aggregate the industries companies move out of. Never raises.
+    """
+    companies = list(companies)
+    ids = [c["id"] for c in companies if c.get("id")]
+    domains = [c["domain"] for c in companies if c.get("domain")]
+    if not ids and not domains:
+        return set()
+    try:
+        return {row["industry"] for row in _read(INDUSTRIES_OF_QUERY, ids=ids, domains=domains)}
+    except Exception as e:
+        print(f"[analytics] could not read current industries ({e}); moved-out industries refresh on schedule")
+        return set()
+
+
+def compute_industry_stats(previous: list[dict] | None = None, industries: Iterable[str] | None = None) -> list[dict]:
+    """
+    Full aggregate, or, with `industries`, re-aggregate those and merge into `previous`.
+    """
+    if industries is None or previous is None:
+        return _read(INDUSTRY_STATS_QUERY, industries=None, sample_size=SAMPLE_SIZE)
+
+    touched = set(industries)
+    fresh = _read(INDUSTRY_STATS_QUERY, industries=list(touched), sample_size=SAMPLE_SIZE)
+    # Industries that no longer have companies simply drop out
+    rows = [row for row in previous if row["industry"] not in touched] + fresh
+    # Same order as the query: count desc, then industry (null last)
+    rows.sort(key=lambda row: (-row["company_count"], row["industry"] is None, row["industry"] or ""))
+    return rows
+
+
+def compute_dashboard_metrics(previous: dict | None = None, industries=None) -> dict:
+    rows = {name: _read(q) for name, q in DASHBOARD_QUERIES.items()}
+    deals = rows["open_deals"][0]
+    won = rows["won"][0] if rows["won"] else None
+    return {
+        "companies": rows["companies"][0]["count"],
+        "contacts": rows["contacts"][0]["count"],
+        "open_deals": deals["count"],
+        "pipeline_value": deals["value"] or 0,
+        "unread_signals": rows["unread_signals"][0]["count"],
+        "upcoming_meetings": rows["meetings"][0]["count"],
+        "won_deals": won["won_count"] if won else 0,
+        "won_value": won["won_value"] if won else 0,
+        "activity_counts": {row["type"]: row["count"] for row in rows["activities"]},
+        "currency": "EUR",
+    }
+
+
+def compute_pipeline_stats(previous: dict | None = None, industries=None) -> dict:
+    stages = []
+    total_value = 0
+    total_count = 0
+    weighted_value = 0
+    for row in _read(PIPELINE_STATS_QUERY):
+        stages.append({"stage": row["stage"], "count": row["count"], "value": row["value"]})
+        total_count += row["count"]
+        total_value += row["value"]
+        weighted_value += row["value"] * STAGE_PROBABILITY.get(row["stage"], 0)
+    return {
+        "stages": stages,
+        "total_count": total_count,
+        "total_value": total_value,
+        "weighted_value": int(weighted_value),
+        "currency": "EUR",
+    }
+
+
+MATERIALIZERS: dict[str, Callable[..., Any]] = {
+    INDUSTRY_STATS: compute_industry_stats,
+    DASHBOARD_METRICS: compute_dashboard_metrics,
+    PIPELINE_STATS: compute_pipeline_stats,
+}
+
+# ---------------------------
+# Snapshot store
+# ---------------------------
+
+_local: dict[str, tuple[float, dict]] = {}
+_local_lock = threading.Lock()
+
+
+def _key(name: str) -> str:
+    return f"snapshot:{name}"
+
+
+def load(name: str) -> dict | None:
+    """
+    Snapshot document {"data", "computed_at", "source"} or None if never materialized.
+    """
+    now = time.time()
+    with _local_lock:
+        hit = _local.get(name)
+    if hit is not None and now - hit[0] < LOCAL_TTL:
+        return hit[1]
+    raw = r.get(_key(name))
+    if raw is None:
+        return None
+    doc = orjson.loads(raw)
+    with _local_lock:
+        _local[name] = (now, doc)
+    return doc
+
+
+def _enqueue(name: str, industries: Iterable[str] | None) -> None:
+    members = [_FULL] if industries is None else list(industries)
+    if members:
+        r.sadd(f"{_key(name)}:pending", *members)
+
+
+def _take_pending(name: str) -> set[str] | None:
+    """
+    Pop every queued request: None if nothing is queued, {_FULL} for a full
+    recompute, otherwise the industries to re-aggregate.
+    """
+    pipe = r.pipeline(transaction=True)
+    pipe.smembers(f"{_key(name)}:pending")
+    pipe.delete(f"{_key(name)}:pending")
+    members = pipe.execute()[0]
+    if not members:
+        return None
+    return {m.decode() if isinstance(m, bytes) else m for m in members}
+
+
+def _compute(name: str, pending: set[str], source: str) -> dict:
+    industries = None if _FULL in pending else pending
+    previous = None
+    if industries is not None:
+        raw = r.get(_key(name))
+        previous = orjson.loads(raw)["data"] if raw else None
+    t0 = time.perf_counter()
+    data = MATERIALIZERS[name](previous=previous, industries=industries)
+    doc = {
+        "data": data,
+        "computed_at": time.time(),
+        "compute_ms": round(1000 * (time.perf_counter() - t0), 1),
+        "source": source,
+    }
+    r.set(_key(name), orjson.dumps(doc))
+    with _local_lock:
+        _local[name] = (time.time(), doc)
+    return doc
+
+
+def materialize(name: str, industries: Iterable[str] | None = None, source: str = "schedule") -> dict | None:
+    """
+    Queue a refresh of one snapshot (all of it, or just `industries`) and run
+    the queue if no other process holds the refresh lock. Returns the stored
+    document, or None if another process holds the lock: it runs the queued
+    request before releasing.
+    """
+    _enqueue(name, industries)
+    lock_key = f"{_key(name)}:lock"
+    token = uuid.uuid4().hex.encode()
+    doc = None
+    while r.set(lock_key, token, nx=True, px=_LOCK_TIMEOUT_MS):
+        try:
+            while (pending := _take_pending(name)) is not None:
+                doc = _compute(name, pending, source)
+        finally:
+            _RELEASE_LOCK(keys=[lock_key], args=[token])
+        # A request queued after our last take but before the release found
+        # the lock held: pick it up (the loop ends when nothing is pending)
+        if not r.exists(f"{_key(name)}:pending"):
+            break
+    return doc
+
+
+def snapshot(name: str) -> Any:
+    """
+    Snapshot data for an endpoint; materialized on the spot the first time.
+    """
+    doc = load(name)
+    if doc is None:
+        doc = materialize(name, source="on-demand")
+    if doc is None:
+        # Someone else is computing it right now: wait for their result
+        deadline = time.time() + _LOCK_TIMEOUT_MS / 1000
+        while doc is None and time.time() < deadline:
+            time.sleep(0.1)
+            doc = load(name)
+    if doc is None:
+        raise TimeoutError(f"snapshot {name} is not available yet")
+    return doc["data"]
+
+
+def refresh_after_batch(
+    batch_id: str, companies: Iterable[dict], previous_industries: Iterable[str] = ()
+) -> None:
+    """
+    Incrementally refresh snapshots a committed ETL batch can change.
+    `previous_industries` (industries_of(), read before the write) adds the
+    industries companies moved out of. Never raises: the batch is already committed.
+    """
+    companies = list(companies)
+    industries = {c["industry"] for c in companies if c.get("industry")} | set(previous_industries)
+    try:
+        if r.exists(_key(INDUSTRY_STATS)):
+            materialize(INDUSTRY_STATS, industries=industries, source=f"batch:{batch_id}")
+        else:
+            materialize(INDUSTRY_STATS, source=f"batch:{batch_id}")
+        materialize(DASHBOARD_METRICS, source=f"batch:{batch_id}")
+        print(f"[analytics] batch {batch_id}: refreshed snapshots ({len(industries)} industries)")
+    except Exception as e:
+        print(f"[analytics] batch {batch_id}: snapshot refresh skipped ({e})")
+
+
+# ---------------------------
+# Scheduled refresh
+# ---------------------------
+
+
+class SnapshotMaterializer:
+    """
+    Daemon thread that fully refreshes every snapshot each `interval` seconds.
+    """
+
+    def __init__(self, interval: float = REFRESH_SECONDS):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="analytics-materializer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            for name in MATERIALIZERS:
+                if self._stop.is_set():
+                    return
+                try:
+                    materialize(name)
+                except Exception as e:
+                    print(f"[analytics] refresh of {name} failed ({e})")
+            self._stop.wait(self.interval)
+
+    def stats(self) -> dict:
+        out = {"interval_seconds": self.interval, "running": self._thread is not None}
+        for name in MATERIALIZERS:
+            doc = load(name)
+            out[name] = (
+                {"age_seconds": round(time.time() - doc["computed_at"], 1), "compute_ms": doc["compute_ms"], "source": doc["source"]}
+                if doc
+                else None
+            )
+        return out
+
+
+materializer = SnapshotMaterializer()
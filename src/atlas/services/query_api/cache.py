@@ -1,21 +1,577 @@
+"""
+Two-tier response cache for the query API.
+
+L1: bounded in-process LRU (no network round-trip, no decode on hit).
+L2: Redis, shared by all workers, orjson-encoded envelopes.
+
+Every entry carries a freshness deadline and a stale deadline. Between the two
+the entry is still served immediately while a single background refresh
+recomputes it (stale-while-revalidate). Misses are single-flighted: one thread
+per process (a per-key future) and one worker across processes (Redis SET NX
+lock) recomputes; everyone else waits for that result.
+
+Entries can be tagged with the entities they depend on (see cache_tags).
+invalidate_tags() drops every L2 key indexed under those tags and publishes
+the tags on a Redis channel; each API process listens and drops its own L1
+copies, so ETL batches invalidate exactly what they touched. Tags travel in
+the L2 envelope, so L1 copies filled from Redis are indexed too. Every
+invalidation also bumps a generation per tag: a compute that started before
+an invalidation of one of its tags does not keep its (stale) result.
+
+Usage:
+    return response_cache.get_or_compute(
+        "companies", {"domain": domain}, lambda: load(domain), ttl=60,
+        tags=lambda out: [cache_tags.company(domain)],
+    )
+
+Env:
+  CACHE_L1_MAX_ITEMS=2048   # L1 capacity (entries)
+  CACHE_LOCK_TIMEOUT=10     # seconds a recompute lock is held / waited for
+"""
+
+from __future__ import annotations
+
+import contextlib
 import hashlib
-import json
 import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
 
+import orjson
 import redis
 
 r = redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
 
+L1_MAX_ITEMS = int(os.getenv("CACHE_L1_MAX_ITEMS", "2048"))
+LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", "10"))
+_WAIT_POLL_SECONDS = 0.05
+INVALIDATION_CHANNEL = "cache:invalidate"
+GENERATION_KEY = "cache:generation"
+# Per-tag generations only need to outlive any compute that could race them
+_TAG_GENERATION_TTL = 3600
+
+# Delete a recompute lock only if it is still ours: it may have expired and
+# been taken by another worker while we were computing
+_RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+Tags = Iterable[str] | Callable[[Any], Iterable[str]]
+
+
+def key_of(prefix, **params):
+    h = hashlib.sha256(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()[:16]
+    return f"{prefix}:{h}"
+
+
+# ---------------------------
+# L1: in-process LRU
+# ---------------------------
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+    tags: tuple[str, ...] = ()
+
+
+class LRUCache:
+    """
+    Thread-safe bounded LRU. Entries past their stale deadline are dropped on read.
+    Keeps a local tag -> keys index so tag invalidations can drop L1 entries.
+    """
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._data: OrderedDict[str, _Entry] = OrderedDict()
+        self._key_tags: dict[str, tuple[str, ...]] = {}
+        self._tag_keys: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> _Entry | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if time.time() >= entry.stale_until:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: _Entry, tags: tuple[str, ...] = ()) -> None:
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            if tags:
+                self._untag(key)
+                self._key_tags[key] = tags
+                for tag in tags:
+                    self._tag_keys.setdefault(tag, set()).add(key)
+            while len(self._data) > self.max_items:
+                evicted, _ = self._data.popitem(last=False)
+                self._untag(evicted)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._untag(key)
+
+    def delete_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys: set[str] = set()
+            for tag in tags:
+                keys |= self._tag_keys.get(tag, set())
+            for key in keys:
+                self._data.pop(key, None)
+                self._untag(key)
+            return len(keys)
+
+    def _untag(self, key: str) -> None:
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ---------------------------
+# Metrics
+# ---------------------------
+
+
+@dataclass
+class PrefixStats:
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    stale_served: int = 0
+    refreshes: int = 0
+    errors: int = 0
+    lookups: int = 0
+    lookup_seconds: float = 0.0
+    computes: int = 0
+    compute_seconds: float = 0.0
+
+    def snapshot(self) -> dict:
+        hits = self.l1_hits + self.l2_hits
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / self.lookups, 4) if self.lookups else 0.0,
+            "stale_served": self.stale_served,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "avg_lookup_ms": round(1000 * self.lookup_seconds / self.lookups, 3)
+            if self.lookups
+            else 0.0,
+            "avg_compute_ms": round(1000 * self.compute_seconds / self.computes, 2)
+            if self.computes
+            else 0.0,
+        }
+
+
+# ---------------------------
+# Two-tier cache
+# ---------------------------
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        l1_max_items: int = L1_MAX_ITEMS,
+        lock_timeout: float = LOCK_TIMEOUT,
+    ):
+        self.redis = redis_client
+        self.l1 = LRUCache(l1_max_items)
+        self.lock_timeout = lock_timeout
+        self._release_lock = redis_client.register_script(_RELEASE_LOCK_LUA)
+        # key -> result of the compute in flight in this process
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._stats: dict[str, PrefixStats] = {}
+        self._stats_lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._refreshing_lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+        self._listener: threading.Thread | None = None
+        self._listener_stop = threading.Event()
+        self._subscribers: list[Callable[[dict], None]] = []
+        self.invalidated_keys = 0
+
+    # ---- public API ----
+
+    def get_or_compute(
+        self,
+        prefix: str,
+        params: dict[str, Any],
+        compute: Callable[[], Any],
+        ttl: int = 60,
+        stale_ttl: int | None = None,
+        tags: Tags = (),
+    ) -> Any:
+        """
+        Return the cached value for (prefix, params), computing it on a miss.
+
+        ttl:       seconds the value is fresh
+        stale_ttl: extra seconds an expired value may be served while it is
+                   refreshed in the background (defaults to ttl)
+        tags:      entity tags the value depends on, or a callable deriving
+                   them from the computed value
+        """
+        key = key_of(prefix, **params)
+        stats = self._stats_for(prefix)
+        entry = self._lookup(key, stats)
+        if entry is not None:
+            if time.time() >= entry.fresh_until:
+                stats.stale_served += 1
+                self._refresh_in_background(key, stats, compute, ttl, stale_ttl, tags)
+            return entry.value
+        stats.misses += 1
+        return self._compute_single_flight(key, stats, compute, ttl, stale_ttl, tags)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._lookup(key, self._stats_for(key.split(":", 1)[0]))
+        return entry.value if entry is not None else None
+
+    def set(self, key: str, value: Any, ttl: int = 60, stale_ttl: int | None = None) -> None:
+        self._store(key, self._stats_for(key.split(":", 1)[0]), value, ttl, stale_ttl)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.l1.delete(key)
+        if keys:
+            with contextlib.suppress(redis.RedisError):
+                self.redis.delete(*keys)
+
+    def invalidate_tags(self, tags: Iterable[str], batch_id: str | None = None) -> int:
+        """
+        Drop every cached response tagged with any of `tags`, in Redis and in
+        the L1 of every API process (via the invalidation channel).
+        Returns the number of L2 keys deleted.
+        """
+        tags = sorted(set(tags))
+        if not tags:
+            return 0
+        tag_keys = [f"tag:{t}" for t in tags]
+        deleted = 0
+        try:
+            # Generations first: a compute that indexes its key after the SUNION
+            # below sees them and discards itself (see _store)
+            generation = self.redis.incr(GENERATION_KEY)
+            pipe = self.redis.pipeline(transaction=False)
+            for tag in tags:
+                pipe.set(f"taggen:{tag}", generation, ex=_TAG_GENERATION_TTL)
+            pipe.execute()
+            keys = [k.decode() if isinstance(k, bytes) else k for k in self.redis.sunion(tag_keys)]
+            pipe = self.redis.pipeline(transaction=False)
+            if keys:
+                pipe.delete(*keys)
+            pipe.delete(*tag_keys)
+            pipe.publish(INVALIDATION_CHANNEL, orjson.dumps({"batch_id": batch_id, "tags": tags}))
+            deleted = pipe.execute()[0] if keys else 0
+        except redis.RedisError as e:
+            print(f"[cache] tag invalidation failed (batch {batch_id}): {e}")
+        self.invalidated_keys += self.l1.delete_tags(tags)
+        return deleted
+
+    def start_invalidation_listener(self) -> None:
+        """
+        Subscribe to the invalidation channel and drop matching L1 entries.
+        Runs in a daemon thread; reconnects if Redis goes away.
+        """
+        if self._listener is not None:
+            return
+        self._listener_stop.clear()
+        self._listener = threading.Thread(
+            target=self._listen, name="cache-invalidation", daemon=True
+        )
+        self._listener.start()
+
+    def on_invalidation(self, callback: Callable[[dict], None]) -> None:
+        """
+        Also call `callback(message)` for every invalidation the listener
+        receives ({"batch_id", "tags"}), e.g. to rebuild derived state after an
+        ETL batch. Called on the listener thread; keep it quick.
+        """
+        self._subscribers.append(callback)
+
+    def stop_invalidation_listener(self) -> None:
+        self._listener_stop.set()
+        self._listener = None
+
+    def _listen(self) -> None:
+        while not self._listener_stop.is_set():
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                while not self._listener_stop.is_set():
+                    msg = pubsub.get_message(timeout=1.0)
+                    if msg and msg.get("type") == "message":
+                        message = orjson.loads(msg["data"])
+                        self.invalidated_keys += self.l1.delete_tags(message.get("tags", []))
+                        for callback in self._subscribers:
+                            try:
+                                callback(message)
+                            except Exception as e:
+                                print(f"[cache] invalidation subscriber failed: {e}")
+                pubsub.close()
+            except (redis.RedisError, orjson.JSONDecodeError) as e:
+                print(f"[cache] invalidation listener error: {e}; retrying")
+                self._listener_stop.wait(5.0)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            prefixes = {p: s.snapshot() for p, s in sorted(self._stats.items())}
+        return {
+            "l1_items": len(self.l1),
+            "l1_max_items": self.l1.max_items,
+            "l1_invalidated": self.invalidated_keys,
+            "prefixes": prefixes,
+        }
+
+    # ---- internals ----
+
+    def _stats_for(self, prefix: str) -> PrefixStats:
+        stats = self._stats.get(prefix)
+        if stats is None:
+            with self._stats_lock:
+                stats = self._stats.setdefault(prefix, PrefixStats())
+        return stats
+
+    def _lookup(self, key: str, stats: PrefixStats) -> _Entry | None:
+        started = time.perf_counter()
+        try:
+            entry = self.l1.get(key)
+            if entry is not None:
+                stats.l1_hits += 1
+                return entry
+            entry = self._l2_get(key, stats)
+            if entry is not None:
+                stats.l2_hits += 1
+                self.l1.set(key, entry, entry.tags)
+            return entry
+        finally:
+            stats.lookups += 1
+            stats.lookup_seconds += time.perf_counter() - started
+
+    def _l2_get(self, key: str, stats: PrefixStats) -> _Entry | None:
+        try:
+            raw = self.redis.get(key)
+        except redis.RedisError:
+            stats.errors += 1
+            return None
+        if not raw:
+            return None
+        try:
+            env = orjson.loads(raw)
+            return _Entry(
+                value=env["v"], fresh_until=env["f"], stale_until=env["s"], tags=tuple(env.get("t", ()))
+            )
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            # Legacy plain-JSON value written before envelopes: treat as a miss
+            return None
+
+    def _store(
+        self,
+        key: str,
+        stats: PrefixStats,
+        value: Any,
+        ttl: int,
+        stale_ttl: int | None,
+        tags: Tags = (),
+        generation: int | None = None,
+    ) -> None:
+        """
+        Write to L1 and L2. `generation` is the invalidation generation read
+        before the value was computed: if any of its tags was invalidated
+        since, the value is dropped again instead of being served.
+        """
+        now = time.time()
+        stale_for = stale_ttl if stale_ttl is not None else ttl
+        tag_list = tuple(sorted(set(tags(value) if callable(tags) else tags)))
+        entry = _Entry(value=value, fresh_until=now + ttl, stale_until=now + ttl + stale_for, tags=tag_list)
+        self.l1.set(key, entry, tag_list)
+        payload = orjson.dumps({"v": value, "f": entry.fresh_until, "s": entry.stale_until, "t": tag_list})
+        lifetime = max(1, int(ttl + stale_for))
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(key, payload, ex=lifetime)
+            for tag in tag_list:
+                # Tag sets must outlive every key they index: set a TTL if missing, extend if shorter
+                pipe.sadd(f"tag:{tag}", key)
+                pipe.expire(f"tag:{tag}", lifetime, nx=True)
+                pipe.expire(f"tag:{tag}", lifetime, gt=True)
+            pipe.execute()
+            # Checked after indexing: an invalidation either saw our key in its
+            # tag sets, or bumped the generation before we read it here
+            if generation is not None and tag_list and self._invalidated_since(tag_list, generation):
+                self.l1.delete(key)
+                self.redis.delete(key)
+        except redis.RedisError:
+            stats.errors += 1
+
+    def _generation(self) -> int | None:
+        """Current invalidation generation (None if Redis is unavailable)"""
+        try:
+            return int(self.redis.get(GENERATION_KEY) or 0)
+        except redis.RedisError:
+            return None
+
+    def _invalidated_since(self, tags: tuple[str, ...], generation: int) -> bool:
+        gens = self.redis.mget([f"taggen:{t}" for t in tags])
+        return any(g is not None and int(g) > generation for g in gens)
+
+    def _timed_compute(self, stats: PrefixStats, compute: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            return compute()
+        finally:
+            stats.computes += 1
+            stats.compute_seconds += time.perf_counter() - started
+
+    def _acquire_remote_lock(self, key: str) -> bytes | bool | None:
+        """
+        Our token if we own the cross-worker lock, False if someone else does,
+        None if Redis is down.
+        """
+        token = uuid.uuid4().hex.encode()
+        try:
+            if self.redis.set(f"lock:{key}", token, nx=True, px=int(self.lock_timeout * 1000)):
+                return token
+            return False
+        except redis.RedisError:
+            return None
+
+    def _release_remote_lock(self, key: str, token: bytes) -> None:
+        with contextlib.suppress(redis.RedisError):
+            self._release_lock(keys=[f"lock:{key}"], args=[token])
+
+    def _compute_single_flight(
+        self,
+        key: str,
+        stats: PrefixStats,
+        compute: Callable[[], Any],
+        ttl: int,
+        stale_ttl: int | None,
+        tags: Tags,
+    ) -> Any:
+        # Only registration is under the lock: unrelated keys never wait on each other
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+        if not leader:
+            return flight.result()
+        try:
+            value = self._compute_once(key, stats, compute, ttl, stale_ttl, tags)
+            flight.set_result(value)
+            return value
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _compute_once(
+        self,
+        key: str,
+        stats: PrefixStats,
+        compute: Callable[[], Any],
+        ttl: int,
+        stale_ttl: int | None,
+        tags: Tags,
+    ) -> Any:
+        # A previous leader may have filled it between our miss and our registration
+        entry = self.l1.get(key)
+        if entry is not None:
+            return entry.value
+
+        owned = self._acquire_remote_lock(key)
+        if owned is False:
+            # Another worker is computing: wait for its result, then give up and compute
+            deadline = time.time() + self.lock_timeout
+            while time.time() < deadline:
+                time.sleep(_WAIT_POLL_SECONDS)
+                entry = self._l2_get(key, stats)
+                if entry is not None:
+                    self.l1.set(key, entry, entry.tags)
+                    return entry.value
+        try:
+            generation = self._generation()
+            value = self._timed_compute(stats, compute)
+            self._store(key, stats, value, ttl, stale_ttl, tags, generation)
+            return value
+        finally:
+            if owned:
+                self._release_remote_lock(key, owned)
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        stats: PrefixStats,
+        compute: Callable[[], Any],
+        ttl: int,
+        stale_ttl: int | None,
+        tags: Tags,
+    ) -> None:
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh() -> None:
+            try:
+                owned = self._acquire_remote_lock(key)
+                if owned is False:
+                    return
+                try:
+                    generation = self._generation()
+                    value = self._timed_compute(stats, compute)
+                    self._store(key, stats, value, ttl, stale_ttl, tags, generation)
+                    stats.refreshes += 1
+                finally:
+                    if owned:
+                        self._release_remote_lock(key, owned)
+            except Exception as e:
+                stats.errors += 1
+                print(f"[cache] background refresh failed for {key}: {e}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+
+        self._refresher.submit(_refresh)
+
+
+response_cache = ResponseCache(r)
+
 
 def cache_get(key):
-    v = r.get(key)
-    return json.loads(v) if v else None
+    return response_cache.get(key)
 
 
 def cache_set(key, obj, ttl=60):
-    r.setex(key, ttl, json.dumps(obj))
+    response_cache.set(key, obj, ttl=ttl)
 
 
-def key_of(prefix, **params):
-    h = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
-    return f"{prefix}:{h}"
+def invalidate_tags(tags: Iterable[str], batch_id: str | None = None) -> int:
+    return response_cache.invalidate_tags(tags, batch_id=batch_id)
@@ -0,0 +1,97 @@
+"""
+Cache tags: which graph entities a cached response depends on.
+
+Query API endpoints tag their responses with these; the graph ETL computes
+the same tags for every batch it commits and invalidates them, so only the
+responses that could have changed are dropped and TTLs can be long.
+
+Env:
+  CACHE_TAGGED_TTL=21600   # freshness of tag-invalidated responses (seconds)
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from typing import Any
+
+TAGGED_TTL = int(os.getenv("CACHE_TAGGED_TTL", str(6 * 3600)))
+
+# Responses that depend on "any person" rather than named entities
+PEOPLE_SEARCH = "people:search"
+
+
+def company(domain: str | None) -> str:
+    return f"company:{(domain or '').lower()}"
+
+
+def node(node_id: Any) -> str:
+    return f"node:{node_id}"
+
+
+def industry(name: str | None) -> str:
+    return f"industry:{name}"
+
+
+def location(name: str | None) -> str:
+    return f"location:{name}"
+
+
+def department(name: str | None) -> str:
+    return f"department:{name}"
+
+
+def node_ids(value: Any) -> set[str]:
+    """
+    Tags for every `id` found in a response (nested dicts/lists), so a row is
+    invalidated when any entity it shows changes.
+    """
+    out: set[str] = set()
+    stack = [value]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, dict):
+            if v.get("id") is not None:
+                out.add(node(v["id"]))
+            stack.extend(v.values())
+        elif isinstance(v, list | tuple):
+            stack.extend(v)
+    return out
+
+
+def tags_for_companies(companies: Iterable[dict]) -> set[str]:
+    """
+    Every tag a batch of company documents (with nested people) can affect.
+    """
+    tags: set[str] = set()
+    for c in companies:
+        tags.add(node(c.get("id")))
+        if c.get("domain"):
+            tags.add(company(c["domain"]))
+        if c.get("industry"):
+            tags.add(industry(c["industry"]))
+        if c.get("location"):
+            tags.add(location(c["location"]))
+        for p in c.get("people") or []:
+            tags.add(PEOPLE_SEARCH)
+            tags.add(node(p.get("id")))
+            if p.get("department"):
+                tags.add(department(p["department"]))
+    return tags
+
+
+def publish_batch(batch_id: str, companies: Iterable[dict]) -> int:
+    """
+    Invalidate cached API responses touched by a committed ETL batch.
+    Never raises: a cache hiccup must not fail a load that already committed.
+    """
+    try:
+        from atlas.services.query_api.cache import invalidate_tags
+
+        tags = tags_for_companies(companies)
+        deleted = invalidate_tags(tags, batch_id=batch_id)
+        print(f"[cache] batch {batch_id}: invalidated {deleted} responses across {len(tags)} tags")
+        return deleted
+    except Exception as e:
+        print(f"[cache] batch {batch_id}: invalidation skipped ({e})")
+        return 0
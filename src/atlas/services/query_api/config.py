@@ -3,10 +3,20 @@ import os
 from dotenv import load_dotenv
 
 
+def _optional_float(name: str, default: str) -> float | None:
+    # Empty or "none" disables the setting
+    value = os.getenv(name, default).strip()
+    return None if value.lower() in ("", "none") else float(value)
+
+
 class Settings:
-    NEO4J_URI = os.getenv("NEO4J_URI")
+    NEO4J_URI = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
     NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-    NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+    NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "neo4jpass")
+    NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+    NEO4J_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30"))
+    NEO4J_LIVENESS_CHECK_TIMEOUT = _optional_float("NEO4J_LIVENESS_CHECK_TIMEOUT", "30")
+    NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
     REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
     QDRANT_URL = os.getenv("QDRANT_URL", "http://qdrant:6333")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
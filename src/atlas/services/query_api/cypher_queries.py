@@ -8,60 +8,61 @@ RETURN
   collect(DISTINCT e.address) as emails
 """
 
-PEOPLE_BY_NAME = """
-MATCH (p:Person)
-WHERE toLower(p.full_name) CONTAINS toLower($q)
-OPTIONAL MATCH (p)-[:WORKS_AT]->(c:Company)
-OPTIONAL MATCH (p)-[:HAS_EMAIL]->(e:Email)
-RETURN 
-  {id: p.id, full_name: p.full_name, title: p.title, department: p.department} as person, 
-  collect(DISTINCT {id: c.id, name: c.name, domain: c.domain, industry: c.industry, location: c.location}) as companies,
-  collect(DISTINCT e.address) as emails
-"""
-
-NEIGHBORS = """
-MATCH (n {id:$id})
-CALL apoc.path.expand(n, null, null, 1, $depth) YIELD path
-RETURN nodes(path) as nodes, relationships(path) as rels LIMIT 50
-"""
-
 # New queries for enhanced B2B functionality
+# List queries below are keyset-paged templates (see paging.Keyset.render):
+# {after} seeks past the cursor, {order} is the (sort key, id) order, and
+# _key carries that pair for the next cursor. COUNT {}/COLLECT {} subqueries
+# keep them non-eager, so rows stream as soon as they are found.
+COMPANY_KEYSET_SORT = ("c.name", "c.id")
+PERSON_KEYSET_SORT = ("p.full_name", "p.id")
+
 COMPANIES_BY_INDUSTRY = """
 MATCH (c:Company)
-WHERE c.industry = $industry
-OPTIONAL MATCH (p:Person)-[:WORKS_AT]->(c)
-RETURN 
-  {id: c.id, name: c.name, domain: c.domain, industry: c.industry, employee_count: c.employee_count, location: c.location} as company,
-  count(p) as people_count
-ORDER BY people_count DESC
+WHERE c.industry = $industry AND {after}
+WITH c ORDER BY {order} LIMIT $limit
+RETURN
+  {{id: c.id, name: c.name, domain: c.domain, industry: c.industry, employee_count: c.employee_count, location: c.location}} as company,
+  COUNT {{ (:Person)-[:WORKS_AT]->(c) }} as people_count,
+  [c.name, c.id] as _key
+ORDER BY {order}
 """
 
 COMPANIES_BY_LOCATION = """
 MATCH (c:Company)
-WHERE c.location = $location
-OPTIONAL MATCH (p:Person)-[:WORKS_AT]->(c)
-RETURN 
-  {id: c.id, name: c.name, domain: c.domain, industry: c.industry, employee_count: c.employee_count, location: c.location} as company,
-  count(p) as people_count
-ORDER BY people_count DESC
+WHERE c.location = $location AND {after}
+WITH c ORDER BY {order} LIMIT $limit
+RETURN
+  {{id: c.id, name: c.name, domain: c.domain, industry: c.industry, employee_count: c.employee_count, location: c.location}} as company,
+  COUNT {{ (:Person)-[:WORKS_AT]->(c) }} as people_count,
+  [c.name, c.id] as _key
+ORDER BY {order}
 """
 
 PEOPLE_BY_DEPARTMENT = """
 MATCH (p:Person)
-WHERE p.department = $department
-OPTIONAL MATCH (p)-[:WORKS_AT]->(c:Company)
-OPTIONAL MATCH (p)-[:HAS_EMAIL]->(e:Email)
-RETURN 
-  {id: p.id, full_name: p.full_name, title: p.title, department: p.department} as person,
-  collect(DISTINCT {id: c.id, name: c.name, domain: c.domain, industry: c.industry}) as companies,
-  collect(DISTINCT e.address) as emails
+WHERE p.department = $department AND {after}
+WITH p ORDER BY {order} LIMIT $limit
+RETURN
+  {{id: p.id, full_name: p.full_name, title: p.title, department: p.department}} as person,
+  COLLECT {{ MATCH (p)-[:WORKS_AT]->(c:Company) RETURN DISTINCT {{id: c.id, name: c.name, domain: c.domain, industry: c.industry}} }} as companies,
+  COLLECT {{ MATCH (p)-[:HAS_EMAIL]->(e:Email) RETURN DISTINCT e.address }} as emails,
+  [p.full_name, p.id] as _key
+ORDER BY {order}
 """
 
-INDUSTRY_STATS = """
-MATCH (c:Company)
-RETURN 
-  c.industry as industry,
-  count(c) as company_count,
-  collect({name: c.name, domain: c.domain, location: c.location}) as companies
-ORDER BY company_count DESC
+# Hybrid search expansion: every company hit in one round-trip.
+# Each company gets its projection plus at most $neighbor_limit neighborhood paths.
+HYBRID_EXPAND = """
+UNWIND $domains AS domain
+MATCH (c:Company {domain: domain})
+CALL {
+  WITH c
+  CALL apoc.path.expand(c, null, null, 1, $depth) YIELD path
+  WITH path LIMIT $neighbor_limit
+  RETURN collect({nodes: nodes(path), rels: relationships(path)}) AS neighbors
+}
+RETURN
+  domain,
+  {id: c.id, name: c.name, domain: c.domain, industry: c.industry, employee_count: c.employee_count, location: c.location} as company,
+  neighbors
 """
@@ -5,23 +5,21 @@ from functools import lru_cache
 from typing import TypeAlias
 
 from atlas.services.query_api.config import settings
-from neo4j import GraphDatabase, Session
+from atlas.services.query_api.embedding_service import EmbeddingService
+from atlas.services.query_api.neo4j_pool import get_manager
+from neo4j import Session
 from qdrant_client import QdrantClient
 
 # ---------------------------
 # Neo4j
 # ---------------------------
 
-_driver = GraphDatabase.driver(
-    settings.NEO4J_URI, auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD)
-)
-
 
 def neo4j_session() -> Session:
     """
-    FastAPI dependency that yields a Neo4j session and closes it after the request.
+    FastAPI dependency that yields a session from the shared pool and returns it after the request.
     """
-    with _driver.session() as s:
+    with get_manager().session() as s:
         yield s
 
 
@@ -52,6 +50,7 @@ def qdrant_client() -> QdrantClient:
 
 class _BaseEmbedder:
     embedding_dimension: int | None = None
+    model_name: str = ""
 
     def embed(self, texts: list[str]) -> list[list[float]]:
         raise NotImplementedError
@@ -64,6 +63,7 @@ class _OpenAIEmbedder(_BaseEmbedder):
 
         self._client = OpenAI(api_key=api_key)
         self._model = model
+        self.model_name = f"openai:{model}"
 
     def embed(self, texts: list[str]) -> list[list[float]]:
         resp = self._client.embeddings.create(model=self._model, input=texts)
@@ -79,6 +79,7 @@ class _FastEmbedder(_BaseEmbedder):
 
         self._emb = TextEmbedding(model_name=model_name)
         self.embedding_dimension = self._emb.embedding_dimension
+        self.model_name = f"fastembed:{model_name}"
 
     def embed(self, texts: list[str]) -> list[list[float]]:
         # fastembed yields numpy arrays; convert to lists
@@ -104,6 +105,15 @@ def _build_embedder() -> _BaseEmbedder:
     return _FastEmbedder(model_name=settings.EMBED_MODEL)
 
 
+@lru_cache(maxsize=1)
+def embedding_service() -> EmbeddingService:
+    """
+    Process-wide cached + micro-batched front for the embedder.
+    """
+    base = _build_embedder()
+    return EmbeddingService(base, model=base.model_name)
+
+
 EmbedFn: TypeAlias = Callable[[list[str]], list[list[float]]]
 
 
@@ -111,5 +121,7 @@ def embedder() -> EmbedFn:
     """
     FastAPI dependency that returns a callable:
       embedder(texts: List[str]) -> List[List[float]]
+    Query embeddings are served from the LRU and misses are batched with
+    concurrent requests (see embedding_service).
     """
-    return _build_embedder().embed
+    return embedding_service().embed
@@ -0,0 +1,363 @@
+"""
+Query-embedding service for the semantic search endpoints.
+
+Layers in front of the configured embedder (OpenAI → FastEmbed fallback):
+
+1) A bounded LRU keyed by (model, normalized text: NFKC, collapsed
+   whitespace, case kept like the embedding store). The text sent to the
+   model is the query as written, never a rewritten key. Popular queries are
+   embedded once per process; the cache is optionally snapshotted to disk on
+   shutdown and reloaded on startup so it survives restarts.
+2) An asyncio micro-batcher. Concurrent single-query misses arriving within
+   EMBED_BATCH_WINDOW_MS are merged into one `embed(texts)` call (one OpenAI
+   round-trip / one batched FastEmbed inference) instead of N calls of one.
+3) The shared on-disk embedding store (atlas.services.embedding_store), which
+   the vector ETL and the other producers also fill; only its misses reach
+   the model.
+
+`embed(texts)` is synchronous so it can be used from threadpool handlers and
+cache loaders; misses are handed to the batcher running on the app event loop.
+Without a running batcher (scripts, tests, before startup) misses are embedded
+directly.
+
+Env:
+  EMBED_CACHE_MAX_ITEMS=10000    # LRU capacity (queries)
+  EMBED_CACHE_PATH=              # optional snapshot file (JSON), e.g. /data/query_embeddings.json
+  EMBED_BATCH_WINDOW_MS=5        # how long the first miss waits for company
+  EMBED_BATCH_MAX_SIZE=64        # flush early once this many texts are pending
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+import orjson
+
+from atlas.services.embedding_store import embed_through_store, normalize, shared_store
+
+CACHE_MAX_ITEMS = int(os.getenv("EMBED_CACHE_MAX_ITEMS", "10000"))
+CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "")
+BATCH_WINDOW_MS = float(os.getenv("EMBED_BATCH_WINDOW_MS", "5"))
+BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "64"))
+_SUBMIT_TIMEOUT = 60.0
+
+
+# ---------------------------
+# Metrics
+# ---------------------------
+
+
+@dataclass
+class EmbeddingStats:
+    hits: int = 0
+    misses: int = 0
+    batches: int = 0
+    batched_texts: int = 0
+    max_batch_size: int = 0
+    embed_seconds: float = 0.0
+    errors: int = 0
+    batch_sizes: dict[int, int] = field(default_factory=dict)
+
+    def record_batch(self, size: int, seconds: float) -> None:
+        self.batches += 1
+        self.batched_texts += size
+        self.max_batch_size = max(self.max_batch_size, size)
+        self.embed_seconds += seconds
+        bucket = 1 << (size - 1).bit_length()  # 1, 2, 4, 8, ...
+        self.batch_sizes[bucket] = self.batch_sizes.get(bucket, 0) + 1
+
+    def snapshot(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_texts / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "batch_size_histogram": {f"<={k}": v for k, v in sorted(self.batch_sizes.items())},
+            "avg_embed_ms": round(1000 * self.embed_seconds / self.batches, 2) if self.batches else 0.0,
+            "errors": self.errors,
+        }
+
+
+# ---------------------------
+# LRU
+# ---------------------------
+
+
+class EmbeddingLRU:
+    """
+    Thread-safe bounded LRU of (model, normalized text) -> vector.
+    """
+
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._data: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, model: str, texts: Iterable[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            for text in texts:
+                vec = self._data.get((model, text))
+                if vec is not None:
+                    self._data.move_to_end((model, text))
+                    found[text] = vec
+        return found
+
+    def put_many(self, model: str, items: dict[str, list[float]]) -> None:
+        with self._lock:
+            for text, vec in items.items():
+                self._data[(model, text)] = vec
+                self._data.move_to_end((model, text))
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def dump(self, path: str) -> int:
+        with self._lock:
+            rows = [[m, t, v] for (m, t), v in self._data.items()]
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(rows))
+        os.replace(tmp, path)
+        return len(rows)
+
+    def load(self, path: str) -> int:
+        with open(path, "rb") as f:
+            rows = orjson.loads(f.read())
+        with self._lock:
+            # Oldest first so the most recently used entries stay hottest
+            for model, text, vec in rows[-self.max_items :]:
+                self._data[(model, text)] = vec
+        return len(rows)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ---------------------------
+# Micro-batcher
+# ---------------------------
+
+
+class MicroBatcher:
+    """
+    Collects texts submitted by concurrent requests and embeds them in one call.
+
+    The first pending text arms a timer of `window_ms`; the batch is flushed when
+    the timer fires or when `max_size` texts are pending, whichever comes first.
+    The blocking embed call runs in the default executor so the loop keeps
+    accepting new texts for the next batch meanwhile.
+    """
+
+    def __init__(self, embed_fn, window_ms: float, max_size: int, stats: EmbeddingStats):
+        self._embed_fn = embed_fn
+        self._window = window_ms / 1000
+        self._max_size = max_size
+        self._stats = stats
+        self._pending: dict[str, list[asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            self._flush()
+        self.loop = None
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            fut = loop.create_future()
+            self._pending.setdefault(text, []).append(fut)
+            futures.append(fut)
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        return list(await asyncio.gather(*futures))
+
+    def submit(self, texts: list[str]) -> list[list[float]]:
+        """
+        Blocking entry point for worker threads: enqueue on the loop and wait.
+        """
+        fut: Future = asyncio.run_coroutine_threadsafe(self.embed_many(texts), self.loop)
+        return fut.result(timeout=_SUBMIT_TIMEOUT)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            asyncio.ensure_future(self._run(batch), loop=self.loop)
+
+    async def _run(self, batch: dict[str, list[asyncio.Future]]) -> None:
+        texts = list(batch)
+        t0 = time.perf_counter()
+        try:
+            vectors = await asyncio.get_running_loop().run_in_executor(None, self._embed_fn, texts)
+        except Exception as e:
+            self._stats.errors += 1
+            for futures in batch.values():
+                for fut in futures:
+                    if not fut.done():
+                        fut.set_exception(e)
+            return
+        self._stats.record_batch(len(texts), time.perf_counter() - t0)
+        for text, vec in zip(texts, vectors, strict=True):
+            for fut in batch[text]:
+                if not fut.done():
+                    fut.set_result(vec)
+
+
+# ---------------------------
+# Service
+# ---------------------------
+
+
+class EmbeddingService:
+    """
+    Cached, micro-batched front for an embedder exposing `embed(texts)`.
+    """
+
+    def __init__(
+        self,
+        embedder,
+        model: str,
+        max_items: int = CACHE_MAX_ITEMS,
+        window_ms: float = BATCH_WINDOW_MS,
+        max_batch: int = BATCH_MAX_SIZE,
+    ):
+        self.model = model
+        self.metrics = EmbeddingStats()
+        self.cache = EmbeddingLRU(max_items)
+        self._embedder = embedder
+        self._batcher = MicroBatcher(self._embed_raw, window_ms, max_batch, self.metrics)
+
+    def _embed_raw(self, texts: list[str]) -> list[list[float]]:
+        return embed_through_store(self.model, texts, self._embedder.embed)
+
+    # ---- lifecycle ----
+
+    def start(self, loop: asyncio.AbstractEventLoop, snapshot_path: str = CACHE_PATH) -> None:
+        self._batcher.start(loop)
+        if snapshot_path and os.path.exists(snapshot_path):
+            try:
+                n = self.cache.load(snapshot_path)
+                print(f"[embed] loaded {n} cached query embeddings from {snapshot_path}")
+            except Exception as e:
+                print(f"[embed] could not load {snapshot_path} ({e}); starting cold")
+
+    def stop(self, snapshot_path: str = CACHE_PATH) -> None:
+        self._batcher.stop()
+        if snapshot_path:
+            try:
+                n = self.cache.dump(snapshot_path)
+                print(f"[embed] saved {n} cached query embeddings to {snapshot_path}")
+            except Exception as e:
+                print(f"[embed] could not save {snapshot_path} ({e})")
+
+    # ---- public API ----
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """
+        Drop-in replacement for `embedder.embed`: cached, and batched with
+        concurrent callers when the service is running on an event loop.
+        """
+        keys, originals = _keys(texts)
+        found = self.cache.get_many(self.model, keys)
+        missing = list(dict.fromkeys(k for k in keys if k not in found))
+        hits = sum(1 for k in keys if k in found)
+        self.metrics.hits += hits
+        self.metrics.misses += len(keys) - hits
+
+        if missing:
+            vectors = self._embed_missing([originals[k] for k in missing])
+            computed = dict(zip(missing, vectors, strict=True))
+            self.cache.put_many(self.model, computed)
+            found.update(computed)
+        return [found[k] for k in keys]
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        """
+        Async variant for `async def` handlers running on the batcher's loop.
+        """
+        keys, originals = _keys(texts)
+        found = self.cache.get_many(self.model, keys)
+        missing = list(dict.fromkeys(k for k in keys if k not in found))
+        hits = sum(1 for k in keys if k in found)
+        self.metrics.hits += hits
+        self.metrics.misses += len(keys) - hits
+
+        if missing:
+            to_embed = [originals[k] for k in missing]
+            if self._batcher.loop is not None:
+                vectors = await self._batcher.embed_many(to_embed)
+            else:
+                vectors = await asyncio.to_thread(self._embed_direct, to_embed)
+            computed = dict(zip(missing, vectors, strict=True))
+            self.cache.put_many(self.model, computed)
+            found.update(computed)
+        return [found[k] for k in keys]
+
+    def stats(self) -> dict:
+        store = shared_store()
+        return {
+            "model": self.model,
+            "cache_items": len(self.cache),
+            "cache_max_items": self.cache.max_items,
+            "batching": self._batcher.loop is not None,
+            **self.metrics.snapshot(),
+            "store": store.stats() if store else None,
+        }
+
+    # ---- internals ----
+
+    def _embed_missing(self, texts: list[str]) -> list[list[float]]:
+        loop = self._batcher.loop
+        if loop is None or not loop.is_running() or _on_loop(loop):
+            return self._embed_direct(texts)
+        return self._batcher.submit(texts)
+
+    def _embed_direct(self, texts: list[str]) -> list[list[float]]:
+        t0 = time.perf_counter()
+        try:
+            vectors = self._embed_raw(texts)
+        except Exception:
+            self.metrics.errors += 1
+            raise
+        self.metrics.record_batch(len(texts), time.perf_counter() - t0)
+        return vectors
+
+
+def _keys(texts: list[str]) -> tuple[list[str], dict[str, str]]:
+    """
+    Cache keys for `texts`, and for each key the text (as written) to embed on a miss.
+    """
+    keys = [normalize(t) for t in texts]
+    originals: dict[str, str] = {}
+    for key, text in zip(keys, texts, strict=True):
+        originals.setdefault(key, text)
+    return keys, originals
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
@@ -0,0 +1,81 @@
+"""
+Async Neo4j data-access helpers for `async def` endpoints.
+
+Every call borrows its own session from the shared async pool, so independent
+queries can be issued concurrently with `read_many` instead of serially on one
+session (a single session only runs one query at a time).
+
+Usage:
+    companies, total = await read_many(
+        (COMPANIES_QUERY, {"limit": 50}),
+        ("MATCH (c:Company) RETURN count(c) AS total", None),
+    )
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+from atlas.services.query_api.neo4j_pool import get_async_manager
+from neo4j import READ_ACCESS, AsyncManagedTransaction, Record
+
+Query = tuple[str, dict[str, Any] | None]
+
+
+async def _collect(tx: AsyncManagedTransaction, query: str, params: dict[str, Any]) -> list[Record]:
+    result = await tx.run(query, params)
+    return [record async for record in result]
+
+
+async def read_all(query: str, params: dict[str, Any] | None = None) -> list[Record]:
+    """
+    Run a read query in a managed (retried, read-routed) transaction and return all records.
+    """
+    async with get_async_manager().session() as s:
+        return await s.execute_read(_collect, query, params or {})
+
+
+async def read_one(query: str, params: dict[str, Any] | None = None) -> Record | None:
+    records = await read_all(query, params)
+    return records[0] if records else None
+
+
+async def read_many(*queries: Query) -> list[list[Record]]:
+    """
+    Run independent read queries concurrently, one pooled session each.
+    Results are returned in the same order as the queries.
+    """
+    return list(await asyncio.gather(*(read_all(q, p) for q, p in queries)))
+
+
+async def stream(query: str, params: dict[str, Any] | None = None, fetch_size: int = 500) -> AsyncIterator[Record]:
+    """
+    Yield records as the server streams them (fetched `fetch_size` at a time)
+    instead of collecting the whole result. Not retried: once rows have been
+    handed to the caller a transparent replay would duplicate them.
+    """
+    async with get_async_manager().session(default_access_mode=READ_ACCESS, fetch_size=fetch_size) as s:
+        result = await s.run(query, params or {})
+        async for record in result:
+            yield record
+
+
+async def write(query: str, params: dict[str, Any] | None = None) -> list[Record]:
+    async with get_async_manager().session() as s:
+        return await s.execute_write(_collect, query, params or {})
+
+
+async def write_many(*queries: Query) -> None:
+    """
+    Run dependent write statements in order inside one transaction.
+    """
+
+    async def _work(tx: AsyncManagedTransaction) -> None:
+        for q, p in queries:
+            result = await tx.run(q, p or {})
+            await result.consume()
+
+    async with get_async_manager().session() as s:
+        await s.execute_write(_work)
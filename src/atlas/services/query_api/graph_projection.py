@@ -0,0 +1,452 @@
+"""
+In-process, read-only projection of the business graph.
+
+The Company/Person/Email/Deal/Signal subgraph only changes when an ETL batch
+commits, yet /neighbors, the hybrid expansion and company detail reads pay a
+Bolt round-trip plus Cypher planning on every miss. With GRAPH_PROJECTION=1 the
+API keeps a compact copy in memory and serves those reads directly:
+
+  - node keys (`id`, or `address` for Email) are interned to dense ints;
+  - adjacency is CSR: numpy `offsets` (n+1) into parallel `targets`,
+    `rel_types` and `outgoing` arrays, both directions stored, so the
+    neighbors of node i are targets[offsets[i]:offsets[i+1]];
+  - node properties (and label lists) are kept once per node for the
+    response payloads, which have the same shape as the Cypher fallback's.
+
+The projection is immutable. ProjectionHolder builds a new one in a background
+thread after each ETL batch (it listens on the cache invalidation channel),
+then swaps the reference atomically; readers keep the instance they started
+with. Writes outside the ETL publish no invalidation, so the holder also
+rebuilds every GRAPH_PROJECTION_MAX_AGE / 2 seconds and stops serving a
+projection older than GRAPH_PROJECTION_MAX_AGE. Until the first build
+finishes, or while the projection is stale, callers fall back to Cypher.
+
+Env:
+  GRAPH_PROJECTION=0              # 1 to enable
+  GRAPH_PROJECTION_DEBOUNCE=5     # seconds to coalesce rebuilds after a burst of batches
+  GRAPH_PROJECTION_MAX_AGE=60     # seconds a projection may serve reads (0: until the next batch)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from atlas.services.query_api.neighborhood import DEFAULT_MAX_NODES, fanout_cap
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ENABLED = os.getenv("GRAPH_PROJECTION", "0") == "1"
+DEBOUNCE_SECONDS = float(os.getenv("GRAPH_PROJECTION_DEBOUNCE", "5"))
+MAX_AGE_SECONDS = float(os.getenv("GRAPH_PROJECTION_MAX_AGE", "60"))
+LABELS = ("Company", "Person", "Email", "Deal", "Signal")
+
+_NODES_QUERY = """
+MATCH (n) WHERE any(l IN labels(n) WHERE l IN $labels)
+RETURN elementId(n) AS eid, [l IN labels(n) WHERE l IN $labels][0] AS label, labels(n) AS all_labels,
+       properties(n) AS props
+"""
+
+_RELS_QUERY = """
+MATCH (a)-[r]->(b)
+WHERE any(l IN labels(a) WHERE l IN $labels) AND any(l IN labels(b) WHERE l IN $labels)
+RETURN elementId(a) AS src, type(r) AS type, elementId(b) AS dst
+"""
+
+
+def _node_key(props: dict, eid: str) -> str:
+    return props.get("id") or props.get("address") or eid
+
+
+def _nulls_last(value):
+    # Cypher sorts nulls last ascending; tuples keep None out of comparisons
+    return (value is None, value)
+
+
+@dataclass(frozen=True)
+class GraphProjection:
+    keys: list[str]
+    index: dict[str, int]
+    by_domain: dict[str, int]  # Company.domain -> node
+    labels: np.ndarray  # int8 label code per node
+    label_names: tuple[str, ...]
+    node_labels: list[tuple[str, ...]]  # every label of each node, sorted (tuples shared)
+    props: list[dict]
+    offsets: np.ndarray  # int64, len n+1
+    targets: np.ndarray  # int32
+    rel_types: np.ndarray  # int16 code per adjacency entry
+    outgoing: np.ndarray  # bool: stored edge is node -> target
+    type_names: tuple[str, ...]
+    built_at: float  # wall time the build started: the data is at least this fresh
+    build_seconds: float
+
+    @property
+    def node_count(self) -> int:
+        return len(self.keys)
+
+    @property
+    def relationship_count(self) -> int:
+        return len(self.targets) // 2
+
+    def _payload(self, i: int) -> dict:
+        # neighborhood._node: properties plus every label, sorted
+        return {**self.props[i], "labels": list(self.node_labels[i])}
+
+    def lookup(self, key: str, label: str | None = None) -> int | None:
+        i = self.index.get(key)
+        if i is None or (label is not None and self.label_names[self.labels[i]] != label):
+            return None
+        return i
+
+    def degree(self, key: str) -> dict[str, int] | None:
+        """
+        Relationship counts by type for one node (both directions), O(degree) in numpy.
+        """
+        i = self.index.get(key)
+        if i is None:
+            return None
+        import numpy as np
+
+        codes = self.rel_types[self.offsets[i] : self.offsets[i + 1]]
+        counts = np.bincount(codes, minlength=len(self.type_names))
+        return {self.type_names[t]: int(c) for t, c in enumerate(counts) if c}
+
+    def related(self, key: str, rel_type: str, label: str | None = None) -> list[dict]:
+        """
+        Property payloads of the nodes linked to `key` by `rel_type` (either direction).
+        """
+        i = self.index.get(key)
+        if i is None or rel_type not in self.type_names:
+            return []
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        mask = self.rel_types[lo:hi] == self.type_names.index(rel_type)
+        out = []
+        for j in self.targets[lo:hi][mask]:
+            if label is None or self.label_names[self.labels[j]] == label:
+                out.append(dict(self.props[j]))
+        return out
+
+    def company_detail(self, company_id: str) -> dict | None:
+        """
+        get_company's payload (contacts, deals, latest 10 signals) in the same order
+        as the Cypher version. None if the company is not in the projection.
+        """
+        if self.lookup(company_id, "Company") is None:
+            return None
+        company = dict(self.props[self.index[company_id]])
+        company["contacts"] = sorted(
+            self.related(company_id, "WORKS_AT", "Person"),
+            key=lambda p: (_nulls_last(p.get("seniority")), _nulls_last(p.get("full_name"))),
+        )
+        company["deals"] = sorted(
+            self.related(company_id, "BELONGS_TO", "Deal"),
+            key=lambda d: _nulls_last(d.get("created_at")),
+            reverse=True,
+        )
+        company["signals"] = sorted(
+            self.related(company_id, "ABOUT", "Signal"),
+            key=lambda s: _nulls_last(s.get("detected_at")),
+            reverse=True,
+        )[:10]
+        return company
+
+    def paths(self, key: str, depth: int, limit: int) -> list[dict]:
+        """
+        Up to `limit` shortest paths (1..depth hops) from `key`, breadth-first:
+        the projection's counterpart of apoc.path.expand in HYBRID_EXPAND, in the
+        shape Record.data() gives it: nodes as property dicts, relationships as
+        (start properties, type, end properties).
+        """
+        start = self.index.get(key)
+        if start is None:
+            return []
+        parent: dict[int, tuple[int, int]] = {start: (-1, -1)}  # node -> (previous node, adjacency pos)
+        out: list[dict] = []
+        frontier = [start]
+        for _ in range(depth):
+            next_frontier = []
+            for src in frontier:
+                for pos in range(int(self.offsets[src]), int(self.offsets[src + 1])):
+                    dst = int(self.targets[pos])
+                    if dst in parent:
+                        continue
+                    parent[dst] = (src, pos)
+                    next_frontier.append(dst)
+                    out.append(self._path_to(dst, parent))
+                    if len(out) >= limit:
+                        return out
+            frontier = next_frontier
+        return out
+
+    def _path_to(self, node: int, parent: dict[int, tuple[int, int]]) -> dict:
+        nodes, rels = [], []
+        while True:
+            nodes.append(dict(self.props[node]))
+            prev, pos = parent[node]
+            if prev < 0:
+                break
+            start, end = (prev, node) if self.outgoing[pos] else (node, prev)
+            rels.append((dict(self.props[start]), self.type_names[self.rel_types[pos]], dict(self.props[end])))
+            node = prev
+        return {"nodes": nodes[::-1], "rels": rels[::-1]}
+
+    def neighborhood(
+        self,
+        key: str,
+        depth: int = 2,
+        label: str | None = None,
+        max_nodes: int = DEFAULT_MAX_NODES,
+    ) -> dict | None:
+        """
+        Same contract and caps as neighborhood.expand_neighborhood, served from
+        the CSR arrays. None if the anchor is not in the projection.
+        """
+        anchor = self.lookup(key, label)
+        if anchor is None:
+            return None
+
+        seen = {anchor}
+        nodes = [anchor]
+        rels: dict[tuple[int, int, int], dict] = {}
+        capped: set[str] = set()
+        truncated = False
+        depth_reached = 0
+        frontier = [anchor]
+
+        for hop in range(1, depth + 1):
+            if not frontier:
+                break
+            next_frontier = []
+            budget_spent = False
+            for src in frontier:
+                lo, hi = int(self.offsets[src]), int(self.offsets[src + 1])
+                per_type: dict[str, int] = {}
+                for pos in range(lo, hi):
+                    type_name = self.type_names[self.rel_types[pos]]
+                    taken = per_type.get(type_name, 0) + 1
+                    per_type[type_name] = taken
+                    if taken > fanout_cap(type_name):
+                        truncated = True
+                        capped.add(type_name)
+                        continue
+                    dst = int(self.targets[pos])
+                    if dst not in seen:
+                        if len(nodes) >= max_nodes:
+                            truncated = budget_spent = True
+                            break
+                        seen.add(dst)
+                        nodes.append(dst)
+                        next_frontier.append(dst)
+                    start, end = (src, dst) if self.outgoing[pos] else (dst, src)
+                    rels.setdefault(
+                        (start, int(self.rel_types[pos]), end),
+                        {"type": type_name, "start": self.keys[start], "end": self.keys[end]},
+                    )
+                if budget_spent:
+                    break
+            depth_reached = hop
+            if budget_spent:
+                break
+            frontier = next_frontier
+
+        return {
+            "anchor": self._payload(anchor),
+            "nodes": [self._payload(i) for i in nodes],
+            "relationships": list(rels.values()),
+            "depth_reached": depth_reached,
+            "truncated": truncated,
+            "capped_types": sorted(capped),
+        }
+
+
+def build_projection(session, labels: tuple[str, ...] = LABELS) -> GraphProjection:
+    """
+    Stream nodes and relationships from Neo4j and pack them into CSR arrays.
+    """
+    import numpy as np
+
+    started_at = time.time()
+    t0 = time.perf_counter()
+    label_names = tuple(labels)
+    keys: list[str] = []
+    props: list[dict] = []
+    label_codes: list[int] = []
+    label_sets: dict[tuple[str, ...], tuple[str, ...]] = {}
+    node_labels: list[tuple[str, ...]] = []
+    by_eid: dict[str, int] = {}
+    for rec in session.run(_NODES_QUERY, labels=list(labels)):
+        node_props = rec["props"]
+        by_eid[rec["eid"]] = len(keys)
+        keys.append(_node_key(node_props, rec["eid"]))
+        props.append(node_props)
+        label_codes.append(label_names.index(rec["label"]))
+        all_labels = tuple(sorted(rec["all_labels"]))
+        node_labels.append(label_sets.setdefault(all_labels, all_labels))
+
+    type_names: list[str] = []
+    type_codes: dict[str, int] = {}
+    src: list[int] = []
+    dst: list[int] = []
+    rtype: list[int] = []
+    for rec in session.run(_RELS_QUERY, labels=list(labels)):
+        a, b = by_eid.get(rec["src"]), by_eid.get(rec["dst"])
+        if a is None or b is None:
+            continue
+        code = type_codes.get(rec["type"])
+        if code is None:
+            code = type_codes[rec["type"]] = len(type_names)
+            type_names.append(rec["type"])
+        src.append(a)
+        dst.append(b)
+        rtype.append(code)
+
+    n = len(keys)
+    src_arr = np.asarray(src, dtype=np.int32)
+    dst_arr = np.asarray(dst, dtype=np.int32)
+    type_arr = np.asarray(rtype, dtype=np.int16)
+    # Both directions: (src -> dst, outgoing) and (dst -> src, incoming)
+    rows = np.concatenate([src_arr, dst_arr])
+    cols = np.concatenate([dst_arr, src_arr])
+    types = np.concatenate([type_arr, type_arr])
+    outgoing = np.concatenate([np.ones(len(src_arr), dtype=bool), np.zeros(len(src_arr), dtype=bool)])
+
+    order = np.argsort(rows, kind="stable")
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+
+    index = {k: i for i, k in enumerate(keys)}
+    company = label_names.index("Company") if "Company" in label_names else -1
+    by_domain = {
+        props[i]["domain"]: i for i, code in enumerate(label_codes) if code == company and props[i].get("domain")
+    }
+    return GraphProjection(
+        keys=keys,
+        index=index,
+        by_domain=by_domain,
+        labels=np.asarray(label_codes, dtype=np.int8),
+        label_names=label_names,
+        node_labels=node_labels,
+        props=props,
+        offsets=offsets,
+        targets=cols[order],
+        rel_types=types[order],
+        outgoing=outgoing[order],
+        type_names=tuple(type_names),
+        built_at=started_at,
+        build_seconds=time.perf_counter() - t0,
+    )
+
+
+class ProjectionHolder:
+    """
+    Owns the current projection and rebuilds it off the request path.
+    """
+
+    def __init__(self, enabled: bool = ENABLED, debounce: float = DEBOUNCE_SECONDS, max_age: float = MAX_AGE_SECONDS):
+        self.enabled = enabled
+        self.debounce = debounce
+        self.max_age = max_age
+        self.current: GraphProjection | None = None
+        self.builds = 0
+        self.last_error: str | None = None
+        # Bumped by every invalidation; the projection only serves reads while it
+        # was built after the latest one, so cached responses never pin stale data.
+        self._generation = 0
+        self._built_generation = -1
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._dirty.set()  # initial build
+        self._thread = threading.Thread(target=self._run, name="graph-projection", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._dirty.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def invalidate(self, message: dict | None = None) -> None:
+        """
+        Request a rebuild (e.g. an ETL batch committed). Cheap; safe from any thread.
+        Reads fall back to Cypher until the rebuild lands.
+        """
+        self._generation += 1
+        self._dirty.set()
+
+    def get(self) -> GraphProjection | None:
+        """
+        The current projection if it reflects the latest batch and is younger
+        than max_age, else None.
+        """
+        p = self.current
+        if not self.enabled or p is None or self._built_generation != self._generation:
+            return None
+        if self.max_age and time.time() - p.built_at > self.max_age:
+            return None
+        return p
+
+    def rebuild(self) -> GraphProjection:
+        from atlas.services.query_api.neo4j_pool import get_manager
+
+        generation = self._generation
+        with get_manager().session() as s:
+            projection = build_projection(s)
+        self.current = projection  # atomic swap; readers keep the old instance
+        self._built_generation = generation
+        self.builds += 1
+        print(
+            f"[projection] {projection.node_count} nodes, {projection.relationship_count} rels "
+            f"built in {projection.build_seconds:.2f}s"
+        )
+        return projection
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Periodic rebuild at half the max age, so writes that publish no
+            # invalidation show up and get() never has to refuse a projection
+            refresh = self.max_age / 2 if self.max_age and self.builds else None
+            if self._dirty.wait(refresh):
+                if self._stop.is_set():
+                    return
+                # Coalesce a burst of batches into one rebuild
+                self._stop.wait(self.debounce if self.builds else 0)
+            if self._stop.is_set():
+                return
+            self._dirty.clear()
+            try:
+                self.rebuild()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"[projection] rebuild failed ({e}); serving previous projection")
+                self._stop.wait(30)
+                self._dirty.set()
+
+    def stats(self) -> dict:
+        p = self.current
+        return {
+            "enabled": self.enabled,
+            "ready": self.get() is not None,
+            "builds": self.builds,
+            "last_error": self.last_error,
+            "nodes": p.node_count if p else 0,
+            "relationships": p.relationship_count if p else 0,
+            "age_seconds": round(time.time() - p.built_at, 1) if p else None,
+            "max_age_seconds": self.max_age,
+            "build_seconds": round(p.build_seconds, 3) if p else None,
+            "bytes": int(p.offsets.nbytes + p.targets.nbytes + p.rel_types.nbytes + p.outgoing.nbytes) if p else 0,
+        }
+
+
+projection_holder = ProjectionHolder()
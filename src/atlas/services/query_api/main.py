@@ -1,26 +1,84 @@
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Callable
+from contextlib import asynccontextmanager
 from typing import Annotated
 
-from atlas.services.query_api.cache import cache_get, cache_set, key_of
+from atlas.connectors.registry import ConnectorRegistry
+from atlas.services.query_api import cache_tags
+from atlas.services.query_api.analytics import INDUSTRY_STATS, materializer, snapshot
+from atlas.services.query_api.cache import response_cache
+from atlas.services.query_api.cache_tags import TAGGED_TTL
 from atlas.services.query_api.cypher_queries import (
     COMPANIES_BY_INDUSTRY,
     COMPANIES_BY_LOCATION,
     COMPANY_BY_DOMAIN,
-    INDUSTRY_STATS,
-    NEIGHBORS,
+    COMPANY_KEYSET_SORT,
+    HYBRID_EXPAND,
     PEOPLE_BY_DEPARTMENT,
-    PEOPLE_BY_NAME,
+    PERSON_KEYSET_SORT,
 )
-from atlas.services.query_api.deps import embedder, neo4j_session, qdrant_client
-from fastapi import Depends, FastAPI, Query
+from atlas.services.query_api.deps import embedder, embedding_service, qdrant_client
+from atlas.services.query_api.graph_dal import read_all
+from atlas.services.query_api.graph_projection import projection_holder
+from atlas.services.query_api.neighborhood import DEFAULT_MAX_NODES, expand_neighborhood
+from atlas.services.query_api.neo4j_pool import (
+    close_pool,
+    get_async_manager,
+    get_manager,
+    open_pool,
+)
+from atlas.services.query_api.paging import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    Keyset,
+    decode_cursor,
+    ndjson_response,
+    split_page,
+)
+from atlas.services.query_api.search import PEOPLE_SEARCH, people_params
+from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from neo4j import Session
+from fastapi.responses import JSONResponse
 from qdrant_client import QdrantClient
 from qdrant_client.models import FieldCondition, Filter, MatchValue
 
-app = FastAPI(title="Marketplace Intelligence API", version="0.7.0")  # bumped for compliance agent
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One Neo4j driver/pool for the whole process, shared by every router
+    await open_pool()
+    # Drop L1 entries when an ETL batch invalidates their tags
+    response_cache.start_invalidation_listener()
+    # Query embeddings: LRU + micro-batching of concurrent misses on this loop
+    try:
+        embedding_service().start(asyncio.get_running_loop())
+    except Exception as e:
+        print(f"[embed] embedder unavailable at startup ({e}); semantic search will retry lazily")
+    # Periodic full refresh of the analytics snapshots (ETL batches refresh incrementally)
+    materializer.start()
+    # Optional in-memory graph projection, rebuilt after each ETL batch
+    response_cache.on_invalidation(projection_holder.invalidate)
+    projection_holder.start()
+    # Long-lived connector instances (one HTTP pool per connector + credentials)
+    ConnectorRegistry.open_pool()
+    try:
+        yield
+    finally:
+        await ConnectorRegistry.close_pool()
+        projection_holder.stop()
+        materializer.stop()
+        if embedding_service.cache_info().currsize:
+            embedding_service().stop()
+        response_cache.stop_invalidation_listener()
+        await close_pool()
+
+
+app = FastAPI(
+    title="Marketplace Intelligence API", version="0.7.0", lifespan=lifespan
+)  # bumped for compliance agent
 
 # Add CORS middleware
 app.add_middleware(
@@ -64,87 +122,250 @@ def healthz():
     return {"ok": True}
 
 
+@app.get("/healthz/neo4j")
+async def neo4j_pool_health():
+    """Shared Neo4j pool: config, liveness and session usage counters"""
+    manager = get_manager()
+    manager.check_liveness()
+    return {**manager.stats(), "async": get_async_manager().stats()}
+
+
+def _read(query: str, **params) -> list[dict]:
+    """
+    Run a read on its own pooled session. Cache loaders use this instead of the
+    request-scoped session because stale-while-revalidate may call them from a
+    background refresh after the request has finished.
+    """
+    with get_manager().session() as s:
+        return s.run(query, **params).data()
+
+
+@app.get("/healthz/cache")
+def cache_health():
+    """Response cache: L1 size and per-prefix hit/miss/latency counters"""
+    return response_cache.stats()
+
+
+@app.get("/healthz/analytics")
+def analytics_health():
+    """Analytics snapshots: age, compute time and what refreshed them last"""
+    return materializer.stats()
+
+
+@app.get("/healthz/projection")
+def projection_health():
+    """In-memory graph projection: size, age and rebuild count"""
+    return projection_holder.stats()
+
+
+@app.get("/healthz/embeddings")
+def embedding_health():
+    """Query embeddings: cache hit ratio and micro-batch size counters"""
+    return embedding_service().stats()
+
+
+@app.get("/healthz/connectors")
+def connector_pool_health():
+    """Connector instance pool: reuse, in-flight calls and HTTP connections"""
+    return ConnectorRegistry.pool_stats()
+
+
+# Graph responses are tagged with the entities they show and invalidated by the
+# ETL when a batch touches them, so they can stay fresh for hours.
+
+
 @app.get("/companies")
-def company_by_domain(domain: str, s: Annotated[Session, Depends(neo4j_session)]):
-    key = key_of("companies", domain=domain)
-    if v := cache_get(key):
-        return v
-    res = s.run(COMPANY_BY_DOMAIN, domain=domain).single()
-    if res:
-        out = {"company": res["company"], "people": res["people"], "emails": res["emails"]}
-        cache_set(key, out, ttl=60)
-        return out
-    return {"company": None, "people": [], "emails": []}
+def company_by_domain(domain: str):
+    def load():
+        rows = _read(COMPANY_BY_DOMAIN, domain=domain)
+        if rows:
+            res = rows[0]
+            return {"company": res["company"], "people": res["people"], "emails": res["emails"]}
+        return {"company": None, "people": [], "emails": []}
+
+    return response_cache.get_or_compute(
+        "companies",
+        {"domain": domain},
+        load,
+        ttl=TAGGED_TTL,
+        tags=lambda out: {cache_tags.company(domain)} | cache_tags.node_ids(out),
+    )
 
 
 @app.get("/people")
-def people(q: str, s: Annotated[Session, Depends(neo4j_session)]):
-    key = key_of("people", q=q)
-    if v := cache_get(key):
-        return v
-    records = s.run(PEOPLE_BY_NAME, q=q).data()
-    cache_set(key, records, ttl=60)
-    return records
+def people(q: str, limit: int = Query(25, ge=1, le=200)):
+    """Full-text name/title search (prefix + fuzzy), best matches first"""
+    params = people_params(q, limit)
+    if not params["lucene"]:
+        return []
+    return response_cache.get_or_compute(
+        "people",
+        {"q": q, "limit": limit},
+        lambda: _read(PEOPLE_SEARCH, **params),
+        ttl=TAGGED_TTL,
+        tags=[cache_tags.PEOPLE_SEARCH],
+    )
 
 
 @app.get("/neighbors")
-def neighbors(id: str, s: Annotated[Session, Depends(neo4j_session)], depth: int = 2):
-    key = key_of("neighbors", id=id, depth=depth)
-    if v := cache_get(key):
-        return v
-    rows = s.run(NEIGHBORS, id=id, depth=depth).data()
-    cache_set(key, rows, ttl=30)
-    return rows
+def neighbors(
+    id: str,
+    depth: int = Query(2, ge=0, le=4),
+    label: str | None = None,
+    max_nodes: int = Query(DEFAULT_MAX_NODES, ge=1, le=500),
+):
+    """
+    Bounded BFS neighborhood: indexed anchor (pass `label` to skip resolution),
+    per-relationship-type fan-out caps, stops at `max_nodes`; `truncated` tells
+    whether anything was left out.
+    """
+
+    def load():
+        projection = projection_holder.get()
+        if projection is not None:
+            out = projection.neighborhood(id, depth, label, max_nodes)
+            if out is not None:
+                return out
+        with get_manager().session() as s:
+            return s.execute_read(expand_neighborhood, id, depth, label, max_nodes)
+
+    return response_cache.get_or_compute(
+        "neighbors",
+        {"id": id, "depth": depth, "label": label, "max_nodes": max_nodes},
+        load,
+        ttl=TAGGED_TTL,
+        tags=lambda out: {cache_tags.node(id)} | cache_tags.node_ids(out["nodes"]),
+    )
+
+
+@app.get("/degree")
+def degree(id: str):
+    """Relationship counts by type for one node (needs GRAPH_PROJECTION=1)"""
+    projection = projection_holder.get()
+    if projection is None:
+        raise HTTPException(status_code=503, detail="Graph projection not ready")
+    counts = projection.degree(id)
+    if counts is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    return {"id": id, "degree": sum(counts.values()), "by_type": counts}
+
+
+# List endpoints: keyset pages of `limit` rows as {<items_key>: [...], has_more,
+# next_cursor} (pass next_cursor back as cursor; also sent as X-Next-Cursor), or
+# format=ndjson to stream rows as Neo4j yields them (unbounded without limit).
+ListFormat = Query("json", pattern="^(json|ndjson)$")
+PageLimit = Query(None, ge=1, le=MAX_PAGE_SIZE)
+
+COMPANY_KEYSET = Keyset(*COMPANY_KEYSET_SORT)
+PERSON_KEYSET = Keyset(*PERSON_KEYSET_SORT)
+
+
+def _keyset_list(
+    prefix: str,
+    items_key: str,
+    template: str,
+    keyset: Keyset,
+    filters: dict,
+    tag: str,
+    cursor: str | None,
+    limit: int | None,
+    format: str,
+):
+    scope = {"endpoint": prefix, **filters}
+    decode_cursor(cursor, scope)  # reject bad cursors before touching the cache
+    if format == "ndjson":
+        query, params = keyset.render(template, cursor, scope, filters, limit)
+        return ndjson_response(query, params, limit, scope)
+
+    limit = limit or DEFAULT_PAGE_SIZE
+
+    def load():
+        query, params = keyset.render(template, cursor, scope, filters, limit)
+        items, next_cursor = split_page(_read(query, **params), limit, scope)
+        return {"items": items, "next_cursor": next_cursor}
+
+    page = response_cache.get_or_compute(
+        prefix,
+        {**filters, "cursor": cursor, "limit": limit},
+        load,
+        ttl=TAGGED_TTL,
+        tags=lambda page: {tag} | cache_tags.node_ids(page["items"]),
+    )
+    next_cursor = page["next_cursor"]
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return JSONResponse(
+        {items_key: page["items"], "has_more": next_cursor is not None, "next_cursor": next_cursor},
+        headers=headers,
+    )
 
 
 @app.get("/companies/by-industry")
-def companies_by_industry(industry: str, s: Annotated[Session, Depends(neo4j_session)]):
+def companies_by_industry(
+    industry: str, cursor: str | None = None, limit: int | None = PageLimit, format: str = ListFormat
+):
     """Find companies by industry (e.g., 'Restaurant', 'Fitness', 'IT Services')"""
-    key = key_of("companies_by_industry", industry=industry)
-    if v := cache_get(key):
-        return v
-    records = s.run(COMPANIES_BY_INDUSTRY, industry=industry).data()
-    cache_set(key, records, ttl=60)
-    return records
+    return _keyset_list(
+        "companies_by_industry",
+        "companies",
+        COMPANIES_BY_INDUSTRY,
+        COMPANY_KEYSET,
+        {"industry": industry},
+        cache_tags.industry(industry),
+        cursor,
+        limit,
+        format,
+    )
 
 
 @app.get("/companies/by-location")
-def companies_by_location(location: str, s: Annotated[Session, Depends(neo4j_session)]):
+def companies_by_location(
+    location: str, cursor: str | None = None, limit: int | None = PageLimit, format: str = ListFormat
+):
     """Find companies by location (e.g., 'Moscow')"""
-    key = key_of("companies_by_location", location=location)
-    if v := cache_get(key):
-        return v
-    records = s.run(COMPANIES_BY_LOCATION, location=location).data()
-    cache_set(key, records, ttl=60)
-    return records
+    return _keyset_list(
+        "companies_by_location",
+        "companies",
+        COMPANIES_BY_LOCATION,
+        COMPANY_KEYSET,
+        {"location": location},
+        cache_tags.location(location),
+        cursor,
+        limit,
+        format,
+    )
 
 
 @app.get("/people/by-department")
-def people_by_department(department: str, s: Annotated[Session, Depends(neo4j_session)]):
+def people_by_department(
+    department: str, cursor: str | None = None, limit: int | None = PageLimit, format: str = ListFormat
+):
     """Find people by department (e.g., 'Management', 'IT', 'Facilities')"""
-    key = key_of("people_by_department", department=department)
-    if v := cache_get(key):
-        return v
-    records = s.run(PEOPLE_BY_DEPARTMENT, department=department).data()
-    cache_set(key, records, ttl=60)
-    return records
+    return _keyset_list(
+        "people_by_department",
+        "people",
+        PEOPLE_BY_DEPARTMENT,
+        PERSON_KEYSET,
+        {"department": department},
+        cache_tags.department(department),
+        cursor,
+        limit,
+        format,
+    )
 
 
 @app.get("/analytics/industries")
-def industry_analytics(s: Annotated[Session, Depends(neo4j_session)]):
-    """Get industry statistics and company distribution"""
-    key = key_of("industry_analytics")
-    if v := cache_get(key):
-        return v
-    records = s.run(INDUSTRY_STATS).data()
-    cache_set(key, records, ttl=300)  # Cache for 5 minutes
-    return records
+def industry_analytics():
+    """Get industry statistics and company distribution (top companies per industry as samples)"""
+    return snapshot(INDUSTRY_STATS)
 
 
 # Dependency types (inline Annotated keeps Pylance & Ruff happy)
 EmbedFn = Annotated[Callable[[list[str]], list[list[float]]], Depends(embedder)]
 QdrantDep = Annotated[QdrantClient, Depends(qdrant_client)]
-Neo4jDep = Annotated[Session, Depends(neo4j_session)]
+
+# Same cap the per-company NEIGHBORS query applies
+HYBRID_NEIGHBOR_LIMIT = 50
+HYBRID_COMPANY_FIELDS = ("id", "name", "domain", "industry", "employee_count", "location")
 
 
 @app.get("/search")
@@ -159,10 +380,15 @@ def semantic_search(
     Vector search over Qdrant with OpenAI embeddings (FastEmbed fallback).
     Returns payloads + scores directly from the vector store.
     """
-    key = key_of("semantic_search", q=q, types=types, k=k)
-    if v := cache_get(key):
-        return v
+    return response_cache.get_or_compute(
+        "semantic_search",
+        {"q": q, "types": types, "k": k},
+        lambda: _semantic_search(q, types, k, qc, embed),
+        ttl=30,
+    )
+
 
+def _semantic_search(q: str, types: str, k: int, qc: QdrantClient, embed) -> list[dict]:
     vec = embed([q])[0]
     type_list = [t.strip() for t in types.split(",") if t.strip()]
     qfilter = None
@@ -191,7 +417,6 @@ def semantic_search(
         }
         for h in hits
     ]
-    cache_set(key, out, ttl=30)
     return out
 
 
@@ -216,11 +441,10 @@ def semantic_people(
 
 
 @app.get("/search/hybrid")
-def semantic_then_graph(
+async def semantic_then_graph(
     q: str,
     k: int = Query(5, ge=1, le=50),
     depth: int = Query(1, ge=0, le=3),
-    s: Neo4jDep = None,
     qc: QdrantDep = None,
     embed: EmbedFn = None,
 ):
@@ -229,47 +453,68 @@ def semantic_then_graph(
     2) Expand graph context from Neo4j:
        - company → /companies (domain-based) + optional neighbors(depth)
        - person  → returns the payload as-is (has company_domain/company_id)
+
+    All company hits are expanded by one batched HYBRID_EXPAND query (one
+    round-trip whatever k is).
     """
-    base = semantic_search(q=q, types="company,person", k=k, qc=qc, embed=embed)
-
-    def expand_company_by_domain(domain: str | None):
-        if not domain:
-            return None
-        res = s.run(COMPANY_BY_DOMAIN, domain=domain).single()
-        if not res:
-            return None
-        company = res["company"]
-        neigh = s.run(NEIGHBORS, id=company["id"], depth=depth).data() if depth else []
-        return {"company": company, "neighbors": neigh}
+    base = await run_in_threadpool(
+        semantic_search, q=q, types="company,person", k=k, qc=qc, embed=embed
+    )
+
+    domains = list(
+        dict.fromkeys(r["domain"] for r in base if r.get("type") == "company" and r.get("domain"))
+    )
+    by_domain: dict[str, dict] = {}
+    projection = projection_holder.get()
+    if projection is not None:
+        # Served from memory; only domains the projection doesn't know go to Neo4j
+        for domain in domains:
+            node = projection.by_domain.get(domain)
+            if node is None:
+                continue
+            props = projection.props[node]
+            by_domain[domain] = {
+                "company": {k: props.get(k) for k in HYBRID_COMPANY_FIELDS},
+                "neighbors": projection.paths(projection.keys[node], depth, HYBRID_NEIGHBOR_LIMIT),
+            }
+        domains = [d for d in domains if d not in by_domain]
+    if domains:
+        records = await read_all(
+            HYBRID_EXPAND,
+            {"domains": domains, "depth": depth, "neighbor_limit": HYBRID_NEIGHBOR_LIMIT},
+        )
+        for record in records:
+            row = record.data()
+            by_domain[row["domain"]] = {"company": row["company"], "neighbors": row["neighbors"]}
+
+    # Person payload already contains company link hints
+    persons = {
+        i: {
+            "person": {
+                "id": r.get("id"),
+                "ext_id": r.get("ext_id"),
+                "full_name": r.get("full_name"),
+                "title": r.get("title"),
+                "department": r.get("department"),
+                "company_id": r.get("company_id"),
+                "company_domain": r.get("company_domain"),
+            }
+        }
+        for i, r in enumerate(base)
+        if r.get("type") != "company"
+    }
 
     expanded = []
-    for r in base:
+    for i, r in enumerate(base):
         if r.get("type") == "company":
             expanded.append(
                 {
                     "score": r["score"],
                     "type": "company",
-                    "payload": expand_company_by_domain(r.get("domain")),
+                    "payload": by_domain.get(r.get("domain")),
                 }
             )
         else:
-            # Person payload already contains company link hints
-            expanded.append(
-                {
-                    "score": r["score"],
-                    "type": "person",
-                    "payload": {
-                        "person": {
-                            "id": r.get("id"),
-                            "ext_id": r.get("ext_id"),
-                            "full_name": r.get("full_name"),
-                            "title": r.get("title"),
-                            "department": r.get("department"),
-                            "company_id": r.get("company_id"),
-                            "company_domain": r.get("company_domain"),
-                        }
-                    },
-                }
-            )
+            expanded.append({"score": r["score"], "type": "person", "payload": persons[i]})
 
     return expanded
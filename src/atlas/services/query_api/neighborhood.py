@@ -0,0 +1,185 @@
+"""
+Bounded neighborhood expansion for /neighbors.
+
+Replaces `MATCH (n {id:$id}) CALL apoc.path.expand(...)`, which scanned every
+node to find the anchor and enumerated every path before trimming to 50.
+
+  1) Anchor: an index seek on (label, id). The caller may pass the label;
+     otherwise it is resolved by probing the labels that have an id
+     constraint/index (one UNION of index seeks, no AllNodesScan).
+  2) Expansion: breadth-first, one query per hop for the whole frontier. Each
+     relationship type in the database (db.relationshipTypes()) has its own
+     typed branch with a fan-out cap applied *inside* the expansion (`LIMIT`
+     per type per node), so a company with 100k contacts costs `cap` rows, not
+     100k, and no branch walks relationships of another type.
+  3) Budget: BFS stops as soon as `max_nodes` nodes have been collected.
+  4) The result says whether anything was cut (`truncated`) and why.
+
+All hops run in one read transaction, so the neighborhood is a consistent snapshot.
+
+Usage:
+    with get_manager().session() as s:
+        result = s.execute_read(expand_neighborhood, "acme-id", depth=2)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from fastapi import HTTPException
+
+from neo4j import ManagedTransaction
+
+# Labels whose `id` is backed by a constraint or index (etl.common.graph_schema,
+# generate_synthetic_data), probed in order when the caller gives no label.
+ANCHOR_LABELS = ("Company", "Person", "Deal", "Signal", "Activity", "Meeting")
+
+DEFAULT_MAX_NODES = 50
+DEFAULT_FANOUT = 25
+# Per-node caps by relationship type; every other type gets DEFAULT_FANOUT per node.
+FANOUT_CAPS = {
+    "WORKS_AT": 25,
+    "HAS_EMAIL": 5,
+    "BELONGS_TO": 20,
+    "PRIMARY_CONTACT": 5,
+    "ABOUT": 10,
+    "DETECTED_FOR": 10,
+    "RELATED_TO": 10,
+    "WITH": 10,
+    "FOR_DEAL": 10,
+}
+
+
+def _anchor_query(labels: tuple[str, ...]) -> str:
+    return "\nUNION ALL\n".join(
+        f"MATCH (n:{label} {{id: $id}}) RETURN elementId(n) AS eid, n LIMIT 1" for label in labels
+    )
+
+
+REL_TYPES_QUERY = "CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType"
+
+
+def fanout_cap(rel_type: str) -> int:
+    """Per-node fan-out cap for one relationship type"""
+    return FANOUT_CAPS.get(rel_type, DEFAULT_FANOUT)
+
+
+@lru_cache(maxsize=16)
+def _hop_query(rel_types: tuple[str, ...]) -> str:
+    """
+    One BFS hop for every frontier node: a typed, LIMIT-ed branch per
+    relationship type. Each branch asks for cap+1 rows so a hit cap is
+    detectable without reading past it.
+    """
+    branches = [
+        f"WITH n MATCH (n)-[r:`{rel_type.replace('`', '``')}`]-(m) RETURN r, m LIMIT {fanout_cap(rel_type) + 1}"
+        for rel_type in rel_types
+    ]
+    union = "\n    UNION ALL\n    ".join(branches)
+    return f"""
+UNWIND $frontier AS eid
+MATCH (n) WHERE elementId(n) = eid
+CALL {{
+    {union}
+}}
+RETURN eid AS source, type(r) AS type, elementId(r) AS rid,
+       elementId(startNode(r)) AS start, elementId(endNode(r)) AS end,
+       elementId(m) AS target, m
+"""
+
+
+
+@dataclass
+class Neighborhood:
+    anchor: dict
+    nodes: dict[str, dict] = field(default_factory=dict)
+    rels: dict[str, dict] = field(default_factory=dict)
+    depth_reached: int = 0
+    truncated: bool = False
+    capped_types: set[str] = field(default_factory=set)
+
+    def to_dict(self) -> dict:
+        return {
+            "anchor": self.anchor,
+            "nodes": list(self.nodes.values()),
+            "relationships": list(self.rels.values()),
+            "depth_reached": self.depth_reached,
+            "truncated": self.truncated,
+            "capped_types": sorted(self.capped_types),
+        }
+
+
+def _node(node) -> dict:
+    return {**dict(node.items()), "labels": sorted(node.labels)}
+
+
+def _ref(node: dict):
+    # Email nodes are keyed by address, everything else by id
+    return node.get("id", node.get("address"))
+
+
+def expand_neighborhood(
+    tx: ManagedTransaction,
+    id: str,
+    depth: int = 2,
+    label: str | None = None,
+    max_nodes: int = DEFAULT_MAX_NODES,
+) -> dict:
+    """
+    BFS around the node with `id` up to `depth` hops, at most `max_nodes` nodes
+    (anchor included). Raises 404 if no node has that id.
+    """
+    if label is not None and label not in ANCHOR_LABELS:
+        raise HTTPException(status_code=400, detail=f"label must be one of {', '.join(ANCHOR_LABELS)}")
+    found = tx.run(_anchor_query((label,) if label else ANCHOR_LABELS), id=id).fetch(1)
+    if not found:
+        raise HTTPException(status_code=404, detail="Node not found")
+    anchor_rec = found[0]
+
+    anchor_eid = anchor_rec["eid"]
+    result = Neighborhood(anchor=_node(anchor_rec["n"]))
+    result.nodes[anchor_eid] = result.anchor
+    frontier = [anchor_eid]
+    rel_types = tuple(sorted(rec["relationshipType"] for rec in tx.run(REL_TYPES_QUERY)))
+    if not rel_types:
+        return result.to_dict()
+    hop_query = _hop_query(rel_types)
+
+    for hop in range(1, depth + 1):
+        if not frontier:
+            break
+        next_frontier: list[str] = []
+        per_source: dict[tuple[str, str], int] = {}
+        budget_spent = False
+        for rec in tx.run(hop_query, frontier=frontier):
+            rel_type = rec["type"]
+            seen = per_source.get((rec["source"], rel_type), 0) + 1
+            per_source[(rec["source"], rel_type)] = seen
+            if seen > fanout_cap(rel_type):
+                # The look-ahead row: this node has more neighbors of this type than the cap
+                result.truncated = True
+                result.capped_types.add(rel_type)
+                continue
+
+            target = rec["target"]
+            if target not in result.nodes:
+                if len(result.nodes) >= max_nodes:
+                    # Budget spent with candidates left: stop reading this hop
+                    result.truncated = True
+                    budget_spent = True
+                    break
+                result.nodes[target] = _node(rec["m"])
+                next_frontier.append(target)
+            if rec["rid"] not in result.rels:
+                result.rels[rec["rid"]] = {
+                    "type": rel_type,
+                    "start": _ref(result.nodes[rec["start"]]),
+                    "end": _ref(result.nodes[rec["end"]]),
+                }
+        result.depth_reached = hop
+        if budget_spent:
+            break
+        frontier = next_frontier
+
+    return result.to_dict()
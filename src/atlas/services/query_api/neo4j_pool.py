@@ -0,0 +1,292 @@
+"""
+Process-wide Neo4j connection manager.
+
+One driver (and therefore one Bolt connection pool + routing table) per process,
+opened in the FastAPI lifespan and shared by every router and dependency.
+Sync routers use Neo4jConnectionManager; `async def` endpoints use
+AsyncNeo4jConnectionManager so Bolt I/O never blocks the event loop.
+
+Env:
+  NEO4J_MAX_POOL_SIZE=50              # max Bolt connections held by the pool
+  NEO4J_ACQUISITION_TIMEOUT=30        # seconds to wait for a free connection
+  NEO4J_LIVENESS_CHECK_TIMEOUT=30     # idle seconds before a connection is pinged on checkout ("none": never)
+  NEO4J_MAX_CONNECTION_LIFETIME=3600  # seconds before a connection is recycled
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+
+from atlas.services.query_api.config import settings
+from neo4j import AsyncDriver, AsyncGraphDatabase, AsyncSession, Driver, GraphDatabase, Session
+
+
+@dataclass
+class PoolConfig:
+    uri: str
+    user: str
+    password: str
+    max_pool_size: int = 50
+    acquisition_timeout: float = 30.0
+    liveness_check_timeout: float | None = 30.0
+    max_connection_lifetime: float = 3600.0
+
+    @classmethod
+    def from_settings(cls) -> PoolConfig:
+        return cls(
+            uri=settings.NEO4J_URI,
+            user=settings.NEO4J_USER,
+            password=settings.NEO4J_PASSWORD,
+            max_pool_size=settings.NEO4J_MAX_POOL_SIZE,
+            acquisition_timeout=settings.NEO4J_ACQUISITION_TIMEOUT,
+            liveness_check_timeout=settings.NEO4J_LIVENESS_CHECK_TIMEOUT,
+            max_connection_lifetime=settings.NEO4J_MAX_CONNECTION_LIFETIME,
+        )
+
+    def driver_kwargs(self) -> dict:
+        return {
+            "auth": (self.user, self.password),
+            "max_connection_pool_size": self.max_pool_size,
+            "connection_acquisition_timeout": self.acquisition_timeout,
+            "liveness_check_timeout": self.liveness_check_timeout,
+            "max_connection_lifetime": self.max_connection_lifetime,
+        }
+
+
+@dataclass
+class PoolMetrics:
+    """Session-level usage counters (each open session holds at most one connection)."""
+
+    sessions_opened: int = 0
+    sessions_failed: int = 0
+    in_use: int = 0
+    peak_in_use: int = 0
+    total_hold_seconds: float = 0.0
+    max_hold_seconds: float = 0.0
+    last_liveness_ok: bool | None = None
+    last_liveness_at: float | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def checkout(self) -> None:
+        with self._lock:
+            self.sessions_opened += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def checkin(self, held: float, failed: bool) -> None:
+        with self._lock:
+            self.in_use -= 1
+            self.sessions_failed += int(failed)
+            self.total_hold_seconds += held
+            self.max_hold_seconds = max(self.max_hold_seconds, held)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            closed = self.sessions_opened - self.in_use
+            return {
+                "sessions_opened": self.sessions_opened,
+                "sessions_failed": self.sessions_failed,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "avg_hold_ms": round(1000 * self.total_hold_seconds / closed, 2) if closed else 0.0,
+                "max_hold_ms": round(1000 * self.max_hold_seconds, 2),
+                "last_liveness_ok": self.last_liveness_ok,
+                "last_liveness_at": self.last_liveness_at,
+            }
+
+
+class Neo4jConnectionManager:
+    """
+    Owns the shared Neo4j driver.
+
+    Usage:
+        with manager.session() as s:
+            s.run("MATCH (c:Company) RETURN count(c)").single()
+    """
+
+    def __init__(self, config: PoolConfig):
+        self.config = config
+        self.metrics = PoolMetrics()
+        self._driver: Driver | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def driver(self) -> Driver:
+        """
+        The underlying driver, created on first access.
+        """
+        if self._driver is None:
+            with self._lock:
+                if self._driver is None:
+                    self._driver = self._build_driver()
+        return self._driver
+
+    def _build_driver(self) -> Driver:
+        return GraphDatabase.driver(self.config.uri, **self.config.driver_kwargs())
+
+    def open(self) -> None:
+        """
+        Create the driver and verify connectivity. A failed check is recorded
+        rather than raised so the API can start before Neo4j is reachable.
+        """
+        _ = self.driver
+        if not self.check_liveness():
+            print(f"[neo4j] {self.config.uri} not reachable at startup; will retry lazily.")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._driver is not None:
+                self._driver.close()
+                self._driver = None
+
+    def check_liveness(self) -> bool:
+        try:
+            self.driver.verify_connectivity()
+            ok = True
+        except Exception:
+            ok = False
+        self.metrics.last_liveness_ok = ok
+        self.metrics.last_liveness_at = time.time()
+        return ok
+
+    @contextmanager
+    def session(self, **kwargs) -> Iterator[Session]:
+        """
+        Borrow a session from the shared pool and track how long it is held.
+        """
+        self.metrics.checkout()
+        started = time.perf_counter()
+        failed = False
+        try:
+            with self.driver.session(**kwargs) as s:
+                yield s
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.metrics.checkin(time.perf_counter() - started, failed)
+
+    def stats(self) -> dict:
+        return {
+            "uri": self.config.uri,
+            "max_pool_size": self.config.max_pool_size,
+            "acquisition_timeout": self.config.acquisition_timeout,
+            "liveness_check_timeout": self.config.liveness_check_timeout,
+            "max_connection_lifetime": self.config.max_connection_lifetime,
+            "open": self._driver is not None,
+            **self.metrics.snapshot(),
+        }
+
+
+class AsyncNeo4jConnectionManager:
+    """
+    Async twin of Neo4jConnectionManager, built on AsyncGraphDatabase.
+
+    The async driver binds to the running event loop, so it is created lazily
+    on first use inside the loop (normally from the FastAPI lifespan).
+
+    Usage:
+        async with manager.session() as s:
+            result = await s.run("MATCH (c:Company) RETURN count(c) AS n")
+            record = await result.single()
+    """
+
+    def __init__(self, config: PoolConfig):
+        self.config = config
+        self.metrics = PoolMetrics()
+        self._driver: AsyncDriver | None = None
+
+    @property
+    def driver(self) -> AsyncDriver:
+        if self._driver is None:
+            self._driver = AsyncGraphDatabase.driver(
+                self.config.uri, **self.config.driver_kwargs()
+            )
+        return self._driver
+
+    async def open(self) -> None:
+        _ = self.driver
+        if not await self.check_liveness():
+            print(f"[neo4j] {self.config.uri} not reachable at startup (async); will retry lazily.")
+
+    async def close(self) -> None:
+        if self._driver is not None:
+            driver, self._driver = self._driver, None
+            await driver.close()
+
+    async def check_liveness(self) -> bool:
+        try:
+            await self.driver.verify_connectivity()
+            ok = True
+        except Exception:
+            ok = False
+        self.metrics.last_liveness_ok = ok
+        self.metrics.last_liveness_at = time.time()
+        return ok
+
+    @asynccontextmanager
+    async def session(self, **kwargs) -> AsyncIterator[AsyncSession]:
+        self.metrics.checkout()
+        started = time.perf_counter()
+        failed = False
+        try:
+            async with self.driver.session(**kwargs) as s:
+                yield s
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.metrics.checkin(time.perf_counter() - started, failed)
+
+    def stats(self) -> dict:
+        return {"open": self._driver is not None, **self.metrics.snapshot()}
+
+
+_manager: Neo4jConnectionManager | None = None
+_async_manager: AsyncNeo4jConnectionManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_manager() -> Neo4jConnectionManager:
+    """
+    The process-wide manager. Created lazily so CLI scripts and workers that
+    import the routers outside the FastAPI lifespan share the same pool too.
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = Neo4jConnectionManager(PoolConfig.from_settings())
+    return _manager
+
+
+def get_async_manager() -> AsyncNeo4jConnectionManager:
+    """
+    The process-wide async manager (shares PoolConfig with the sync one).
+    """
+    global _async_manager
+    if _async_manager is None:
+        _async_manager = AsyncNeo4jConnectionManager(get_manager().config)
+    return _async_manager
+
+
+async def open_pool() -> Neo4jConnectionManager:
+    manager = get_manager()
+    manager.open()
+    await get_async_manager().open()
+    return manager
+
+
+async def close_pool() -> None:
+    global _manager, _async_manager
+    if _async_manager is not None:
+        await _async_manager.close()
+        _async_manager = None
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close()
+            _manager = None
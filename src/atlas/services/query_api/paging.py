@@ -0,0 +1,294 @@
+"""
+Keyset pagination and NDJSON streaming for list endpoints.
+
+Pages are addressed by an opaque cursor holding the (sort key, id) of the last
+row served, so page N costs the same as page 1 (an index seek past the cursor)
+instead of `SKIP`-ing N pages. Cursors are bound to the endpoint and its filters
+and rejected if replayed against another one.
+
+Query templates are Python format strings with two slots, doubled braces for
+Cypher maps, and a `_key` column the helper strips:
+
+    TEMPLATE = '''
+    MATCH (c:Company) WHERE c.industry = $industry AND {after}
+    WITH c ORDER BY {order} LIMIT $limit
+    RETURN {{id: c.id, name: c.name}} as company, [c.name, c.id] as _key
+    ORDER BY {order}
+    '''
+    keyset = Keyset("c.name", "c.id")
+    query, params = keyset.render(TEMPLATE, cursor, scope, {"industry": "IT"}, limit=100)
+
+`ndjson_response` streams the same query row by row as the Neo4j cursor yields
+it (application/x-ndjson), ending with a {"next_cursor": ...} line when more
+rows remain.
+
+Every page reports `has_more` (from the look-ahead row). `page_total` adds an
+exact `total` only when it is cheap: from Neo4j's count store when there is no
+filter, or from a per-filter cached count. A filtered count that isn't cached
+yet is computed once in the background and `total` is null until it lands, so
+no page waits on a full count.
+
+Env:
+  PAGING_TOTALS_TTL=300     # seconds a filtered total is reused
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import os
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import orjson
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from atlas.services.query_api.cache import key_of, response_cache
+from atlas.services.query_api.graph_dal import read_all, read_one, stream
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Upper bound for an NDJSON stream without an explicit limit
+STREAM_MAX_ROWS = 1_000_000
+NDJSON = "application/x-ndjson"
+KEY_COLUMN = "_key"
+TOTALS_TTL = int(os.getenv("PAGING_TOTALS_TTL", "300"))
+
+
+# ---------------------------
+# Cursors
+# ---------------------------
+
+
+def _scope_hash(scope: dict[str, Any]) -> str:
+    return hashlib.sha256(orjson.dumps(scope, option=orjson.OPT_SORT_KEYS)).hexdigest()[:12]
+
+
+def encode_cursor(key: list, scope: dict[str, Any]) -> str:
+    # key is [sort, id] or [sort, id, tiebreak]
+    last_id = key[1] if len(key) == 2 else list(key[1:])
+    payload = orjson.dumps({"k": key[0], "i": last_id, "s": _scope_hash(scope)})
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None, scope: dict[str, Any]) -> tuple[Any, Any] | None:
+    """
+    (sort value, id) of the last row served, or None for the first page. The id
+    is an [id, tiebreak] list for keysets with a tiebreak.
+    Raises 400 for malformed cursors or cursors issued for another endpoint/filter.
+    """
+    if not token:
+        return None
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        key, last_id, bound = payload["k"], payload["i"], payload["s"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    if bound != _scope_hash(scope):
+        raise HTTPException(status_code=400, detail="Cursor does not match this query")
+    return key, last_id
+
+
+# ---------------------------
+# Keyset
+# ---------------------------
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """
+    Total order on (sort, id[, tiebreak]). Nulls sort last ascending and first
+    descending, as in Cypher, and the seek predicate follows the same rule.
+
+    `tiebreak` is for rows where `id` alone is not unique, e.g. one row per
+    relationship: a person listed once per company they work at.
+    """
+
+    sort: str
+    id: str
+    descending: bool = False
+    tiebreak: str | None = None
+
+    def order_by(self) -> str:
+        direction = " DESC" if self.descending else ""
+        order = f"{self.sort}{direction}, {self.id}{direction}"
+        return f"{order}, {self.tiebreak}{direction}" if self.tiebreak else order
+
+    def _id_after(self) -> str:
+        op = "<" if self.descending else ">"
+        i = self.id
+        if not self.tiebreak:
+            return f"{i} {op} $_after_id"
+        return f"({i} {op} $_after_id OR ({i} = $_after_id AND {self.tiebreak} {op} $_after_tiebreak))"
+
+    def after(self, position: tuple[Any, Any] | None) -> str:
+        if position is None:
+            return "true"
+        s, i = self.sort, self._id_after()
+        if self.descending:
+            if position[0] is None:
+                return f"({s} IS NOT NULL OR {i})"
+            return f"({s} < $_after_key OR ({s} = $_after_key AND {i}))"
+        if position[0] is None:
+            return f"({s} IS NULL AND {i})"
+        return f"({s} > $_after_key OR ({s} = $_after_key AND {i}) OR {s} IS NULL)"
+
+    def render(
+        self,
+        template: str,
+        cursor: str | None,
+        scope: dict[str, Any],
+        params: dict[str, Any] | None = None,
+        limit: int | None = DEFAULT_PAGE_SIZE,
+    ) -> tuple[str, dict[str, Any]]:
+        """
+        Fill the template for the page after `cursor`. One extra row is requested
+        so callers can tell whether another page exists.
+        """
+        position = decode_cursor(cursor, scope)
+        if position is not None and self.tiebreak:
+            if not (isinstance(position[1], list) and len(position[1]) == 2):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            position = (position[0], *position[1])
+        query = template.format(after=self.after(position), order=self.order_by())
+        params = dict(params or {})
+        params["limit"] = (limit + 1) if limit else STREAM_MAX_ROWS
+        if position is not None:
+            params["_after_key"], params["_after_id"] = position[:2]
+            if self.tiebreak:
+                params["_after_tiebreak"] = position[2]
+        return query, params
+
+
+def list_query(
+    endpoint: str,
+    template: str,
+    keyset: Keyset,
+    filters: list[str],
+    params: dict[str, Any],
+    cursor: str | None,
+    limit: int | None,
+) -> tuple[str, dict[str, Any], dict[str, Any]]:
+    """
+    Render a list query whose template has {where} and {order} slots, with
+    `filters` (Cypher predicates) AND-ed with the keyset seek.
+    Returns (query, params, scope); the scope binds cursors and totals to the
+    endpoint and its filter values.
+    """
+    scope = {"endpoint": endpoint, **params}
+    template = template.replace("{where}", " AND ".join(filters + ["{after}"]))
+    query, page_params = keyset.render(template, cursor, scope, params, limit)
+    return query, page_params, scope
+
+
+def where(filters: list[str]) -> str:
+    return f"WHERE {' AND '.join(filters)}" if filters else ""
+
+
+def split_page(rows: list[dict], limit: int, scope: dict[str, Any]) -> tuple[list[dict], str | None]:
+    """
+    Trim the look-ahead row and strip `_key`; returns (items, next_cursor).
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1][KEY_COLUMN], scope) if has_more and rows else None
+    return [{k: v for k, v in row.items() if k != KEY_COLUMN} for row in rows], next_cursor
+
+
+async def fetch_page(
+    query: str,
+    params: dict[str, Any],
+    limit: int,
+    scope: dict[str, Any],
+    transform: Callable[[dict], dict] | None = None,
+) -> tuple[list[dict], str | None]:
+    items, next_cursor = split_page([r.data() for r in await read_all(query, params)], limit, scope)
+    return [transform(item) for item in items] if transform else items, next_cursor
+
+
+# ---------------------------
+# Totals
+# ---------------------------
+
+_counting: dict[str, asyncio.Task] = {}
+
+
+async def _count_into_cache(key: str, count_query: str, params: dict[str, Any]) -> None:
+    try:
+        record = await read_one(count_query, params)
+        total = record["total"] if record else 0
+        await run_in_threadpool(response_cache.set, key, total, TOTALS_TTL)
+    except Exception as e:
+        print(f"[paging] background count for {key} failed ({e})")
+    finally:
+        _counting.pop(key, None)
+
+
+async def page_total(
+    scope: dict[str, Any],
+    count_query: str,
+    params: dict[str, Any],
+    count_store_query: str | None = None,
+) -> int | None:
+    """
+    Total rows for a list, or None while it is not known cheaply.
+
+    count_store_query: an unfiltered `count()` Neo4j answers from its count store
+    in O(1) (single label, or one relationship type with one labelled end). Used
+    when `params` holds no filters.
+    """
+    if count_store_query is not None and not params:
+        record = await read_one(count_store_query)
+        return record["total"] if record else 0
+
+    key = key_of("total", **scope)
+    cached = await run_in_threadpool(response_cache.get, key)
+    if cached is not None:
+        return cached
+    if key not in _counting:
+        _counting[key] = asyncio.create_task(_count_into_cache(key, count_query, params))
+    return None
+
+
+# ---------------------------
+# NDJSON streaming
+# ---------------------------
+
+
+async def _ndjson_lines(
+    query: str,
+    params: dict[str, Any],
+    limit: int | None,
+    scope: dict[str, Any],
+    transform: Callable[[dict], dict] | None,
+) -> AsyncIterator[bytes]:
+    sent = 0
+    last_key = None
+    more = False
+    async for record in stream(query, params):
+        if limit and sent == limit:
+            more = True
+            break
+        row = record.data()
+        last_key = row.pop(KEY_COLUMN, None)
+        yield orjson.dumps(transform(row) if transform else row) + b"\n"
+        sent += 1
+    if more and last_key is not None:
+        yield orjson.dumps({"next_cursor": encode_cursor(last_key, scope)}) + b"\n"
+
+
+def ndjson_response(
+    query: str,
+    params: dict[str, Any],
+    limit: int | None,
+    scope: dict[str, Any],
+    transform: Callable[[dict], dict] | None = None,
+) -> StreamingResponse:
+    """
+    Stream rows as NDJSON while Neo4j produces them; nothing is buffered server-side.
+    """
+    return StreamingResponse(_ndjson_lines(query, params, limit, scope, transform), media_type=NDJSON)
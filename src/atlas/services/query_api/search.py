@@ -0,0 +1,115 @@
+"""
+Full-text search over the graph (Neo4j Lucene indexes, see etl.common.graph_schema).
+
+Replaces label scans (`toLower(..) CONTAINS`, `=~ '(?i).*q.*'`) with index lookups
+ranked by relevance. Each user term matches exactly (boosted), as a prefix
+("acm" → "Acme") and, for longer terms, fuzzily ("helthcare" → "healthcare").
+All terms must match.
+
+Usage:
+    rows = _read(PEOPLE_SEARCH, **people_params("jane cto"))
+    hits = await search_entities("acme", ["companies", "contacts"])
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from atlas.services.query_api.graph_dal import read_all
+
+DEFAULT_LIMIT = 10
+_FUZZY_MIN_LEN = 4
+_TOKEN = re.compile(r"\w+")
+
+
+def lucene_query(q: str) -> str:
+    """
+    Turn free text into a Lucene query: every term required, each as
+    exact^3 OR prefix* OR fuzzy~1. Returns "" when nothing searchable remains.
+
+    Terms are split on non-word characters the way the index's standard analyzer
+    tokenizes, which also strips every Lucene operator from user input.
+    """
+    clauses = []
+    for term in _TOKEN.findall(q.lower()):
+        options = [f"{term}^3", f"{term}*"]
+        if len(term) >= _FUZZY_MIN_LEN:
+            options.append(f"{term}~1")
+        clauses.append(f"+({' OR '.join(options)})")
+    return " ".join(clauses)
+
+
+# ---------------------------
+# People (/people)
+# ---------------------------
+
+PEOPLE_SEARCH = """
+CALL db.index.fulltext.queryNodes('person_search', $lucene, {limit: $limit}) YIELD node AS p, score
+OPTIONAL MATCH (p)-[:WORKS_AT]->(c:Company)
+OPTIONAL MATCH (p)-[:HAS_EMAIL]->(e:Email)
+RETURN
+  {id: p.id, full_name: p.full_name, title: p.title, department: p.department} as person,
+  collect(DISTINCT {id: c.id, name: c.name, domain: c.domain, industry: c.industry, location: c.location}) as companies,
+  collect(DISTINCT e.address) as emails,
+  score
+ORDER BY score DESC
+"""
+
+
+def people_params(q: str, limit: int = 25) -> dict[str, Any]:
+    return {"lucene": lucene_query(q), "limit": limit}
+
+
+# ---------------------------
+# Cross-entity search (/api/search)
+# ---------------------------
+
+# One branch per entity type; branches are UNION ALL-ed into a single query so
+# a search is one round-trip regardless of how many types are requested.
+_BRANCHES = {
+    "companies": """
+CALL db.index.fulltext.queryNodes('company_search', $lucene, {limit: $limit}) YIELD node, score
+RETURN 'companies' AS kind, node, score, null AS company_name
+""",
+    "contacts": """
+CALL db.index.fulltext.queryNodes('person_search', $lucene, {limit: $limit}) YIELD node, score
+MATCH (node)-[:WORKS_AT]->(c:Company)
+RETURN 'contacts' AS kind, node, score, c.name AS company_name
+""",
+    "deals": """
+CALL db.index.fulltext.queryNodes('deal_search', $lucene, {limit: $limit}) YIELD node, score
+MATCH (node)-[:BELONGS_TO]->(c:Company)
+RETURN 'deals' AS kind, node, score, c.name AS company_name
+""",
+}
+
+ENTITY_TYPES = tuple(_BRANCHES)
+
+
+def entity_search_query(types: list[str]) -> str:
+    return "UNION ALL".join(_BRANCHES[t] for t in types)
+
+
+async def search_entities(
+    q: str, types: list[str] | tuple[str, ...] = ENTITY_TYPES, limit: int = DEFAULT_LIMIT
+) -> dict[str, list[dict]]:
+    """
+    Top `limit` matches per entity type, best first, each with its `score`
+    (and `company_name` for contacts/deals).
+    """
+    results: dict[str, list[dict]] = {t: [] for t in types}
+    lucene = lucene_query(q)
+    if not lucene or not types:
+        return results
+
+    records = await read_all(entity_search_query(list(types)), {"lucene": lucene, "limit": limit})
+    for r in records:
+        item = dict(r["node"].items())
+        if r["company_name"] is not None:
+            item["company_name"] = r["company_name"]
+        item["score"] = r["score"]
+        results[r["kind"]].append(item)
+    for items in results.values():
+        items.sort(key=lambda x: x["score"], reverse=True)
+    return results
@@ -21,6 +21,8 @@ from qdrant_client.models import (
     SearchParams, ScoredPoint
 )
 
+from atlas.services.embedding_store import embed_through_store
+
 from .signal_types import SignalType, SignalPriority, ProductCategory, SIGNAL_DEFINITIONS
 
 
@@ -80,6 +82,7 @@ class SignalVectorRAG:
         self.qdrant_url = qdrant_url or os.getenv("QDRANT_URL", "http://localhost:6333")
         self.client = QdrantClient(url=self.qdrant_url)
         self._embed_fn = embed_fn
+        self._embed_model: str | None = None  # shared embedding store key, when the model is known
         self._llm_fn = llm_fn
         self._ensure_collections()
 
@@ -111,7 +114,8 @@ class SignalVectorRAG:
             try:
                 from fastembed import TextEmbedding
                 model = TextEmbedding(model_name="BAAI/bge-small-en-v1.5")
-                self._embed_fn = lambda texts: list(model.embed(texts))
+                self._embed_fn = lambda texts: [v.tolist() for v in model.embed(texts)]
+                self._embed_model = "fastembed:BAAI/bge-small-en-v1.5"
             except ImportError:
                 # Fallback to simple hash-based pseudo-embeddings for demo
                 import hashlib
@@ -135,7 +139,9 @@ class SignalVectorRAG:
     def _embed(self, texts: list[str]) -> list[list[float]]:
         """Embed texts using the embedding function"""
         embedder = self._get_embedder()
-        return embedder(texts)
+        if self._embed_model is None:
+            return embedder(texts)
+        return embed_through_store(self._embed_model, texts, embedder, dim=VECTOR_DIM)
 
     def _create_signal_text(self, signal_data: dict) -> str:
         """Create searchable text from signal data"""
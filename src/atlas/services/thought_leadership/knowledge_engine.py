@@ -16,6 +16,8 @@ from enum import Enum
 import uuid
 import os
 
+from atlas.services.embedding_store import aembed_through_store
+
 # Import dependencies
 try:
     from qdrant_client import QdrantClient
@@ -607,8 +609,11 @@ Keep it professional but engaging."""
             return []
 
         try:
-            embeddings = await self.llm.embeddings_async(texts)
-            return embeddings
+            return await aembed_through_store(
+                f"mistral:{self.embedding_model}",
+                texts,
+                lambda missing: self.llm.generate_embeddings(missing, model=self.embedding_model),
+            )
         except Exception:
             return []
 
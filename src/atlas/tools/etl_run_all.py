@@ -1,15 +1,52 @@
+"""
+Run the graph and vector ETLs for every discovered Apollo batch, in-process.
+
+The MinIO client, the Neo4j driver, the Qdrant client and the embedding model
+are created once and shared by all batches. Up to --parallel batch prefixes are
+processed at a time, and for each batch the graph and vector stages run
+concurrently. Completed (prefix, stage) pairs are recorded in a checkpoint
+file, so a rerun after a crash or Ctrl-C skips them (--restart ignores it).
+
+With --parallel > 1, batches that write the same records run at the same time
+and the last one to write wins; --parallel 1 keeps strict timestamp order.
+
+Usage:
+    python -m atlas.tools.etl_run_all --since 2025-10-26 --parallel 4
+    python -m atlas.tools.etl_run_all --vector-only --restart
+
+Env:
+  ETL_PARALLEL_PREFIXES=2                    # batches processed concurrently
+  ETL_CHECKPOINT_PATH=.etl_checkpoint.json   # completed (prefix, stage) pairs
+"""
+
 from __future__ import annotations
 
 import argparse
+import json
 import os
-import subprocess
-from dataclasses import dataclass
-from datetime import datetime, date, timezone
-from typing import Iterable, List, Optional, Set, Tuple
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
 
+from dotenv import load_dotenv
 from minio import Minio
 
-from dotenv import load_dotenv
+from atlas.ingestors.common.lake_catalog import MANIFEST_ENABLED, LakeCatalog
+
+PARALLEL_PREFIXES = int(os.getenv("ETL_PARALLEL_PREFIXES", "2"))
+CHECKPOINT_PATH = os.getenv("ETL_CHECKPOINT_PATH", ".etl_checkpoint.json")
+STAGES = ("graph", "vector")
+_print_lock = threading.Lock()
+
+
+def _log(msg: str) -> None:
+    # Stages print from several threads; keep lines whole
+    with _print_lock:
+        print(msg, flush=True)
+
 # ---------- MinIO helpers ----------
 
 def _bool_env(name: str, default: bool = False) -> bool:
@@ -38,43 +75,102 @@ def minio_client() -> Minio:
 
 # ---------- Prefix discovery ----------
 
-def _extract_batch_prefix(object_key: str) -> Optional[str]:
+def discover_batch_prefixes(
+    mc: Minio,
+    bucket: str,
+    base_prefix: str = "apollo/raw/",
+    since: date | None = None,
+    until: date | None = None,
+    use_manifest: bool = MANIFEST_ENABLED,
+) -> list[str]:
     """
-    Input: 'apollo/raw/2025-10-28T16:56:34.804420Z/companies-00001.json'
-    Output: 'apollo/raw/2025-10-28T16:56:34.804420Z'
+    Batch prefixes (no trailing slash) in [since, until], ascending by timestamp,
+    from the lake manifest or a delimiter listing (see lake_catalog).
     """
-    if not object_key.startswith("apollo/raw/"):
-        return None
-    parts = object_key.split("/")
-    if len(parts) < 3:
-        return None
-    return "/".join(parts[:3])
+    catalog = LakeCatalog(mc, bucket)
+    return [b.prefix for b in catalog.iter_batches(base_prefix, since, until, use_manifest)]
 
 
-def _parse_ts_from_prefix(prefix: str) -> Optional[datetime]:
-    # prefix like 'apollo/raw/2025-10-28T16:56:34.804420Z'
-    try:
-        ts = prefix.split("/", 2)[2]  # 2025-10-28T16:56:34.804420Z
-        # Normalize Z → +00:00 for fromisoformat
-        ts_norm = ts.replace("Z", "+00:00")
-        return datetime.fromisoformat(ts_norm)
-    except Exception:
-        return None
+# ---------- Checkpoint ----------
 
+class Checkpoint:
+    """
+    JSON file of completed stages: {prefix: {stage: {"finished_at": ..., ...}}}.
+    Rewritten atomically (tmp + rename) after every completed stage;
+    resume=False starts from an empty record (and overwrites the file).
+    """
 
-def discover_batch_prefixes(mc: Minio, bucket: str, base_prefix: str = "apollo/raw/") -> List[str]:
+    def __init__(self, path: str, resume: bool = True):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: dict = {}
+        if resume and path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._done = json.load(f)
+
+    def is_done(self, prefix: str, stage: str) -> bool:
+        with self._lock:
+            return stage in self._done.get(prefix, {})
+
+    def mark(self, prefix: str, stage: str, **info) -> None:
+        with self._lock:
+            info["finished_at"] = datetime.now(UTC).isoformat()
+            self._done.setdefault(prefix, {})[stage] = info
+            if not self.path:
+                return
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._done, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+
+
+# ---------- Shared resources ----------
+
+class Resources:
     """
-    Returns unique batch prefixes (no trailing slash), sorted ascending by timestamp.
+    Clients and the embedding model, created on first use and shared by every
+    batch (the Neo4j driver, Qdrant client, MinIO client and loaded model are
+    thread-safe).
     """
-    seen: Set[str] = set()
-    for obj in mc.list_objects(bucket, prefix=base_prefix, recursive=True):
-        p = _extract_batch_prefix(obj.object_name)
-        if p:
-            seen.add(p)
-    # sort by parsed timestamp (fallback to string)
-    prefixes = list(seen)
-    prefixes.sort(key=lambda p: _parse_ts_from_prefix(p) or p)
-    return prefixes
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+        self.mc = minio_client()
+        self._lock = threading.Lock()
+        self._driver = None
+        self._qdrant = None
+        self._embedder = None
+
+    def driver(self):
+        with self._lock:
+            if self._driver is None:
+                from atlas.etl.common.graph_schema import ensure_schema
+                from neo4j import GraphDatabase
+
+                uri = os.getenv("NEO4J_URI")
+                user = os.getenv("NEO4J_USER")
+                pwd = os.getenv("NEO4J_PASSWORD")
+                self._driver = GraphDatabase.driver(uri, auth=(user, pwd))
+                ensure_schema(self._driver)
+            return self._driver
+
+    def vector(self):
+        with self._lock:
+            if self._qdrant is None:
+                from atlas.etl.apollo_to_vector.etl_apollo_qdrant import (
+                    build_embedder,
+                    qdrant_client,
+                )
+
+                self._qdrant = qdrant_client()
+                self._embedder = build_embedder()
+            return self._qdrant, self._embedder
+
+    def close(self) -> None:
+        if self._driver is not None:
+            self._driver.close()
+        if self._qdrant is not None:
+            self._qdrant.close()
 
 
 # ---------- ETL runners ----------
@@ -86,64 +182,121 @@ class EtlStats:
     vector_ok: int = 0
     graph_fail: int = 0
     vector_fail: int = 0
-
-
-def _run(cmd: List[str]) -> int:
+    graph_skipped: int = 0
+    vector_skipped: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, stage: str, outcome: str) -> None:
+        with self._lock:
+            name = f"{stage}_{outcome}"
+            setattr(self, name, getattr(self, name) + 1)
+
+
+def run_graph(res: Resources, prefix: str, force: bool = False) -> dict:
+    from atlas.etl.apollo_to_graph.etl_apollo import load_prefix
+    from atlas.etl.common.idempotency import new_batch_id
+
+    batch_id = new_batch_id()
+    progress = load_prefix(res.mc, res.driver(), res.bucket, prefix, batch_id, force=force)
+    changes = progress.changes
+    return {
+        "batch_id": batch_id,
+        "companies": progress.companies,
+        "companies_written": changes.companies_written,
+        "people_written": changes.people_written,
+    }
+
+
+def run_vector(res: Resources, prefix: str, force: bool = False) -> dict:
+    from atlas.etl.apollo_to_vector.etl_apollo_qdrant import list_json_keys, load_prefix
+
+    keys = list_json_keys(res.mc, res.bucket, prefix)
+    if not keys:
+        raise FileNotFoundError(f"no JSON files under s3://{res.bucket}/{prefix}")
+    client, embedder = res.vector()
+    stats = load_prefix(res.mc, client, embedder, res.bucket, keys, force=force)
+    return {"files": len(keys), "points": stats.written, "skipped": stats.skipped}
+
+
+RUNNERS = {"graph": run_graph, "vector": run_vector}
+
+
+def run_stage(
+    res: Resources, prefix: str, stage: str, checkpoint: Checkpoint, stats: EtlStats, force: bool = False
+) -> bool:
+    if checkpoint.is_done(prefix, stage):
+        _log(f"[{stage}] {prefix}: done in a previous run, skipping")
+        stats.add(stage, "skipped")
+        return True
+    _log(f"[{stage}] {prefix}: start")
+    t0 = time.perf_counter()
+    try:
+        info = RUNNERS[stage](res, prefix, force)
+    except Exception as e:
+        traceback.print_exc()
+        _log(f"[{stage}] {prefix}: FAILED ({e})")
+        stats.add(stage, "fail")
+        return False
+    seconds = round(time.perf_counter() - t0, 1)
+    checkpoint.mark(prefix, stage, seconds=seconds, **info)
+    _log(f"[{stage}] {prefix}: ok in {seconds}s {info}")
+    stats.add(stage, "ok")
+    return True
+
+
+def process_prefix(
+    res: Resources, prefix: str, stages: tuple[str, ...], checkpoint: Checkpoint, stats: EtlStats, force: bool = False
+) -> None:
     """
-    Run a subprocess, stream output, return exit code.
+    The stages of one batch run concurrently: both read the same lake objects
+    and write to different stores.
     """
-    print(f"+ {' '.join(cmd)}", flush=True)
-    return subprocess.call(cmd)
-
+    with ThreadPoolExecutor(max_workers=len(stages), thread_name_prefix="etl-stage") as pool:
+        futures = [pool.submit(run_stage, res, prefix, stage, checkpoint, stats, force) for stage in stages]
+        for f in futures:
+            f.result()
 
-def run_graph(prefix: str) -> bool:
-    code = _run(["python", "-m", "atlas.etl.apollo_to_graph.etl_apollo", "--prefix", prefix])
-    return code == 0
 
-
-def run_vector(prefix: str) -> bool:
-    code = _run(["python", "-m", "atlas.etl.apollo_to_vector.etl_apollo_qdrant", "--prefix", prefix])
-    return code == 0
+# ---------- CLI ----------
+def _parse_date(value: str | None, flag: str) -> date | None:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise SystemExit(f"Invalid {flag} date: {value} (expected YYYY-MM-DD)") from None
 
 
-# ---------- CLI ----------
 def main():
     load_dotenv()
     parser = argparse.ArgumentParser(description="Run ETL (graph/vector) for all discovered Apollo batches.")
     parser.add_argument("--bucket", default=os.getenv("MINIO_BUCKET", "datalake"))
     parser.add_argument("--base-prefix", default="apollo/raw/", help="Base path to scan for batches")
     parser.add_argument("--since", type=str, default=None, help="ISO date (YYYY-MM-DD) to include from")
+    parser.add_argument("--until", type=str, default=None, help="ISO date (YYYY-MM-DD) to include up to")
+    parser.add_argument("--no-manifest", action="store_true", help="Discover by listing instead of the lake manifest")
     parser.add_argument("--max", type=int, default=0, help="Max number of batches to process (0 = all)")
     parser.add_argument("--graph-only", action="store_true", help="Run only graph ETL")
     parser.add_argument("--vector-only", action="store_true", help="Run only vector ETL")
+    parser.add_argument("--parallel", type=int, default=PARALLEL_PREFIXES, help="Batches processed concurrently")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="Checkpoint file ('' to disable)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and rerun every batch")
+    parser.add_argument("--force", action="store_true", help="Rewrite records even if their content is unchanged")
     args = parser.parse_args()
 
     if args.graph_only and args.vector_only:
         print("Both --graph-only and --vector-only set; nothing to do.")
         return
 
-    mc = minio_client()
-    prefixes = discover_batch_prefixes(mc, args.bucket, base_prefix=args.base_prefix)
-
-    # Filter by --since
-    if args.since:
-        try:
-            since_date = date.fromisoformat(args.since)
-        except ValueError:
-            raise SystemExit(f"Invalid --since date: {args.since} (expected YYYY-MM-DD)")
-        filtered = []
-        for p in prefixes:
-            ts = _parse_ts_from_prefix(p)
-            if ts and ts.date() >= since_date:
-                filtered.append(p)
-        prefixes = filtered
-
-    # Apply --max (take the newest N)
+    since_date, until_date = _parse_date(args.since, "--since"), _parse_date(args.until, "--until")
+    res = Resources(args.bucket)
+    prefixes = discover_batch_prefixes(
+        res.mc, args.bucket, args.base_prefix, since_date, until_date, use_manifest=not args.no_manifest
+    )
+
+    # Apply --max (take the newest N; discovery is ascending)
     if args.max and args.max > 0:
-        # pick latest N by timestamp
-        prefixes.sort(key=lambda p: _parse_ts_from_prefix(p) or p, reverse=True)
-        prefixes = prefixes[: args.max]
-        prefixes.sort(key=lambda p: _parse_ts_from_prefix(p) or p)  # back to ascending
+        prefixes = prefixes[-args.max :]
 
     if not prefixes:
         print("(no batches to process)")
@@ -154,23 +307,25 @@ def main():
         print(f" - {p}")
     print()
 
+    stages = ("vector",) if args.vector_only else ("graph",) if args.graph_only else STAGES
+    checkpoint = Checkpoint(args.checkpoint, resume=not args.restart)
     stats = EtlStats(total=len(prefixes))
-    for p in prefixes:
-        print(f"=== Processing: {p} ===")
-        if not args.vector_only:
-            ok = run_graph(p)
-            stats.graph_ok += int(ok)
-            stats.graph_fail += int(not ok)
-        if not args.graph_only:
-            ok = run_vector(p)
-            stats.vector_ok += int(ok)
-            stats.vector_fail += int(not ok)
-        print()
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.parallel), thread_name_prefix="etl-prefix") as pool:
+            futures = [pool.submit(process_prefix, res, p, stages, checkpoint, stats, args.force) for p in prefixes]
+            for f in futures:
+                f.result()
+    finally:
+        res.close()
 
+    print()
     print("=== Summary ===")
-    print(f"batches:      {stats.total}")
-    print(f"graph ok:     {stats.graph_ok}  | fail: {stats.graph_fail}")
-    print(f"vector ok:    {stats.vector_ok} | fail: {stats.vector_fail}")
+    print(f"batches:      {stats.total} in {time.perf_counter() - t0:.1f}s (parallel={args.parallel})")
+    print(f"graph ok:     {stats.graph_ok}  | fail: {stats.graph_fail}  | skipped: {stats.graph_skipped}")
+    print(f"vector ok:    {stats.vector_ok} | fail: {stats.vector_fail} | skipped: {stats.vector_skipped}")
+    if args.checkpoint:
+        print(f"checkpoint:   {args.checkpoint}")
 
 
 if __name__ == "__main__":
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import argparse
 import os
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import Iterable, List, Optional, Tuple
 
 from minio import Minio
 from dotenv import load_dotenv
 
+from atlas.ingestors.common.lake_catalog import MANIFEST_ENABLED, MANIFEST_KEY, LakeCatalog
+
 def _bool_env(name: str, default: bool = False) -> bool:
     v = os.getenv(name)
     if v is None:
@@ -38,6 +40,32 @@ def list_keys(
     bucket: str,
     prefix: str,
     limit: int,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    use_manifest: bool = MANIFEST_ENABLED,
+) -> List[Tuple[str, int, Optional[datetime]]]:
+    """
+    Newest objects of the batches under `prefix` (e.g. apollo/raw/): batches
+    come from the lake catalog, and only the newest ones are listed until
+    `limit` objects are found.
+    """
+    catalog = LakeCatalog(client, bucket)
+    batches = list(catalog.iter_batches(prefix, since, until, use_manifest))
+    out: List[Tuple[str, int, Optional[datetime]]] = []
+    for batch in reversed(batches):
+        rows = [(o.object_name, o.size or 0, o.last_modified) for o in catalog.iter_objects(batch.prefix)]
+        rows.sort(key=lambda x: (x[2] or datetime.fromtimestamp(0, tz=timezone.utc)), reverse=True)
+        out.extend(rows)
+        if len(out) >= limit:
+            break
+    return out[:limit]
+
+
+def list_keys_recursive(
+    client: Minio,
+    bucket: str,
+    prefix: str,
+    limit: int,
 ) -> List[Tuple[str, int, Optional[datetime]]]:
     objs = client.list_objects(bucket, prefix=prefix, recursive=True)
     out: List[Tuple[str, int, Optional[datetime]]] = []
@@ -56,10 +84,20 @@ def main():
     parser.add_argument("--bucket", default=os.getenv("MINIO_BUCKET", "datalake"))
     parser.add_argument("--prefix", default=os.getenv("LAKE_PREFIX", "apollo/raw/"))
     parser.add_argument("--limit", type=int, default=int(os.getenv("LAKE_LIMIT", "100")))
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="batches from this date (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, default=None, help="batches up to this date (YYYY-MM-DD)")
+    parser.add_argument("--no-manifest", action="store_true", help="discover batches by listing, not the manifest")
+    parser.add_argument("--recursive", action="store_true", help="list every object under --prefix (slow)")
+    parser.add_argument("--rebuild-manifest", action="store_true", help="relist all batches into the manifest")
     args = parser.parse_args()
 
     mc = minio_client()
 
+    if args.rebuild_manifest:
+        n = LakeCatalog(mc, args.bucket).rebuild_manifest()
+        print(f"Rebuilt s3://{args.bucket}/{MANIFEST_KEY}: {n} batches")
+        return
+
     # Print buckets for quick context
     buckets = mc.list_buckets()
     print("# Buckets:")
@@ -69,7 +107,12 @@ def main():
     print(f"\n# Listing: s3://{args.bucket}/{args.prefix} (limit={args.limit})\n")
 
     try:
-        rows = list_keys(mc, args.bucket, args.prefix, args.limit)
+        if args.recursive:
+            rows = list_keys_recursive(mc, args.bucket, args.prefix, args.limit)
+        else:
+            rows = list_keys(
+                mc, args.bucket, args.prefix, args.limit, args.since, args.until, use_manifest=not args.no_manifest
+            )
     except Exception as e:
         print(f"ERROR: {e}")
         return
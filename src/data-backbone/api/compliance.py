@@ -10,6 +10,8 @@ from datetime import datetime
 from enum import Enum
 import uuid
 
+from atlas.services.query_api.graph_dal import read_all, read_one, write, write_many
+
 router = APIRouter(prefix="/compliance", tags=["compliance"])
 
 
@@ -143,21 +145,9 @@ class ComplianceStats(BaseModel):
 
 
 # ============================================================
-# Neo4j Helper Functions
+# Helper Functions
 # ============================================================
 
-def get_neo4j_driver():
-    """Get Neo4j driver from app state"""
-    from neo4j import GraphDatabase
-    import os
-
-    uri = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
-    user = os.getenv("NEO4J_USER", "neo4j")
-    password = os.getenv("NEO4J_PASSWORD", "neo4jpass")
-
-    return GraphDatabase.driver(uri, auth=(user, password))
-
-
 def calculate_risk_level(violation_score: int) -> RiskLevel:
     """Calculate risk level from violation score"""
     if violation_score >= 61:
@@ -221,8 +211,6 @@ async def get_compliance_results(
     Get compliance check results from Neo4j.
     """
     try:
-        driver = get_neo4j_driver()
-
         query = """
         MATCH (c:ComplianceCheck)-[:CHECKED]->(p:Product)
         OPTIONAL MATCH (p)-[:SOLD_BY]->(s:Seller)
@@ -250,72 +238,68 @@ async def get_compliance_results(
         """
 
         results = []
-        with driver.session() as session:
-            records = session.run(query, params)
-
-            for record in records:
-                check = record["c"]
-                product = record["p"]
-                seller = record["s"]
-                marketplace_node = record["m"]
-                violations = record["violations"]
-
-                # Build violation details
-                violation_details = []
-                for v in violations:
-                    if v:
-                        violation_details.append(ViolationDetail(
-                            type=v.get("type", "other"),
-                            evidence_text=v.get("evidenceText", ""),
-                            evidence_text_translated=v.get("evidenceTextTranslated", ""),
-                            location=v.get("location", "unknown"),
-                            severity=v.get("severity", "MEDIUM"),
-                            explanation=v.get("explanation", ""),
-                            regulatory_reference=v.get("regulatoryReference")
-                        ))
-
-                # Build seller info
-                seller_info = SellerInfo(
-                    seller_name=seller.get("name", "Unknown") if seller else "Unknown",
-                    seller_id=seller.get("sellerId") if seller else None,
-                    seller_website=seller.get("website") if seller else None
-                )
+        for record in await read_all(query, params):
+            check = record["c"]
+            product = record["p"]
+            seller = record["s"]
+            marketplace_node = record["m"]
+            violations = record["violations"]
+
+            # Build violation details
+            violation_details = []
+            for v in violations:
+                if v:
+                    violation_details.append(ViolationDetail(
+                        type=v.get("type", "other"),
+                        evidence_text=v.get("evidenceText", ""),
+                        evidence_text_translated=v.get("evidenceTextTranslated", ""),
+                        location=v.get("location", "unknown"),
+                        severity=v.get("severity", "MEDIUM"),
+                        explanation=v.get("explanation", ""),
+                        regulatory_reference=v.get("regulatoryReference")
+                    ))
+
+            # Build seller info
+            seller_info = SellerInfo(
+                seller_name=seller.get("name", "Unknown") if seller else "Unknown",
+                seller_id=seller.get("sellerId") if seller else None,
+                seller_website=seller.get("website") if seller else None
+            )
 
-                result = ComplianceResult(
-                    check_id=check["checkId"],
-                    asin=product["asin"],
-                    url=product["url"],
-                    title=product["title"],
-                    marketplace=marketplace_node["code"] if marketplace_node else "unknown",
-                    violations_detected=check.get("violationsDetected", False),
-                    ce_certification_claimed=check.get("ceCertificationClaimed", False),
-                    is_baby_product=check.get("isBabyProduct", False),
-                    ce_mark_visible=check.get("ceMarkVisible", False),
-                    violation_types=[v.type for v in violation_details],
-                    violation_details=violation_details,
-                    seller_information=seller_info,
-                    confidence_score=check.get("confidenceScore", 0),
-                    violation_score=check.get("violationScore", 0),
-                    violation_score_breakdown=ViolationScoreBreakdown(
-                        base_score=check.get("baseScore", 0),
-                        severity_breakdown=check.get("severityBreakdown", {}),
-                        multipliers_applied=check.get("multipliersApplied", []),
-                        final_calculation=check.get("finalCalculation", "")
-                    ),
-                    reasoning=check.get("reasoning", ""),
-                    recommended_action=check.get("recommendedAction", "CLEAR"),
-                    summary=check.get("summary", ""),
-                    risk_level=calculate_risk_level(check.get("violationScore", 0)),
-                    fulfilled_by=product.get("fulfilledBy", "Unknown"),
-                    checked_at=datetime.fromisoformat(check["checkedAt"]) if check.get("checkedAt") else datetime.now(),
-                    images_analyzed=check.get("imagesAnalyzed", 0)
-                )
+            result = ComplianceResult(
+                check_id=check["checkId"],
+                asin=product["asin"],
+                url=product["url"],
+                title=product["title"],
+                marketplace=marketplace_node["code"] if marketplace_node else "unknown",
+                violations_detected=check.get("violationsDetected", False),
+                ce_certification_claimed=check.get("ceCertificationClaimed", False),
+                is_baby_product=check.get("isBabyProduct", False),
+                ce_mark_visible=check.get("ceMarkVisible", False),
+                violation_types=[v.type for v in violation_details],
+                violation_details=violation_details,
+                seller_information=seller_info,
+                confidence_score=check.get("confidenceScore", 0),
+                violation_score=check.get("violationScore", 0),
+                violation_score_breakdown=ViolationScoreBreakdown(
+                    base_score=check.get("baseScore", 0),
+                    severity_breakdown=check.get("severityBreakdown", {}),
+                    multipliers_applied=check.get("multipliersApplied", []),
+                    final_calculation=check.get("finalCalculation", "")
+                ),
+                reasoning=check.get("reasoning", ""),
+                recommended_action=check.get("recommendedAction", "CLEAR"),
+                summary=check.get("summary", ""),
+                risk_level=calculate_risk_level(check.get("violationScore", 0)),
+                fulfilled_by=product.get("fulfilledBy", "Unknown"),
+                checked_at=datetime.fromisoformat(check["checkedAt"]) if check.get("checkedAt") else datetime.now(),
+                images_analyzed=check.get("imagesAnalyzed", 0)
+            )
 
-                # Apply risk level filter if specified
-                if risk_level is None or result.risk_level == risk_level:
-                    results.append(result)
+            # Apply risk level filter if specified
+            if risk_level is None or result.risk_level == risk_level:
+                results.append(result)
 
-        driver.close()
         return results
 
     except Exception as e:
@@ -327,8 +311,6 @@ async def get_compliance_results(
 async def get_compliance_result(check_id: str):
     """Get a single compliance check result by ID."""
     try:
-        driver = get_neo4j_driver()
-
         query = """
         MATCH (c:ComplianceCheck {checkId: $checkId})-[:CHECKED]->(p:Product)
         OPTIONAL MATCH (p)-[:SOLD_BY]->(s:Seller)
@@ -338,16 +320,13 @@ async def get_compliance_result(check_id: str):
         RETURN c, p, s, m, violations
         """
 
-        with driver.session() as session:
-            result = session.run(query, {"checkId": check_id}).single()
+        result = await read_one(query, {"checkId": check_id})
 
-            if not result:
-                raise HTTPException(status_code=404, detail="Compliance check not found")
+        if not result:
+            raise HTTPException(status_code=404, detail="Compliance check not found")
 
-            # Build and return result (similar to list endpoint)
-            # ... (abbreviated for brevity)
-
-        driver.close()
+        # Build and return result (similar to list endpoint)
+        # ... (abbreviated for brevity)
 
     except HTTPException:
         raise
@@ -362,8 +341,6 @@ async def get_compliance_stats(
 ):
     """Get compliance statistics."""
     try:
-        driver = get_neo4j_driver()
-
         query = """
         MATCH (c:ComplianceCheck)-[:CHECKED]->(p:Product)
         WHERE c.checkedAt >= datetime() - duration({days: $days})
@@ -382,22 +359,19 @@ async def get_compliance_stats(
             avg(c.violationScore) as avgScore
         """
 
-        with driver.session() as session:
-            result = session.run(query, {"days": days, "marketplace": marketplace}).single()
-
-            return ComplianceStats(
-                total_checks=result["totalChecks"] or 0,
-                total_products=result["totalProducts"] or 0,
-                total_violations=result["totalViolations"] or 0,
-                high_risk_count=result["highRisk"] or 0,
-                medium_risk_count=result["mediumRisk"] or 0,
-                low_risk_count=result["lowRisk"] or 0,
-                clear_count=result["clear"] or 0,
-                avg_violation_score=result["avgScore"] or 0,
-                top_violation_types=[]
-            )
+        result = await read_one(query, {"days": days, "marketplace": marketplace})
 
-        driver.close()
+        return ComplianceStats(
+            total_checks=result["totalChecks"] or 0,
+            total_products=result["totalProducts"] or 0,
+            total_violations=result["totalViolations"] or 0,
+            high_risk_count=result["highRisk"] or 0,
+            medium_risk_count=result["mediumRisk"] or 0,
+            low_risk_count=result["lowRisk"] or 0,
+            clear_count=result["clear"] or 0,
+            avg_violation_score=result["avgScore"] or 0,
+            top_violation_types=[]
+        )
 
     except Exception as e:
         # Return demo stats if Neo4j not available
@@ -425,120 +399,121 @@ async def save_compliance_result(result: ComplianceResult):
     Called by n8n workflow after analysis.
     """
     try:
-        driver = get_neo4j_driver()
-
-        with driver.session() as session:
-            # Create/update product
-            session.run("""
-                MERGE (p:Product {asin: $asin})
-                SET p.url = $url,
-                    p.title = $title,
-                    p.fulfilledBy = $fulfilledBy,
-                    p.currentRiskScore = $riskScore,
-                    p.updatedAt = datetime()
-                ON CREATE SET p.createdAt = datetime()
+        statements = []
+
+        # Create/update product
+        statements.append(("""
+            MERGE (p:Product {asin: $asin})
+            SET p.url = $url,
+                p.title = $title,
+                p.fulfilledBy = $fulfilledBy,
+                p.currentRiskScore = $riskScore,
+                p.updatedAt = datetime()
+            ON CREATE SET p.createdAt = datetime()
+        """, {
+            "asin": result.asin,
+            "url": result.url,
+            "title": result.title,
+            "fulfilledBy": result.fulfilled_by,
+            "riskScore": result.violation_score
+        }))
+
+        # Create/update seller
+        if result.seller_information.seller_name:
+            statements.append(("""
+                MERGE (s:Seller {name: $name})
+                SET s.website = $website,
+                    s.sellerId = $sellerId,
+                    s.updatedAt = datetime()
+                ON CREATE SET s.createdAt = datetime()
             """, {
-                "asin": result.asin,
-                "url": result.url,
-                "title": result.title,
-                "fulfilledBy": result.fulfilled_by,
-                "riskScore": result.violation_score
-            })
-
-            # Create/update seller
-            if result.seller_information.seller_name:
-                session.run("""
-                    MERGE (s:Seller {name: $name})
-                    SET s.website = $website,
-                        s.sellerId = $sellerId,
-                        s.updatedAt = datetime()
-                    ON CREATE SET s.createdAt = datetime()
-                """, {
-                    "name": result.seller_information.seller_name,
-                    "website": result.seller_information.seller_website,
-                    "sellerId": result.seller_information.seller_id
-                })
-
-                # Link product to seller
-                session.run("""
-                    MATCH (p:Product {asin: $asin})
-                    MATCH (s:Seller {name: $sellerName})
-                    MERGE (p)-[:SOLD_BY]->(s)
-                """, {
-                    "asin": result.asin,
-                    "sellerName": result.seller_information.seller_name
-                })
+                "name": result.seller_information.seller_name,
+                "website": result.seller_information.seller_website,
+                "sellerId": result.seller_information.seller_id
+            }))
 
-            # Link product to marketplace
-            session.run("""
+            # Link product to seller
+            statements.append(("""
                 MATCH (p:Product {asin: $asin})
-                MATCH (m:Marketplace {code: $marketplace})
-                MERGE (p)-[:LISTED_IN]->(m)
+                MATCH (s:Seller {name: $sellerName})
+                MERGE (p)-[:SOLD_BY]->(s)
             """, {
                 "asin": result.asin,
-                "marketplace": result.marketplace
+                "sellerName": result.seller_information.seller_name
+            }))
+
+        # Link product to marketplace
+        statements.append(("""
+            MATCH (p:Product {asin: $asin})
+            MATCH (m:Marketplace {code: $marketplace})
+            MERGE (p)-[:LISTED_IN]->(m)
+        """, {
+            "asin": result.asin,
+            "marketplace": result.marketplace
+        }))
+
+        # Create compliance check
+        statements.append(("""
+            CREATE (c:ComplianceCheck {
+                checkId: $checkId,
+                checkedAt: datetime(),
+                violationsDetected: $violationsDetected,
+                ceCertificationClaimed: $ceClaimed,
+                isBabyProduct: $isBaby,
+                ceMarkVisible: $ceVisible,
+                confidenceScore: $confidence,
+                violationScore: $score,
+                recommendedAction: $action,
+                reasoning: $reasoning,
+                summary: $summary
             })
-
-            # Create compliance check
-            session.run("""
-                CREATE (c:ComplianceCheck {
-                    checkId: $checkId,
-                    checkedAt: datetime(),
-                    violationsDetected: $violationsDetected,
-                    ceCertificationClaimed: $ceClaimed,
-                    isBabyProduct: $isBaby,
-                    ceMarkVisible: $ceVisible,
-                    confidenceScore: $confidence,
-                    violationScore: $score,
-                    recommendedAction: $action,
-                    reasoning: $reasoning,
-                    summary: $summary
+            WITH c
+            MATCH (p:Product {asin: $asin})
+            CREATE (c)-[:CHECKED]->(p)
+        """, {
+            "checkId": result.check_id,
+            "violationsDetected": result.violations_detected,
+            "ceClaimed": result.ce_certification_claimed,
+            "isBaby": result.is_baby_product,
+            "ceVisible": result.ce_mark_visible,
+            "confidence": result.confidence_score,
+            "score": result.violation_score,
+            "action": result.recommended_action.value,
+            "reasoning": result.reasoning,
+            "summary": result.summary,
+            "asin": result.asin
+        }))
+
+        # Create violations
+        for i, violation in enumerate(result.violation_details):
+            statements.append(("""
+                MATCH (c:ComplianceCheck {checkId: $checkId})
+                CREATE (v:Violation {
+                    violationId: $violationId,
+                    type: $type,
+                    evidenceText: $evidence,
+                    evidenceTextTranslated: $translated,
+                    location: $location,
+                    severity: $severity,
+                    explanation: $explanation,
+                    regulatoryReference: $regulatory
                 })
-                WITH c
-                MATCH (p:Product {asin: $asin})
-                CREATE (c)-[:CHECKED]->(p)
+                CREATE (c)-[:FOUND_VIOLATION]->(v)
             """, {
                 "checkId": result.check_id,
-                "violationsDetected": result.violations_detected,
-                "ceClaimed": result.ce_certification_claimed,
-                "isBaby": result.is_baby_product,
-                "ceVisible": result.ce_mark_visible,
-                "confidence": result.confidence_score,
-                "score": result.violation_score,
-                "action": result.recommended_action.value,
-                "reasoning": result.reasoning,
-                "summary": result.summary,
-                "asin": result.asin
-            })
+                "violationId": f"{result.check_id}-v{i}",
+                "type": violation.type.value,
+                "evidence": violation.evidence_text,
+                "translated": violation.evidence_text_translated,
+                "location": violation.location,
+                "severity": violation.severity.value,
+                "explanation": violation.explanation,
+                "regulatory": violation.regulatory_reference
+            }))
+
+        # One transaction: the check, its product/seller links and violations land atomically
+        await write_many(*statements)
 
-            # Create violations
-            for i, violation in enumerate(result.violation_details):
-                session.run("""
-                    MATCH (c:ComplianceCheck {checkId: $checkId})
-                    CREATE (v:Violation {
-                        violationId: $violationId,
-                        type: $type,
-                        evidenceText: $evidence,
-                        evidenceTextTranslated: $translated,
-                        location: $location,
-                        severity: $severity,
-                        explanation: $explanation,
-                        regulatoryReference: $regulatory
-                    })
-                    CREATE (c)-[:FOUND_VIOLATION]->(v)
-                """, {
-                    "checkId": result.check_id,
-                    "violationId": f"{result.check_id}-v{i}",
-                    "type": violation.type.value,
-                    "evidence": violation.evidence_text,
-                    "translated": violation.evidence_text_translated,
-                    "location": violation.location,
-                    "severity": violation.severity.value,
-                    "explanation": violation.explanation,
-                    "regulatory": violation.regulatory_reference
-                })
-
-        driver.close()
         return result
 
     except Exception as e:
@@ -556,8 +531,6 @@ async def get_learnings(
 ):
     """Get all learnings."""
     try:
-        driver = get_neo4j_driver()
-
         query = """
         MATCH (l:Learning)
         WHERE $category IS NULL OR l.category = $category
@@ -567,18 +540,15 @@ async def get_learnings(
         """
 
         learnings = []
-        with driver.session() as session:
-            records = session.run(query, {"category": category, "limit": limit})
-            for record in records:
-                l = record["l"]
-                learnings.append(Learning(
-                    learning_id=l["learningId"],
-                    text=l["text"],
-                    category=l["category"],
-                    created_at=datetime.fromisoformat(l["createdAt"])
-                ))
-
-        driver.close()
+        for record in await read_all(query, {"category": category, "limit": limit}):
+            l = record["l"]
+            learnings.append(Learning(
+                learning_id=l["learningId"],
+                text=l["text"],
+                category=l["category"],
+                created_at=datetime.fromisoformat(l["createdAt"])
+            ))
+
         return learnings
 
     except Exception as e:
@@ -589,25 +559,20 @@ async def get_learnings(
 async def create_learning(learning: LearningCreate):
     """Create a new learning."""
     try:
-        driver = get_neo4j_driver()
-
         learning_id = f"learn-{uuid.uuid4().hex[:8]}"
 
-        with driver.session() as session:
-            session.run("""
-                CREATE (l:Learning {
-                    learningId: $id,
-                    text: $text,
-                    category: $category,
-                    createdAt: datetime()
-                })
-            """, {
-                "id": learning_id,
-                "text": learning.text,
-                "category": learning.category
+        await write("""
+            CREATE (l:Learning {
+                learningId: $id,
+                text: $text,
+                category: $category,
+                createdAt: datetime()
             })
-
-        driver.close()
+        """, {
+            "id": learning_id,
+            "text": learning.text,
+            "category": learning.category
+        })
 
         return Learning(
             learning_id=learning_id,
@@ -624,20 +589,16 @@ async def create_learning(learning: LearningCreate):
 async def delete_learning(learning_id: str):
     """Delete a learning."""
     try:
-        driver = get_neo4j_driver()
-
-        with driver.session() as session:
-            result = session.run("""
-                MATCH (l:Learning {learningId: $id})
-                DELETE l
-                RETURN count(l) as deleted
-            """, {"id": learning_id})
+        records = await write("""
+            MATCH (l:Learning {learningId: $id})
+            DELETE l
+            RETURN count(l) as deleted
+        """, {"id": learning_id})
 
-            deleted = result.single()["deleted"]
-            if deleted == 0:
-                raise HTTPException(status_code=404, detail="Learning not found")
+        deleted = records[0]["deleted"]
+        if deleted == 0:
+            raise HTTPException(status_code=404, detail="Learning not found")
 
-        driver.close()
         return {"status": "deleted", "learning_id": learning_id}
 
     except HTTPException:
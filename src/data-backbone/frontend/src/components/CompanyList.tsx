@@ -34,7 +34,9 @@ export default function CompanyList() {
   const [industries, setIndustries] = useState<Array<{industry: string; company_count: number}>>([]);
   const [locations, setLocations] = useState<string[]>([]);
   const [companies, setCompanies] = useState<CompanyRecord[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
@@ -115,7 +117,30 @@ export default function CompanyList() {
     };
   }, []);
 
+  const fetchCompanyPage = (cursor?: string) => {
+    if (filterType === 'industry') {
+      const industry = selectedIndustry === 'Unclassified' ? '__NULL__' : selectedIndustry;
+      return api.getCompaniesByIndustry<CompanyRecord>(industry, cursor);
+    }
+    return api.getCompaniesByLocation<CompanyRecord>(selectedLocation, cursor);
+  };
+
+  const loadMoreCompanies = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchCompanyPage(nextCursor);
+      setCompanies((prev) => [...prev, ...page.companies]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load companies');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
+    setNextCursor(null);
     if (filterType === 'industry' && !selectedIndustry) {
       setCompanies([]);
       return;
@@ -129,20 +154,13 @@ export default function CompanyList() {
       try {
         setLoading(true);
         setError(null);
-        let data;
-        if (filterType === 'industry') {
-          if (selectedIndustry === 'Unclassified') {
-            data = await api.getCompaniesByIndustry('__NULL__');
-          } else {
-            data = await api.getCompaniesByIndustry(selectedIndustry);
-          }
-        } else {
-          data = await api.getCompaniesByLocation(selectedLocation);
-        }
-        setCompanies(data);
+        const page = await fetchCompanyPage();
+        setCompanies(page.companies);
+        setNextCursor(page.next_cursor);
       } catch (err) {
         setError(err instanceof Error ? err.message : 'Failed to load companies');
         setCompanies([]);
+        setNextCursor(null);
       } finally {
         setLoading(false);
       }
@@ -371,6 +389,7 @@ export default function CompanyList() {
               ))}
             </div>
           ) : companies.length > 0 ? (
+            <>
             <div style={{
               display: 'grid',
               gridTemplateColumns: 'repeat(auto-fill, minmax(300px, 1fr))',
@@ -450,6 +469,28 @@ export default function CompanyList() {
                 );
               })}
             </div>
+            {nextCursor && (
+              <div style={{ textAlign: 'center', marginTop: '1.5rem' }}>
+                <button
+                  onClick={loadMoreCompanies}
+                  disabled={loadingMore}
+                  style={{
+                    padding: '0.5rem 1.5rem',
+                    backgroundColor: '#3b82f6',
+                    color: 'white',
+                    border: 'none',
+                    borderRadius: '0.375rem',
+                    fontSize: '0.875rem',
+                    fontWeight: '500',
+                    cursor: loadingMore ? 'default' : 'pointer',
+                    opacity: loadingMore ? 0.6 : 1
+                  }}
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            )}
+            </>
           ) : (
             <div style={{
               backgroundColor: 'white',
@@ -152,7 +152,9 @@ export default function PeopleList() {
   const [selectedCompanyDomain, setSelectedCompanyDomain] = useState<string | null>(null);
   const [departments, setDepartments] = useState<string[]>([]);
   const [people, setPeople] = useState<PersonRecord[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
@@ -175,7 +177,22 @@ export default function PeopleList() {
     loadDepartments();
   }, []);
 
+  const loadMorePeople = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await api.getPeopleByDepartment<PersonRecord>(selectedDepartment, nextCursor);
+      setPeople((prev) => [...prev, ...page.people]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load people');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
+    setNextCursor(null);
     if (!selectedDepartment) {
       setPeople([]);
       return;
@@ -185,9 +202,10 @@ export default function PeopleList() {
       try {
         setLoading(true);
         setError(null);
-        const data = await api.getPeopleByDepartment(selectedDepartment);
-        if (data && data.length > 0) {
-          setPeople(data);
+        const page = await api.getPeopleByDepartment<PersonRecord>(selectedDepartment);
+        if (page.people.length > 0) {
+          setPeople(page.people);
+          setNextCursor(page.next_cursor);
         } else {
           // Use demo data if no people returned
           setPeople(DEMO_PEOPLE[selectedDepartment] || []);
@@ -340,6 +358,7 @@ export default function PeopleList() {
               ))}
             </div>
           ) : people.length > 0 ? (
+            <>
             <div style={{
               display: 'grid',
               gridTemplateColumns: 'repeat(auto-fill, minmax(300px, 1fr))',
@@ -485,6 +504,28 @@ export default function PeopleList() {
                 );
               })}
             </div>
+            {nextCursor && (
+              <div style={{ textAlign: 'center', marginTop: '1.5rem' }}>
+                <button
+                  onClick={loadMorePeople}
+                  disabled={loadingMore}
+                  style={{
+                    padding: '0.5rem 1.5rem',
+                    backgroundColor: '#3b82f6',
+                    color: 'white',
+                    border: 'none',
+                    borderRadius: '0.375rem',
+                    fontSize: '0.875rem',
+                    fontWeight: '500',
+                    cursor: loadingMore ? 'default' : 'pointer',
+                    opacity: loadingMore ? 0.6 : 1
+                  }}
+                >
+                  {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+              </div>
+            )}
+            </>
           ) : (
             <div style={{
               backgroundColor: isDarkMode ? '#1f2937' : 'white',
@@ -93,12 +93,21 @@ class ApiClient {
     }
   }
 
-  async getCompaniesByIndustry(industry: string) {
-    return this.fetch(`/companies/by-industry?industry=${encodeURIComponent(industry)}`);
+  // Keyset-paged lists: pass the page's next_cursor back as cursor for the next page
+  private listPage(endpoint: string, cursor?: string) {
+    return cursor ? `${endpoint}&cursor=${encodeURIComponent(cursor)}` : endpoint;
   }
 
-  async getCompaniesByLocation(location: string) {
-    return this.fetch(`/companies/by-location?location=${encodeURIComponent(location)}`);
+  async getCompaniesByIndustry<T = unknown>(industry: string, cursor?: string) {
+    return this.fetch<{ companies: T[]; has_more: boolean; next_cursor: string | null }>(
+      this.listPage(`/companies/by-industry?industry=${encodeURIComponent(industry)}`, cursor)
+    );
+  }
+
+  async getCompaniesByLocation<T = unknown>(location: string, cursor?: string) {
+    return this.fetch<{ companies: T[]; has_more: boolean; next_cursor: string | null }>(
+      this.listPage(`/companies/by-location?location=${encodeURIComponent(location)}`, cursor)
+    );
   }
 
   async getCompanyByDomain(domain: string) {
@@ -113,8 +122,10 @@ class ApiClient {
     return this.fetch(`/search/hybrid?q=${encodeURIComponent(query)}&k=${limit}&depth=${depth}`);
   }
 
-  async getPeopleByDepartment(department: string) {
-    return this.fetch(`/people/by-department?department=${encodeURIComponent(department)}`);
+  async getPeopleByDepartment<T = unknown>(department: string, cursor?: string) {
+    return this.fetch<{ people: T[]; has_more: boolean; next_cursor: string | null }>(
+      this.listPage(`/people/by-department?department=${encodeURIComponent(department)}`, cursor)
+    );
   }
 
   async searchPeople(query: string) {
@@ -524,7 +535,7 @@ class ApiClient {
     country?: string;
     size?: string;
     limit?: number;
-    offset?: number;
+    cursor?: string;
   }): Promise<{
     companies: Array<{
       id: string;
@@ -541,14 +552,16 @@ class ApiClient {
       contact_count: number;
       deal_count: number;
     }>;
-    total: number;
+    total: number | null;
+    has_more: boolean;
+    next_cursor: string | null;
   }> {
     const searchParams = new URLSearchParams();
     if (params?.industry) searchParams.append('industry', params.industry);
     if (params?.country) searchParams.append('country', params.country);
     if (params?.size) searchParams.append('size', params.size);
     if (params?.limit) searchParams.append('limit', params.limit.toString());
-    if (params?.offset) searchParams.append('offset', params.offset.toString());
+    if (params?.cursor) searchParams.append('cursor', params.cursor);
     const query = searchParams.toString();
     return this.fetch(`/api/companies${query ? '?' + query : ''}`);
   }
@@ -584,7 +597,7 @@ class ApiClient {
     company_id?: string;
     seniority?: string;
     limit?: number;
-    offset?: number;
+    cursor?: string;
   }): Promise<{
     contacts: Array<{
       id: string;
@@ -597,13 +610,15 @@ class ApiClient {
       company_id: string;
       engagement_score: number;
     }>;
-    total: number;
+    total: number | null;
+    has_more: boolean;
+    next_cursor: string | null;
   }> {
     const searchParams = new URLSearchParams();
     if (params?.company_id) searchParams.append('company_id', params.company_id);
     if (params?.seniority) searchParams.append('seniority', params.seniority);
     if (params?.limit) searchParams.append('limit', params.limit.toString());
-    if (params?.offset) searchParams.append('offset', params.offset.toString());
+    if (params?.cursor) searchParams.append('cursor', params.cursor);
     const query = searchParams.toString();
     return this.fetch(`/api/contacts${query ? '?' + query : ''}`);
   }
@@ -613,7 +628,7 @@ class ApiClient {
     company_id?: string;
     owner?: string;
     limit?: number;
-    offset?: number;
+    cursor?: string;
   }): Promise<{
     deals: Array<{
       id: string;
@@ -628,14 +643,16 @@ class ApiClient {
       expected_close_date: string;
       created_at: string;
     }>;
-    total: number;
+    total: number | null;
+    has_more: boolean;
+    next_cursor: string | null;
   }> {
     const searchParams = new URLSearchParams();
     if (params?.stage) searchParams.append('stage', params.stage);
     if (params?.company_id) searchParams.append('company_id', params.company_id);
     if (params?.owner) searchParams.append('owner', params.owner);
     if (params?.limit) searchParams.append('limit', params.limit.toString());
-    if (params?.offset) searchParams.append('offset', params.offset.toString());
+    if (params?.cursor) searchParams.append('cursor', params.cursor);
     const query = searchParams.toString();
     return this.fetch(`/api/deals${query ? '?' + query : ''}`);
   }
@@ -683,7 +700,7 @@ class ApiClient {
     company_id?: string;
     is_read?: boolean;
     limit?: number;
-    offset?: number;
+    cursor?: string;
   }): Promise<{
     signals: Array<{
       id: string;
@@ -698,7 +715,9 @@ class ApiClient {
       is_read: boolean;
       confidence_score: number;
     }>;
-    total: number;
+    total: number | null;
+    has_more: boolean;
+    next_cursor: string | null;
   }> {
     const searchParams = new URLSearchParams();
     if (params?.signal_type) searchParams.append('signal_type', params.signal_type);
@@ -706,7 +725,7 @@ class ApiClient {
     if (params?.company_id) searchParams.append('company_id', params.company_id);
     if (params?.is_read !== undefined) searchParams.append('is_read', params.is_read.toString());
     if (params?.limit) searchParams.append('limit', params.limit.toString());
-    if (params?.offset) searchParams.append('offset', params.offset.toString());
+    if (params?.cursor) searchParams.append('cursor', params.cursor);
     const query = searchParams.toString();
     return this.fetch(`/api/signals${query ? '?' + query : ''}`);
   }
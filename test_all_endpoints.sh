@@ -9,6 +9,26 @@ GREEN='\033[0;32m'
 BLUE='\033[0;34m'
 NC='\033[0m' # No Color
 
+# List endpoints return keyset pages ({"companies"|"people": [...], "has_more",
+# "next_cursor"}); follow next_cursor until has_more is false
+fetch_all() {
+  python3 - "$1" <<'EOF'
+import json, sys, urllib.parse, urllib.request
+
+url, cursor, result = sys.argv[1], None, {}
+while True:
+    page_url = url + ("&cursor=" + urllib.parse.quote(cursor) if cursor else "")
+    page = json.load(urllib.request.urlopen(page_url))
+    for key, value in page.items():
+        if isinstance(value, list):
+            result.setdefault(key, []).extend(value)
+    if not page.get("has_more"):
+        break
+    cursor = page["next_cursor"]
+print(json.dumps(result, indent=4))
+EOF
+}
+
 echo -e "${BLUE}1. Health Check${NC}"
 curl -s 'http://localhost:8000/healthz' | python3 -m json.tool
 echo ""
@@ -25,22 +45,22 @@ echo ""
 echo ""
 
 echo -e "${BLUE}4. All Fitness Clubs (high potential for water coolers)${NC}"
-curl -s 'http://localhost:8000/companies/by-industry?industry=Fitness' | python3 -m json.tool
+fetch_all 'http://localhost:8000/companies/by-industry?industry=Fitness'
 echo ""
 echo ""
 
 echo -e "${BLUE}5. All Restaurants (high potential for water coolers)${NC}"
-curl -s 'http://localhost:8000/companies/by-industry?industry=Restaurant' | python3 -m json.tool
+fetch_all 'http://localhost:8000/companies/by-industry?industry=Restaurant'
 echo ""
 echo ""
 
 echo -e "${BLUE}6. All Companies in London${NC}"
-curl -s 'http://localhost:8000/companies/by-location?location=London' | python3 -m json.tool | head -80
+fetch_all 'http://localhost:8000/companies/by-location?location=London' | head -80
 echo ""
 echo ""
 
 echo -e "${BLUE}7. All Executives (decision makers)${NC}"
-curl -s 'http://localhost:8000/people/by-department?department=Management' | python3 -m json.tool | head -80
+fetch_all 'http://localhost:8000/people/by-department?department=Management' | head -80
 echo ""
 echo ""
 
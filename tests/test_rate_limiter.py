@@ -0,0 +1,140 @@
+"""
+RateLimiter never admits more than GCRA allows, in memory and through the
+Redis Lua script (fakeredis), with concurrent tasks on several event loops;
+and its Redis clients are kept per loop and closed when dropped.
+
+    admitted by time t  <=  burst + t * limit / window
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from atlas.connectors.utils import rate_limiter as rl
+
+LIMIT, WINDOW, BURST = 20, 1.0, 5
+THREADS, TASKS = 3, 20
+DURATION = 1.5
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """
+    Point every client the limiter creates at one in-process fakeredis server.
+    Returns (server, clients created, clients closed).
+    """
+    if not rl.REDIS_AVAILABLE:
+        pytest.skip("redis not installed")
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # Lua scripting in fakeredis
+
+    server = fakeredis.FakeServer()
+    created, closed = [], []
+
+    def from_url(url, **kwargs):
+        client = fakeredis.FakeAsyncRedis(server=server)
+        aclose = client.aclose
+
+        async def tracked_aclose():
+            closed.append(client)
+            await aclose()
+
+        client.aclose = tracked_aclose
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(rl.aioredis, "from_url", from_url)
+    return server, created, closed
+
+
+def make_limiter(backend: str) -> rl.RateLimiter:
+    redis_url = "redis://fake" if backend == "fakeredis" else None
+    return rl.RateLimiter("test", LIMIT, WINDOW, redis_url=redis_url, burst=BURST)
+
+
+def hammer(limiter: rl.RateLimiter, mode: str) -> tuple[list[float], float]:
+    """
+    THREADS event loops of TASKS tasks each call the limiter until DURATION is
+    up. Returns the admission times and the elapsed time.
+    """
+    admitted: list[float] = []
+    start = time.monotonic()
+    deadline = start + DURATION
+
+    async def worker():
+        while time.monotonic() < deadline:
+            if mode == "wait":
+                if await limiter.wait_and_acquire(max_wait=max(0.0, deadline - time.monotonic())):
+                    admitted.append(time.monotonic())
+            elif await limiter.acquire():
+                admitted.append(time.monotonic())
+            else:
+                await asyncio.sleep(0.001)
+
+    async def loop_main():
+        await asyncio.gather(*(worker() for _ in range(TASKS)))
+        await limiter.close()
+
+    threads = [threading.Thread(target=asyncio.run, args=(loop_main(),)) for _ in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return admitted, time.monotonic() - start
+
+
+@pytest.mark.parametrize("mode", ["acquire", "wait"])
+@pytest.mark.parametrize("backend", ["memory", "fakeredis"])
+def test_never_over_admits(backend, mode, request, monkeypatch):
+    if backend == "fakeredis":
+        request.getfixturevalue("fake_redis")
+    else:
+        monkeypatch.delenv("REDIS_URL", raising=False)
+    admitted, elapsed = hammer(make_limiter(backend), mode)
+
+    assert len(admitted) <= BURST + elapsed * LIMIT / WINDOW
+    # Not trivially passing: the limiter did admit up to its burst and beyond
+    assert len(admitted) > BURST
+
+
+def test_one_client_per_loop(fake_redis):
+    _, created, _ = fake_redis
+    limiter = make_limiter("fakeredis")
+
+    async def calls():
+        for _ in range(3):
+            await limiter.acquire()
+
+    asyncio.run(calls())
+    assert len(created) == 1
+
+    # A new loop gets its own client; the ended loop's entry is dropped
+    asyncio.run(calls())
+    assert len(created) == 2
+    assert len(limiter._clients) == 1
+
+
+@pytest.mark.asyncio
+async def test_close_closes_client(fake_redis):
+    _, created, closed = fake_redis
+    limiter = make_limiter("fakeredis")
+    assert await limiter.acquire()
+
+    await limiter.close()
+    assert closed == created
+    assert limiter._clients == {}
+
+
+@pytest.mark.asyncio
+async def test_redis_error_closes_client_and_falls_back(fake_redis):
+    server, created, closed = fake_redis
+    limiter = make_limiter("fakeredis")
+    assert await limiter.acquire()
+
+    server.connected = False
+    assert await limiter.acquire()  # admitted by the in-memory fallback
+    assert closed == created
+    assert limiter._clients == {}
+    assert limiter._redis_script() is None  # Redis is retried only after a pause